@@ -0,0 +1,100 @@
+# scripts/bench_compact.py
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_positions, backtest_positions_compact
+from src.compact import COMPACT_INT, PackedMask
+from src.data_loader import PriceData, compact_price_data, compute_log_returns
+from src.metrics import summarize_strategy
+from src.strategies import momentum, vol_regime_filter
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 5000
+N_TICKERS = 2000
+LOOKBACK = 60
+VOL_LOOKBACK = 20
+VOL_THRESHOLD = 0.012
+COST_BPS = 2.0
+
+
+def _profile(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 1e6
+
+
+def _mb(*frames) -> float:
+    total = 0
+    for f in frames:
+        total += f.nbytes if isinstance(f, PackedMask) else f.memory_usage(index=False).sum()
+    return total / 1e6
+
+
+def run_float64(data: PriceData):
+    prices, rets = data.prices.iloc[1:], data.log_returns
+    positions = momentum(prices, lookback=LOOKBACK)
+    gate = vol_regime_filter(rets, VOL_LOOKBACK, VOL_THRESHOLD)
+    res = backtest_positions(rets, positions * gate, transaction_cost_bps=COST_BPS)
+    return res, positions, gate
+
+
+def run_compact(data: PriceData):
+    prices, rets = data.prices.iloc[1:], data.log_returns
+    positions = momentum(prices, lookback=LOOKBACK, dtype=COMPACT_INT)
+    gate = PackedMask.from_frame(vol_regime_filter(rets, VOL_LOOKBACK, VOL_THRESHOLD, dtype=COMPACT_INT))
+    res = backtest_positions_compact(rets, gate.apply(positions), transaction_cost_bps=COST_BPS)
+    return res, positions, gate
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+    data = PriceData(prices=prices, log_returns=compute_log_returns(prices))
+    small = compact_price_data(data)
+
+    (res64, pos64, gate64), t64, peak64 = _profile(run_float64, data)
+    (res32, pos8, gate1), t32, peak32 = _profile(run_compact, small)
+
+    s64 = summarize_strategy("float64", res64.strategy_log_returns, res64.equity_curve)
+    s32 = summarize_strategy("compact", res32.strategy_log_returns, res32.equity_curve)
+
+    rows = [
+        {
+            "Mode": "float64",
+            "Prices+returns (MB)": _mb(data.prices, data.log_returns),
+            "Positions (MB)": _mb(pos64),
+            "Gate (MB)": _mb(gate64),
+            "Pipeline (s)": t64,
+            "Pipeline peak (MB)": peak64,
+            "Sharpe": s64["Sharpe"],
+        },
+        {
+            "Mode": "compact",
+            "Prices+returns (MB)": _mb(small.prices, small.log_returns),
+            "Positions (MB)": _mb(pos8),
+            "Gate (MB)": _mb(gate1),
+            "Pipeline (s)": t32,
+            "Pipeline peak (MB)": peak32,
+            "Sharpe": s32["Sharpe"],
+        },
+    ]
+    df = pd.DataFrame(rows).set_index("Mode")
+    pd.set_option("display.max_columns", 100)
+    pd.set_option("display.width", 200)
+    print(f"\nMomentum x vol gate pipeline on {N_DAYS} days x {N_TICKERS} tickers\n")
+    print(df)
+
+    eq_diff = np.abs(res64.equity_curve.to_numpy() - res32.equity_curve.to_numpy()).max()
+    print(f"\nMax abs equity difference (float64 vs compact): {eq_diff:.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# scripts/bench_event_backtest.py
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_events, backtest_positions, position_events
+from src.data_loader import compute_log_returns
+from src.strategies import cross_sectional_momentum, rebalance_mask
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 2520
+UNIVERSES = [500, 2000, 5000]
+SCHEDULES = ["M", "W"]
+COST_BPS = 2.0
+
+
+def _profile(fn, *args, **kwargs):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 1e6
+
+
+def main():
+    rows = []
+    for n_tickers in UNIVERSES:
+        prices = make_gbm_prices(n_days=N_DAYS, n_tickers=n_tickers)
+        rets = compute_log_returns(prices)
+        for schedule in SCHEDULES:
+            dense = cross_sectional_momentum(prices, rebalance=schedule)
+            # The sparse engine only ever sees the rebalance rows
+            calendar = dense[rebalance_mask(dense.index, schedule)]
+            events = position_events(calendar)
+
+            ref, dense_s, dense_mb = _profile(backtest_positions, rets, dense, transaction_cost_bps=COST_BPS)
+            res, ev_s, ev_mb = _profile(backtest_events, rets, events, transaction_cost_bps=COST_BPS)
+            rows.append(
+                {
+                    "Tickers": n_tickers,
+                    "Rebalance": schedule,
+                    "Events": len(events),
+                    "dense (s)": dense_s,
+                    "events (s)": ev_s,
+                    "dense peak (MB)": dense_mb,
+                    "events peak (MB)": ev_mb,
+                    "Max return diff": float(np.abs(res.strategy_log_returns - ref.strategy_log_returns).max()),
+                }
+            )
+
+    df = pd.DataFrame(rows).set_index(["Tickers", "Rebalance"])
+    pd.set_option("display.max_columns", 100)
+    pd.set_option("display.width", 200)
+    print(f"\nCross-sectional momentum backtest, {N_DAYS} days: dense matrix vs change events\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
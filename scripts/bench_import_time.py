@@ -0,0 +1,70 @@
+# scripts/bench_import_time.py
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from src.price_store import save_prices
+from src.synthetic import make_gbm_prices
+
+# Cold-start cost of the entry points: every row is a fresh interpreter, so
+# nothing is shared through sys.modules. "before" reproduces the old eager
+# imports (yfinance via src.data_loader, matplotlib via the plotting scripts).
+
+REPEAT = 5
+HEAVY = ["yfinance", "matplotlib", "pandas"]
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+{code}
+wall = time.perf_counter() - t0
+print(wall, *[m in sys.modules for m in {heavy!r}])
+"""
+
+_RUN_CLI = "from src.cli import main; main({argv!r})"
+
+
+def _cold(code: str, cwd: str) -> list:
+    env = dict(os.environ, PYTHONPATH=REPO)
+    best = None
+    for _ in range(REPEAT):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY)],
+            capture_output=True, text=True, check=True, cwd=cwd, env=env,
+        ).stdout.strip().splitlines()[-1].split()
+        if best is None or float(out[0]) < float(best[0]):
+            best = out
+    return [float(best[0])] + [flag == "True" for flag in best[1:]]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "prices.csv")
+        save_prices(make_gbm_prices(n_days=2520, n_tickers=1), cache)
+        report = ["report", "--cache", cache, "--offline"]
+
+        cases = [
+            ("src.cli parser (--help)", "from src.cli import build_parser\nbuild_parser()"),
+            ("import src.data_loader (before)", "import yfinance\nimport src.data_loader"),
+            ("import src.data_loader (after)", "import src.data_loader"),
+            ("report on cached data (before)", "import yfinance, matplotlib.pyplot\n" + _RUN_CLI.format(argv=report)),
+            ("report on cached data (after)", _RUN_CLI.format(argv=report)),
+        ]
+        rows = []
+        for name, code in cases:
+            rows.append([name, *_cold(code, tmp)])
+
+    df = pd.DataFrame(rows, columns=["Entry point", "Cold start (s)", *HEAVY]).set_index("Entry point")
+    pd.set_option("display.width", 200)
+    print(f"\nCold-start time, best of {REPEAT} fresh interpreters (columns: module loaded?)\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scripts/bench_panel.py
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_positions
+from src.data_loader import PriceData, compute_log_returns
+from src.panel import Panel
+from src.rolling import window_starts
+from src.strategies import momentum, vol_regime_filter
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 5000
+N_TICKERS = 500
+WINDOW_LEN = 3 * 252
+STEP = 21
+COST_BPS = 2.0
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+    data = PriceData(prices=prices, log_returns=compute_log_returns(prices))
+    panel, build_s = _time(lambda: Panel.from_price_data(data))
+
+    # Signals/gates from the panel's frames come back on its calendar
+    pos_frame = momentum(panel.prices_frame(), lookback=60) * vol_regime_filter(panel.returns_frame(), 20, 0.02)
+    pos = pos_frame.to_numpy()
+    rets = data.log_returns
+    starts = window_starts(len(rets), WINDOW_LEN, STEP)
+
+    def label_windows():
+        out = []
+        for s in starts:
+            d0, d1 = rets.index[s], rets.index[s + WINDOW_LEN - 1]
+            out.append(backtest_positions(rets.loc[d0:d1], pos_frame.loc[d0:d1], COST_BPS).strategy_log_returns)
+        return out
+
+    def panel_windows():
+        out = []
+        for s in starts:
+            rows = slice(panel.start + s, panel.start + s + WINDOW_LEN)
+            out.append(panel.window(rows.start, rows.stop).backtest(pos[rows], COST_BPS).strategy_log_returns)
+        return out
+
+    full_ref, full_label_s = _time(lambda: backtest_positions(rets, pos_frame, COST_BPS))
+    full_panel, full_panel_s = _time(lambda: panel.backtest(pos, COST_BPS))
+    win_ref, win_label_s = _time(label_windows)
+    win_panel, win_panel_s = _time(panel_windows)
+
+    diff = max(
+        float(np.abs(full_ref.strategy_log_returns - full_panel.strategy_log_returns).max()),
+        max(float(np.abs(a.to_numpy() - b.to_numpy()).max()) for a, b in zip(win_ref, win_panel)),
+    )
+    df = pd.DataFrame(
+        {
+            "label-based (s)": [full_label_s, win_label_s],
+            "panel (s)": [full_panel_s, win_panel_s],
+        },
+        index=["full-history backtest", f"{len(starts)} rolling windows"],
+    )
+    df["Speedup"] = df["label-based (s)"] / df["panel (s)"]
+    pd.set_option("display.width", 200)
+    print(f"\nPanel vs label alignment, {N_DAYS} days x {N_TICKERS} tickers (panel build {build_s:.3f}s)\n")
+    print(df)
+    print(f"\nMax return diff: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
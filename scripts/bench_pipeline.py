@@ -0,0 +1,220 @@
+# scripts/bench_pipeline.py
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_positions
+from src.config import BENCH_HISTORY_PATH
+from src.data_loader import get_price_data
+from src.metrics import summarize_many, summarize_strategy
+from src.price_store import save_prices
+from src.strategies import (
+    mean_reversion_zscore_signal,
+    momentum,
+    momentum_signal,
+    vol_regime_filter,
+    zscore_entry_exit_rule,
+)
+from src.synthetic import make_gbm_prices
+
+# Offline benchmark of the research hot paths on synthetic GBM panels.
+#
+#   python -m scripts.bench_pipeline                       # default shapes
+#   python -m scripts.bench_pipeline --shapes 10000x5000   # days x tickers
+#   python -m scripts.bench_pipeline --no-save             # don't append history
+#
+# Every run is appended to BENCH_HISTORY_PATH (JSON list of runs, each with
+# the git commit) and compared against the latest earlier run that measured
+# the same shape/stage, so regressions show up across commits.
+
+DEFAULT_SHAPES = [(1000, 1), (2520, 100), (5000, 1000)]
+REGRESSION_RATIO = 1.2  # flag stages that got this much slower...
+MIN_FLAG_SECONDS = 0.005  # ...unless they are too fast to time reliably
+
+
+def _offline_fetcher(*args, **kwargs):
+    raise RuntimeError("bench_pipeline runs offline; the price cache should already exist.")
+
+
+def _stages(prices: pd.DataFrame, csv_path: str) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    (stage name, zero-arg callable) for every hot path; inputs are prepared once.
+    """
+    tickers = [str(c) for c in prices.columns]
+    data = get_price_data(tickers, "1900-01-01", None, "Adj Close", "1d", cache_path=csv_path, fetcher=_offline_fetcher)
+    prices, rets = data.prices, data.log_returns
+    z = mean_reversion_zscore_signal(prices, lookback=20)
+    positions = momentum(prices, lookback=60) * vol_regime_filter(rets, 20, 0.02)
+    res = backtest_positions(rets, positions, transaction_cost_bps=2.0)
+    asset_equity = np.exp(rets.cumsum())
+
+    return [
+        ("load_csv", lambda: get_price_data(
+            tickers, "1900-01-01", None, "Adj Close", "1d", cache_path=csv_path, fetcher=_offline_fetcher
+        )),
+        ("momentum_signal", lambda: momentum_signal(prices, lookback=60)),
+        ("mean_reversion_zscore_signal", lambda: mean_reversion_zscore_signal(prices, lookback=20)),
+        ("zscore_entry_exit_rule", lambda: zscore_entry_exit_rule(z)),
+        ("vol_regime_filter", lambda: vol_regime_filter(rets, 20, 0.02)),
+        ("backtest_positions", lambda: backtest_positions(rets, positions, transaction_cost_bps=2.0)),
+        ("summarize_strategy", lambda: summarize_strategy("bench", res.strategy_log_returns, res.equity_curve)),
+        ("summarize_many", lambda: summarize_many(rets, asset_equity)),
+    ]
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Wall time over `repeat` runs, then one extra run under tracemalloc for the
+    peak allocation (kept separate because tracing slows everything down).
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_mb": peak / 1e6}
+
+
+def run_shape(n_days: int, n_tickers: int, repeat: int, seed: int) -> List[dict]:
+    prices = make_gbm_prices(n_days=n_days, n_tickers=n_tickers, seed=seed)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "prices.csv")
+        save_prices(prices, csv_path)
+        for stage, fn in _stages(prices, csv_path):
+            rows.append({"days": n_days, "tickers": n_tickers, "stage": stage, **_measure(fn, repeat)})
+            print(f"  {n_days:>6} x {n_tickers:<5} {stage:<30} {rows[-1]['best_s']:.4f}s")
+    return rows
+
+
+# ----------------------------
+# History
+# ----------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(history: List[dict], path: str) -> None:
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def compare(history: List[dict], results: List[dict]) -> pd.DataFrame:
+    """
+    Current best time vs the latest earlier run with the same (days, tickers, stage).
+    """
+    previous: Dict[tuple, tuple] = {}
+    for run in history:
+        for r in run["results"]:
+            previous[(r["days"], r["tickers"], r["stage"])] = (run.get("commit"), r["best_s"])
+
+    rows = []
+    for r in results:
+        commit, prev_s = previous.get((r["days"], r["tickers"], r["stage"]), (None, np.nan))
+        ratio = r["best_s"] / prev_s if prev_s else np.nan
+        rows.append(
+            {
+                "Days": r["days"],
+                "Tickers": r["tickers"],
+                "Stage": r["stage"],
+                "Best (s)": r["best_s"],
+                "Peak (MB)": r["peak_mb"],
+                "Previous (s)": prev_s,
+                "Previous commit": commit,
+                "Ratio": ratio,
+                "Flag": "SLOWER" if ratio > REGRESSION_RATIO and r["best_s"] >= MIN_FLAG_SECONDS else "",
+            }
+        )
+    return pd.DataFrame(rows).set_index(["Days", "Tickers", "Stage"])
+
+
+def _parse_shapes(text: str) -> List[Tuple[int, int]]:
+    shapes = []
+    for part in text.split(","):
+        days, tickers = part.lower().split("x")
+        shapes.append((int(days), int(tickers)))
+    return shapes
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the research pipeline hot paths.")
+    parser.add_argument("--shapes", type=_parse_shapes, default=DEFAULT_SHAPES,
+                        help="comma-separated DAYSxTICKERS, e.g. 1000x1,10000x5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history", default=BENCH_HISTORY_PATH)
+    parser.add_argument("--label", default=None, help="free-form note stored with the run")
+    parser.add_argument("--no-save", action="store_true", help="compare only, don't append to history")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_days, n_tickers in args.shapes:
+        results.extend(run_shape(n_days, n_tickers, args.repeat, args.seed))
+
+    history = load_history(args.history)
+    table = compare(history, results)
+
+    pd.set_option("display.max_columns", 100)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_rows", 500)
+    print("\nPipeline benchmark (best of", args.repeat, "runs)\n")
+    print(table)
+
+    if not args.no_save:
+        history.append(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "label": args.label,
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "repeat": args.repeat,
+                "results": results,
+            }
+        )
+        save_history(history, args.history)
+        print(f"\nAppended run to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# scripts/bench_portfolio_backtest.py
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import pandas as pd
+
+from src.backtester import backtest_positions, backtest_weights
+from src.data_loader import compute_log_returns
+from src.strategies import momentum
+from src.synthetic import make_gbm_prices
+
+# (days, assets); the last one is the 5,000 x 5,000 target panel
+SHAPES = [(1000, 100), (2500, 1000), (5000, 5000)]
+
+
+def _profile(fn, *args, **kwargs):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 1e6
+
+
+def main():
+    rows = []
+
+    for n_days, n_assets in SHAPES:
+        prices = make_gbm_prices(n_days=n_days, n_tickers=n_assets)
+        rets = compute_log_returns(prices)
+        positions = momentum(prices, lookback=60).reindex(rets.index)
+        weights = positions / n_assets
+        del prices
+
+        _, pos_s, pos_mb = _profile(backtest_positions, rets, positions, transaction_cost_bps=2.0)
+        _, w_s, w_mb = _profile(backtest_weights, rets, weights, transaction_cost_bps=2.0)
+        _, w_at_s, w_at_mb = _profile(
+            backtest_weights, rets, weights, transaction_cost_bps=2.0, attribution=True
+        )
+
+        rows.append(
+            {
+                "Days": n_days,
+                "Assets": n_assets,
+                "backtest_positions (s)": pos_s,
+                "backtest_weights (s)": w_s,
+                "with attribution (s)": w_at_s,
+                "positions peak (MB)": pos_mb,
+                "weights peak (MB)": w_mb,
+                "with attribution peak (MB)": w_at_mb,
+            }
+        )
+
+    df = pd.DataFrame(rows).set_index(["Days", "Assets"])
+    pd.set_option("display.max_columns", 100)
+    pd.set_option("display.width", 200)
+    print("\nPortfolio backtest: divide-by-N vs real-weight engine\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
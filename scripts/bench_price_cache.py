@@ -0,0 +1,86 @@
+# scripts/bench_price_cache.py
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from src.synthetic import make_gbm_prices
+from src.price_store import CsvBackend, migrate_csv_cache
+
+N_DAYS = 2520
+N_TICKERS = 1000
+FORMATS = [".csv", ".parquet", ".feather", ".npy"]
+
+# Runs in a fresh interpreter so every backend is measured from a cold start.
+# Memory is the resident-set growth over the interpreter after imports
+# (for .npy this counts the file pages the memory map touched).
+_CHILD = r"""
+import json, sys, time
+import numpy as np
+import pandas as pd
+from src.price_store import load_prices
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+
+base = rss_kb()
+t0 = time.perf_counter()
+df = load_prices(sys.argv[1])
+load_s = time.perf_counter() - t0
+t0 = time.perf_counter()
+total = float(np.nansum(df.to_numpy()))  # touch every value
+touch_s = time.perf_counter() - t0
+print(json.dumps({"load_s": load_s, "touch_s": touch_s, "rss_kb": rss_kb() - base, "shape": list(df.shape)}))
+"""
+
+
+def _measure(path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, path],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "prices.csv")
+        CsvBackend().save(prices, csv_path)
+
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"prices{fmt}")
+            try:
+                migrate_csv_cache(csv_path, path)
+            except ImportError as e:
+                print(f"Skipping {fmt}: {e}")
+                continue
+
+            m = _measure(path)
+            rows.append(
+                {
+                    "Format": fmt,
+                    "File (MB)": os.path.getsize(path) / 1e6,
+                    "Load (s)": m["load_s"],
+                    "Touch all (s)": m["touch_s"],
+                    "RSS growth (MB)": m["rss_kb"] / 1024,
+                }
+            )
+
+    df = pd.DataFrame(rows).set_index("Format")
+    pd.set_option("display.max_columns", 100)
+    print(f"\nCold-start price cache load ({N_DAYS} days x {N_TICKERS} tickers)\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
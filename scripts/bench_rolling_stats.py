@@ -0,0 +1,51 @@
+# scripts/bench_rolling_stats.py
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.rolling_stats import rolling_mean_std
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 5040
+N_TICKERS = 500
+WINDOW_SETS = [[20], [5, 10, 20, 40, 60], list(range(5, 255, 10))]
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+    rows = []
+
+    for windows in WINDOW_SETS:
+        t0 = time.perf_counter()
+        ref = {w: (prices.rolling(w).mean(), prices.rolling(w).std(ddof=0)) for w in windows}
+        pandas_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        res = rolling_mean_std(prices, windows, ddof=0)
+        kernel_s = time.perf_counter() - t0
+
+        max_rel_err = max(
+            np.nanmax(np.abs(res[w][1].to_numpy() - ref[w][1].to_numpy()) / ref[w][1].to_numpy())
+            for w in windows
+        )
+        rows.append(
+            {
+                "Windows": len(windows),
+                "pandas (s)": pandas_s,
+                "prefix-sum kernel (s)": kernel_s,
+                "Speedup": pandas_s / kernel_s,
+                "Max rel. diff vs pandas": max_rel_err,
+            }
+        )
+
+    df = pd.DataFrame(rows).set_index("Windows")
+    pd.set_option("display.max_columns", 100)
+    print(f"\nRolling mean + std over {N_DAYS} days x {N_TICKERS} tickers\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scripts/bench_sweep.py
+from __future__ import annotations
+
+import os
+import time
+
+import pandas as pd
+
+from src.data_loader import PriceData, compute_log_returns
+from src.sweep import param_grid, run_sweep
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 2520
+N_TICKERS = 50
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+    data = PriceData(prices=prices, log_returns=compute_log_returns(prices))
+
+    params = param_grid(
+        lookback=[20, 40, 60, 120],
+        vol_lookback=[10, 20],
+        vol_threshold=[0.010, 0.0125, 0.015, 0.020],
+        cost_bps=[0.0, 2.0],
+    )
+
+    rows = []
+    baseline = None
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        t0 = time.perf_counter()
+        table = run_sweep(data, params, max_workers=workers)
+        elapsed = time.perf_counter() - t0
+
+        if baseline is None:
+            baseline = table
+        rows.append(
+            {
+                "Workers": workers,
+                "Combos": len(params),
+                "Seconds": elapsed,
+                "Combos/s": len(params) / elapsed,
+                "Matches serial": bool(table.equals(baseline)),
+            }
+        )
+
+    df = pd.DataFrame(rows).set_index("Workers")
+    df["Speedup"] = df["Combos/s"] / df["Combos/s"].iloc[0]
+    pd.set_option("display.max_columns", 100)
+    print(f"\nShared-memory sweep throughput ({N_DAYS} days x {N_TICKERS} tickers)\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# scripts/bench_vol_surface.py
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_positions
+from src.data_loader import compute_log_returns
+from src.sensitivity import vol_threshold_surface
+from src.strategies import momentum, vol_regime_filter
+from src.synthetic import make_gbm_prices
+
+N_DAYS = 5000
+N_TICKERS = 200
+GRID_SIZES = [5, 50, 500]
+LOOP_MAX = 50  # the per-threshold loop gets slow beyond this
+COST_BPS = 2.0
+
+
+def loop(positions, rets, grid):
+    return [
+        backtest_positions(rets, positions * vol_regime_filter(rets, 20, vt), transaction_cost_bps=COST_BPS)
+        for vt in grid
+    ]
+
+
+def _time(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    prices = make_gbm_prices(n_days=N_DAYS, n_tickers=N_TICKERS)
+    rets = compute_log_returns(prices)
+    positions = momentum(prices, lookback=60)
+
+    rows = []
+    for k in GRID_SIZES:
+        grid = np.linspace(0.005, 0.03, k)
+        surface, surf_s = _time(vol_threshold_surface, positions, rets, grid, [20], transaction_cost_bps=COST_BPS)
+        row = {"Thresholds": k, "surface (s)": surf_s, "loop (s)": np.nan, "Max return diff": np.nan}
+        if k <= LOOP_MAX:
+            ref, row["loop (s)"] = _time(loop, positions, rets, grid)
+            row["Max return diff"] = max(
+                float(np.abs(surface.strategy_log_returns[0, i] - r.strategy_log_returns.to_numpy()).max())
+                for i, r in enumerate(ref)
+            )
+        rows.append(row)
+
+    df = pd.DataFrame(rows).set_index("Thresholds")
+    df["Speedup"] = df["loop (s)"] / df["surface (s)"]
+    pd.set_option("display.max_columns", 100)
+    pd.set_option("display.width", 200)
+    print(f"\nVol-threshold sensitivity, {N_DAYS} days x {N_TICKERS} tickers, momentum 60d\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
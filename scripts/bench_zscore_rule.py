@@ -0,0 +1,60 @@
+# scripts/bench_zscore_rule.py
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.synthetic import make_gbm_prices
+from src.strategies import (
+    mean_reversion_zscore_signal,
+    zscore_entry_exit_rule,
+    _zscore_entry_exit_rule_loop,
+)
+
+N_DAYS = 2520
+UNIVERSE_SIZES = [1, 10, 50, 200]
+LOOP_MAX_TICKERS = 50  # the reference loop gets very slow beyond this
+
+
+def _time(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    rows = []
+
+    for n in UNIVERSE_SIZES:
+        prices = make_gbm_prices(n_days=N_DAYS, n_tickers=n, seed=n)
+        z = mean_reversion_zscore_signal(prices, lookback=20)
+
+        vec_pos, vec_s = _time(zscore_entry_exit_rule, z, entry_z=1.0, exit_z=0.2)
+
+        loop_s = float("nan")
+        identical = None
+        if n <= LOOP_MAX_TICKERS:
+            loop_pos, loop_s = _time(_zscore_entry_exit_rule_loop, z, entry_z=1.0, exit_z=0.2)
+            identical = bool(np.array_equal(loop_pos.to_numpy(), vec_pos.to_numpy()))
+
+        rows.append(
+            {
+                "Tickers": n,
+                "Days": N_DAYS,
+                "Loop (s)": loop_s,
+                "Vectorized (s)": vec_s,
+                "Speedup": loop_s / vec_s,
+                "Identical": identical,
+            }
+        )
+
+    df = pd.DataFrame(rows).set_index("Tickers")
+    pd.set_option("display.max_columns", 100)
+    print("\nzscore_entry_exit_rule: loop vs vectorized\n")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
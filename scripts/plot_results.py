@@ -1,37 +1,8 @@
 # scripts/plot_results.py
-from src.config import TICKERS, START_DATE, END_DATE, PRICE_FIELD, INTERVAL, DATA_DIR_RAW
-from src.data_loader import get_price_data
-from src.strategies import momentum, mean_reversion_zscore
-from src.backtester import backtest_positions
-from src.plotting import plot_equity_curves, plot_drawdowns
-
-
-def main():
-    cache_path = f"{DATA_DIR_RAW}/prices_{'_'.join(TICKERS)}_{START_DATE}.csv"
-    data = get_price_data(TICKERS, START_DATE, END_DATE, PRICE_FIELD, INTERVAL, cache_path=cache_path)
-
-    mom_pos = momentum(data.prices, lookback=20)
-    mr_pos = mean_reversion_zscore(data.prices, lookback=20, entry_z=1.0, exit_z=0.2)
-
-    mom_res = backtest_positions(data.log_returns, mom_pos, transaction_cost_bps=2.0)
-    mr_res = backtest_positions(data.log_returns, mr_pos, transaction_cost_bps=2.0)
-
-    plot_equity_curves(
-        {
-            "Momentum (20d)": mom_res.equity_curve,
-            "Mean Reversion (z)": mr_res.equity_curve,
-        },
-        title="SPY Strategy Equity Curves",
-    )
-
-    plot_drawdowns(
-        {
-            "Momentum (20d)": mom_res.equity_curve,
-            "Mean Reversion (z)": mr_res.equity_curve,
-        },
-        title="SPY Strategy Drawdowns",
-    )
+# Same as `python -m src plot` (see src/cli.py); extra arguments are passed through.
+import sys
 
+from src.cli import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(["plot", *sys.argv[1:]])
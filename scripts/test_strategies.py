@@ -1,8 +1,8 @@
-from src.config import TICKERS, START_DATE, END_DATE, PRICE_FIELD, INTERVAL, DATA_DIR_RAW
+from src.config import TICKERS, START_DATE, END_DATE, PRICE_FIELD, INTERVAL, DATA_DIR_RAW, CACHE_FORMAT
 from src.data_loader import get_price_data
 from src.strategies import momentum, mean_reversion_zscore
 
-cache_path = f"{DATA_DIR_RAW}/prices_{'_'.join(TICKERS)}_{START_DATE}.csv"
+cache_path = f"{DATA_DIR_RAW}/prices_{'_'.join(TICKERS)}_{START_DATE}{CACHE_FORMAT}"
 data = get_price_data(TICKERS, START_DATE, END_DATE, PRICE_FIELD, INTERVAL, cache_path=cache_path)
 
 mom_pos = momentum(data.prices, lookback=20)
@@ -0,0 +1,8 @@
+# scripts/walk_forward_momentum.py
+# Same as `python -m src walk-forward` (see src/cli.py); extra arguments are passed through.
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    main(["walk-forward", *sys.argv[1:]])
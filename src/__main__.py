@@ -0,0 +1,5 @@
+# src/__main__.py
+from src.cli import main
+
+if __name__ == "__main__":
+    main()
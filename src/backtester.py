@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
 import numpy as np
 import pandas as pd
 
+from src.instrument import instrumented
+
+if TYPE_CHECKING:
+    from src.data_loader import PriceData
+
 
 @dataclass(frozen=True)
 class BacktestResult:
@@ -13,6 +20,16 @@ class BacktestResult:
     equity_curve: pd.Series         # cumulative equity (starts at 1.0)
 
 
+@dataclass(frozen=True)
+class PortfolioBacktestResult:
+    weights: pd.DataFrame           # weights used (aligned)
+    strategy_log_returns: pd.Series # portfolio-level log returns (after costs)
+    equity_curve: pd.Series         # cumulative equity (starts at 1.0)
+    turnover: pd.Series             # sum_i |w_t,i - w_{t-1},i|
+    asset_pnl: Optional[pd.DataFrame] = None  # per-asset w_{t-1,i} * r_t,i (before costs)
+
+
+@instrumented
 def backtest_positions(
     asset_log_returns: pd.DataFrame,
     positions: pd.DataFrame,
@@ -30,9 +47,11 @@ def backtest_positions(
       Example: 5 bps = 0.0005 per 1.0 change in position.
     """
 
-    # Align on common dates/assets
-    positions = positions.reindex(asset_log_returns.index).fillna(0.0)
-    positions = positions.reindex(columns=asset_log_returns.columns).fillna(0.0)
+    # Align on common dates/assets (nothing to do for frames sharing the
+    # returns' calendar, e.g. built from a src.panel.Panel)
+    if not (positions.index.equals(asset_log_returns.index) and positions.columns.equals(asset_log_returns.columns)):
+        positions = positions.reindex(index=asset_log_returns.index, columns=asset_log_returns.columns)
+    positions = positions.fillna(0.0)
 
     # Use yesterday's position to earn today's return
     held = positions.shift(1).fillna(0.0)
@@ -58,4 +77,585 @@ def backtest_positions(
         positions=positions,
         strategy_log_returns=strat_lr,
         equity_curve=equity,
-    )
\ No newline at end of file
+    )
+
+
+
+@instrumented
+def backtest_positions_compact(
+    asset_log_returns: pd.DataFrame,
+    positions: pd.DataFrame,
+    transaction_cost_bps: float = 0.0,
+    block_rows: int = 512,
+) -> BacktestResult:
+    """
+    backtest_positions for compact panels (float32 returns, int8 positions;
+    see src/compact.py). Same conventions and results up to float rounding.
+
+    Inputs keep their dtype: returns and positions are read in row blocks and
+    PnL / turnover are accumulated in float64, so no float64 copy of the panel
+    is made. The returned positions keep the input dtype as well.
+    """
+    if not (positions.index.equals(asset_log_returns.index) and positions.columns.equals(asset_log_returns.columns)):
+        positions = positions.reindex(index=asset_log_returns.index, columns=asset_log_returns.columns, fill_value=0)
+    pos = positions.to_numpy()
+    if pos.dtype.kind == "f" and np.isnan(pos).any():
+        pos = np.nan_to_num(pos, nan=0.0)
+        positions = pd.DataFrame(pos, index=positions.index, columns=positions.columns)
+
+    strat_lr, turnover, _ = portfolio_backtest_arrays(
+        asset_log_returns.to_numpy(), pos, attribution=False, block_rows=block_rows
+    )
+
+    # Equal-weight across assets
+    strat_lr /= max(len(asset_log_returns.columns), 1)
+    if transaction_cost_bps > 0:
+        strat_lr -= (transaction_cost_bps / 10_000.0) * turnover
+
+    equity = np.exp(np.cumsum(strat_lr))
+    if len(equity):
+        equity[0] = 1.0  # normalize start
+
+    idx = asset_log_returns.index
+    return BacktestResult(
+        positions=positions,
+        strategy_log_returns=pd.Series(strat_lr, index=idx),
+        equity_curve=pd.Series(equity, index=idx),
+    )
+
+
+@dataclass(frozen=True)
+class BatchBacktestResult:
+    names: List[str]                     # strategy names, in order
+    positions: np.ndarray                # (strategies, time, assets), aligned to returns
+    strategy_log_returns: pd.DataFrame   # index=date, cols=strategy
+    equity_curves: pd.DataFrame          # index=date, cols=strategy
+    assets: pd.Index                     # asset axis of `positions`
+
+    def __getitem__(self, name: str) -> BacktestResult:
+        k = self.names.index(name)
+        idx = self.strategy_log_returns.index
+        return BacktestResult(
+            positions=pd.DataFrame(self.positions[k], index=idx, columns=self.assets),
+            strategy_log_returns=self.strategy_log_returns[name],
+            equity_curve=self.equity_curves[name],
+        )
+
+    def summarize(self, risk_free_rate_annual: float = 0.0) -> pd.DataFrame:
+        """
+        One summarize_strategy row per strategy (index=Strategy), computed in bulk.
+        """
+        from src.metrics import summarize_many
+
+        return summarize_many(
+            self.strategy_log_returns,
+            self.equity_curves,
+            risk_free_rate_annual=risk_free_rate_annual,
+        )
+
+
+PositionStack = Union[Mapping[str, pd.DataFrame], Sequence[pd.DataFrame], np.ndarray]
+
+
+def _stack_positions(asset_log_returns: pd.DataFrame, positions: PositionStack, names: Optional[Sequence[str]]):
+    """
+    (names, positions tensor) aligned to asset_log_returns.
+    DataFrames sharing an index/columns reuse one indexer instead of
+    reindexing per strategy; a 3-D array is taken as already aligned.
+    """
+    idx, cols = asset_log_returns.index, asset_log_returns.columns
+
+    if isinstance(positions, np.ndarray):
+        if positions.ndim != 3 or positions.shape[1:] != asset_log_returns.shape:
+            raise ValueError("positions array must have shape (strategies, time, assets) matching asset_log_returns.")
+        names = list(names) if names is not None else [str(k) for k in range(positions.shape[0])]
+        return names, np.nan_to_num(positions.astype(np.float64), nan=0.0)
+
+    if isinstance(positions, Mapping):
+        frames = list(positions.values())
+        names = list(names) if names is not None else [str(k) for k in positions.keys()]
+    else:
+        frames = list(positions)
+        names = list(names) if names is not None else [str(k) for k in range(len(frames))]
+    if len(names) != len(frames):
+        raise ValueError("names must have one entry per position matrix.")
+
+    out = np.zeros((len(frames), len(idx), len(cols)))
+    indexers: Dict[tuple, tuple] = {}
+    for k, pos in enumerate(frames):
+        key = (id(pos.index), id(pos.columns))
+        if key not in indexers:
+            indexers[key] = (pos.index.get_indexer(idx), pos.columns.get_indexer(cols))
+        rows, cidx = indexers[key]
+        vals = pos.to_numpy(dtype=np.float64)
+        out[k][np.ix_(rows >= 0, cidx >= 0)] = vals[np.ix_(rows[rows >= 0], cidx[cidx >= 0])]
+
+    return names, np.nan_to_num(out, nan=0.0, copy=False)
+
+
+@instrumented
+def backtest_many(
+    asset_log_returns: pd.DataFrame,
+    positions: PositionStack,
+    transaction_cost_bps: Union[float, Sequence[float]] = 0.0,
+    names: Optional[Sequence[str]] = None,
+) -> BatchBacktestResult:
+    """
+    Backtest many position sets against the same returns in one pass.
+
+    positions: dict {name -> positions DataFrame}, a list of DataFrames, or a
+      (strategies, time, assets) array already aligned to asset_log_returns.
+    transaction_cost_bps: one value for all strategies or one per strategy.
+
+    Same conventions as backtest_positions (lagged positions, divide-by-N,
+    cost per unit position turnover); returns are aligned only once.
+    """
+    names, pos = _stack_positions(asset_log_returns, positions, names)
+    n_strat, n_time, n_assets = pos.shape
+
+    costs = np.broadcast_to(np.asarray(transaction_cost_bps, dtype=float), (n_strat,))
+
+    rets = asset_log_returns.to_numpy(dtype=np.float64)
+    rets = np.where(np.isnan(rets), 0.0, rets)  # pandas sum() skips NaN
+
+    held = np.zeros_like(pos)
+    held[:, 1:] = pos[:, :-1]
+    strat_lr = (held / max(n_assets, 1) * rets[None]).sum(axis=2)
+
+    if (costs > 0).any():
+        turnover = np.zeros((n_strat, n_time))
+        turnover[:, 1:] = np.abs(np.diff(pos, axis=1)).sum(axis=2)
+        strat_lr = strat_lr - (costs[:, None] / 10_000.0) * turnover
+
+    equity = np.exp(np.cumsum(strat_lr, axis=1))
+    if n_time:
+        equity[:, 0] = 1.0  # normalize start
+
+    idx = asset_log_returns.index
+    return BatchBacktestResult(
+        names=names,
+        positions=pos,
+        strategy_log_returns=pd.DataFrame(strat_lr.T, index=idx, columns=names),
+        equity_curves=pd.DataFrame(equity.T, index=idx, columns=names),
+        assets=asset_log_returns.columns,
+    )
+
+# ----------------------------
+# Portfolio (real-weight) engine
+# ----------------------------
+
+def portfolio_backtest_arrays(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    transaction_cost_bps: float = 0.0,
+    attribution: Union[bool, str] = False,
+    block_rows: int = 512,
+) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Core portfolio kernel on (time x assets) float arrays.
+
+    Returns (strategy_log_returns, turnover, asset_pnl or None).
+    Same conventions as backtest_positions: weights_{t-1} earn returns_t,
+    NaN returns count as 0, the first row earns nothing and has no turnover.
+
+    attribution: False -> no per-asset PnL; True -> the full (time x assets)
+      w_{t-1,i} * r_t,i array; "total" -> its (assets,) sum over time, built
+      block by block without the full array.
+
+    Work is done in row blocks through two preallocated (block_rows x assets)
+    buffers, so apart from the outputs no full-size temporaries are created.
+    Compact inputs (float32 returns, int8 weights) are not upcast as a whole:
+    each block is accumulated in float64.
+    """
+    if attribution not in (False, True, "total"):
+        raise ValueError("attribution must be False, True or 'total'.")
+    returns = np.asarray(returns)
+    weights = np.asarray(weights)
+    if returns.shape != weights.shape or returns.ndim != 2:
+        raise ValueError("returns and weights must be 2-D arrays of the same shape.")
+
+    n_time, n_assets = returns.shape
+    strat_lr = np.zeros(n_time)
+    turnover = np.zeros(n_time)
+    if attribution == "total":
+        asset_pnl = np.zeros(n_assets)
+    elif attribution:
+        asset_pnl = np.zeros((n_time, n_assets))
+    else:
+        asset_pnl = None
+
+    block_rows = max(int(block_rows), 1)
+    buf_r = np.empty((block_rows, n_assets))
+    buf_w = np.empty((block_rows, n_assets))
+
+    for lo in range(1, n_time, block_rows):
+        hi = min(lo + block_rows, n_time)
+        m = hi - lo
+        r, d = buf_r[:m], buf_w[:m]
+
+        # Clean returns block (NaN -> 0) without touching the caller's array
+        np.copyto(r, returns[lo:hi])
+        np.nan_to_num(r, copy=False, nan=0.0)
+
+        # PnL: w_{t-1} * r_t  (per asset, then summed)
+        pnl = asset_pnl[lo:hi] if attribution is True else d
+        np.multiply(weights[lo - 1:hi - 1], r, out=pnl, dtype=np.float64)
+        pnl.sum(axis=1, out=strat_lr[lo:hi])
+        if attribution == "total":
+            asset_pnl += pnl.sum(axis=0)
+
+        # Turnover: sum |w_t - w_{t-1}|
+        np.subtract(weights[lo:hi], weights[lo - 1:hi - 1], out=d, dtype=np.float64)
+        np.abs(d, out=d)
+        d.sum(axis=1, out=turnover[lo:hi])
+
+    if transaction_cost_bps > 0:
+        strat_lr -= (transaction_cost_bps / 10_000.0) * turnover
+
+    return strat_lr, turnover, asset_pnl
+
+
+@instrumented
+def backtest_weights(
+    asset_log_returns: pd.DataFrame,
+    weights: pd.DataFrame,
+    transaction_cost_bps: float = 0.0,
+    attribution: bool = False,
+) -> PortfolioBacktestResult:
+    """
+    Portfolio backtester for arbitrary real-valued weights.
+
+    asset_log_returns: DataFrame of log returns (index=date, cols=assets)
+    weights: DataFrame of target weights (e.g. from vol_scaled_weights or
+      normalize_gross_leverage). Unlike backtest_positions there is no
+      divide-by-N: weights are used as given.
+
+    transaction_cost_bps: cost per unit of weight turnover in basis points.
+    attribution: also return per-asset PnL (a full time x assets array, so
+      off by default).
+
+    Aligned float64 inputs are used in place (no copies); weights are only
+    copied when they need reindexing or contain NaN.
+    """
+    if not (weights.index.equals(asset_log_returns.index) and weights.columns.equals(asset_log_returns.columns)):
+        weights = weights.reindex(index=asset_log_returns.index, columns=asset_log_returns.columns)
+    w = weights.to_numpy(dtype=np.float64)
+    if np.isnan(w).any():
+        w = np.nan_to_num(w, nan=0.0)
+
+    r = asset_log_returns.to_numpy(dtype=np.float64)
+    strat_lr, turnover, asset_pnl = portfolio_backtest_arrays(
+        r, w, transaction_cost_bps=transaction_cost_bps, attribution=attribution
+    )
+
+    equity = np.exp(np.cumsum(strat_lr))
+    if len(equity):
+        equity[0] = 1.0  # normalize start
+
+    idx, cols = asset_log_returns.index, asset_log_returns.columns
+    return PortfolioBacktestResult(
+        weights=pd.DataFrame(w, index=idx, columns=cols, copy=False),
+        strategy_log_returns=pd.Series(strat_lr, index=idx),
+        equity_curve=pd.Series(equity, index=idx),
+        turnover=pd.Series(turnover, index=idx),
+        asset_pnl=None if asset_pnl is None else pd.DataFrame(asset_pnl, index=idx, columns=cols, copy=False),
+    )
+
+
+def vol_scaled_weights(
+    positions: pd.DataFrame,
+    asset_log_returns: pd.DataFrame,
+    vol_lookback: int = 20,
+    target_vol: float = 0.10,
+    max_weight: Optional[float] = None,
+    periods_per_year: int = 252,
+) -> pd.DataFrame:
+    """
+    Inverse-volatility sizing of {-1,0,1} (or any real) positions:
+      w_t,i = pos_t,i * target_vol / (sigma_t,i * sqrt(periods_per_year)) / N
+
+    sigma is the rolling std of daily log returns; each asset gets an equal
+    share of the annualized vol target. Weights are 0 until sigma is defined.
+    max_weight: optional cap on |w_t,i|.
+    """
+    positions = positions.reindex(index=asset_log_returns.index, columns=asset_log_returns.columns).fillna(0.0)
+    sigma = asset_log_returns.rolling(vol_lookback).std().to_numpy()
+    n_assets = max(len(asset_log_returns.columns), 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = target_vol / (sigma * np.sqrt(periods_per_year)) / n_assets
+    scale[~np.isfinite(scale)] = 0.0
+
+    w = positions.to_numpy(dtype=np.float64) * scale
+    if max_weight is not None:
+        np.clip(w, -max_weight, max_weight, out=w)
+    return pd.DataFrame(w, index=positions.index, columns=positions.columns)
+
+
+def normalize_gross_leverage(weights: pd.DataFrame, gross: float = 1.0) -> pd.DataFrame:
+    """
+    Rescale each row so that sum_i |w_t,i| == gross (rows of all zeros stay flat).
+    """
+    w = weights.to_numpy(dtype=np.float64)
+    row_gross = np.nansum(np.abs(w), axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(row_gross > 0, w * (gross / row_gross), 0.0)
+    return pd.DataFrame(np.nan_to_num(scaled, nan=0.0), index=weights.index, columns=weights.columns)
+
+
+# ----------------------------
+# Out-of-core (ticker-partitioned) engine
+# ----------------------------
+
+@dataclass(frozen=True)
+class ChunkedBacktestResult:
+    strategy_log_returns: pd.Series # portfolio-level log returns (after costs)
+    equity_curve: pd.Series         # cumulative equity (starts at 1.0)
+    turnover: pd.Series             # sum_i |pos_t,i - pos_{t-1},i| over the whole universe
+    asset_pnl: pd.Series            # per-asset total of pos_{t-1,i} * r_t,i / N (before costs)
+    n_chunks: int
+
+
+@instrumented
+def backtest_chunked(
+    chunks: Iterable["PriceData"],
+    strategy: Callable[["PriceData"], pd.DataFrame],
+    transaction_cost_bps: float = 0.0,
+    block_rows: int = 512,
+) -> ChunkedBacktestResult:
+    """
+    backtest_positions over a universe streamed as ticker partitions
+    (e.g. src.data_loader.iter_price_chunks).
+
+    strategy(chunk) -> positions for that chunk's tickers; it must only use
+    per-ticker operations (momentum, vol_regime_filter, ...) so that running
+    it chunk by chunk gives the same positions as on the full panel.
+
+    Each chunk contributes its gross PnL sum_i pos_{t-1,i} * r_t,i, turnover
+    and per-asset PnL; these are reduced across chunks and divided by the
+    total number of assets at the end. Only one chunk is held at a time, and
+    the result matches backtest_positions on the full panel up to rounding.
+    """
+    gross = turnover = None
+    index = None
+    pnl_parts: List[pd.Series] = []
+    n_chunks = 0
+
+    for data in chunks:
+        rets = data.log_returns
+        positions = strategy(data)
+        if not (positions.index.equals(rets.index) and positions.columns.equals(rets.columns)):
+            positions = positions.reindex(index=rets.index, columns=rets.columns, fill_value=0)
+        pos = positions.to_numpy()
+        if pos.dtype.kind == "f" and np.isnan(pos).any():
+            pos = np.nan_to_num(pos, nan=0.0)
+
+        g, t, pnl = portfolio_backtest_arrays(rets.to_numpy(), pos, attribution="total", block_rows=block_rows)
+        if index is None:
+            index, gross, turnover = rets.index, g, t
+        elif not rets.index.equals(index):
+            raise ValueError("all chunks must share the same date index.")
+        else:
+            gross += g
+            turnover += t
+        pnl_parts.append(pd.Series(pnl, index=rets.columns))
+        n_chunks += 1
+
+    if index is None:
+        raise ValueError("No chunks to backtest.")
+
+    asset_pnl = pd.concat(pnl_parts)
+    n_assets = max(len(asset_pnl), 1)
+    strat_lr = gross / n_assets
+    if transaction_cost_bps > 0:
+        strat_lr -= (transaction_cost_bps / 10_000.0) * turnover
+
+    equity = np.exp(np.cumsum(strat_lr))
+    if len(equity):
+        equity[0] = 1.0  # normalize start
+
+    return ChunkedBacktestResult(
+        strategy_log_returns=pd.Series(strat_lr, index=index),
+        equity_curve=pd.Series(equity, index=index),
+        turnover=pd.Series(turnover, index=index),
+        asset_pnl=asset_pnl / n_assets,
+        n_chunks=n_chunks,
+    )
+
+
+# ----------------------------
+# Sparse event / rebalance-calendar engine
+# ----------------------------
+#
+# Positions as change events (date, ticker, new position) instead of a dense
+# date x ticker matrix. Each event opens a holding segment that lasts until
+# the ticker's next event; PnL is added per segment over its return rows and
+# costs are charged only on event rows, so work and memory scale with the
+# number of trades (and the days those positions are held), not days x assets.
+
+EVENT_COLUMNS = ["date", "ticker", "weight"]
+
+
+def position_events(targets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Change events (date, ticker, weight) from target positions: a dense
+    position matrix or a rebalance calendar (one row per rebalance date).
+    NaN targets count as 0, like backtest_positions' fillna(0).
+    """
+    vals = np.nan_to_num(targets.to_numpy(dtype=np.float64), nan=0.0)
+    prev = np.zeros_like(vals)
+    prev[1:] = vals[:-1]
+    rows, cols = np.nonzero(vals != prev)
+    return pd.DataFrame(
+        {
+            "date": targets.index[rows],
+            "ticker": targets.columns[cols],
+            "weight": vals[rows, cols],
+        },
+        columns=EVENT_COLUMNS,
+    )
+
+
+@dataclass(frozen=True)
+class EventBacktestResult:
+    events: pd.DataFrame            # (row, col, weight) events actually applied, sorted by col, row
+    strategy_log_returns: pd.Series # portfolio-level log returns (after costs)
+    equity_curve: pd.Series         # cumulative equity (starts at 1.0)
+    turnover: pd.Series             # sum_i |pos_t,i - pos_{t-1},i| (non-zero only on event rows)
+    assets: pd.Index                # asset axis the events refer to
+
+    def holdings_at(self, date) -> pd.Series:
+        """
+        Positions held at the close of `date` (reconstructed from the events).
+        """
+        idx = self.strategy_log_returns.index
+        row = idx.searchsorted(pd.Timestamp(date), side="right") - 1
+        ev = self.events[self.events["row"] <= row]
+        last = ev.groupby("col")["weight"].last()
+        out = pd.Series(0.0, index=self.assets)
+        out.iloc[last.index.to_numpy()] = last.to_numpy()
+        return out
+
+    def positions(self) -> pd.DataFrame:
+        """
+        Dense (date x asset) positions; only for inspection on small books.
+        """
+        idx = self.strategy_log_returns.index
+        dense = np.full((len(idx), len(self.assets)), np.nan)
+        dense[0] = 0.0
+        dense[self.events["row"].to_numpy(), self.events["col"].to_numpy()] = self.events["weight"].to_numpy()
+        return pd.DataFrame(dense, index=idx, columns=self.assets).ffill()
+
+
+def _segment_pnl(
+    rets: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    col: np.ndarray,
+    weight: np.ndarray,
+    batch_cells: int = 1 << 20,
+) -> np.ndarray:
+    """
+    sum over segments of weight_k * rets[t, col_k] for t in (start_k, end_k],
+    per row t. Segments are expanded into flat (row, col) cell lists in
+    batches of ~batch_cells held cells, gathered and summed with bincount.
+    """
+    n_time = rets.shape[0]
+    keep = (weight != 0) & (end > start)
+    lo, col, weight = start[keep] + 1, col[keep], weight[keep]
+    length = end[keep] - start[keep]
+
+    gross = np.zeros(n_time)
+    cum = np.cumsum(length)
+    k0 = 0
+    while k0 < len(length):
+        base = cum[k0 - 1] if k0 else 0
+        k1 = max(int(np.searchsorted(cum, base + batch_cells, side="right")), k0 + 1)
+        seg_len = length[k0:k1]
+        n_cells = int(seg_len.sum())
+
+        # Row of every held cell: segment start + offset inside the segment
+        seg_first = np.cumsum(seg_len) - seg_len
+        rows = np.repeat(lo[k0:k1] - seg_first, seg_len) + np.arange(n_cells)
+        vals = rets[rows, np.repeat(col[k0:k1], seg_len)]
+        vals = np.where(np.isnan(vals), 0.0, vals) * np.repeat(weight[k0:k1], seg_len)
+        gross += np.bincount(rows, weights=vals, minlength=n_time)
+        k0 = k1
+    return gross
+
+
+@instrumented
+def backtest_events(
+    asset_log_returns: pd.DataFrame,
+    events: pd.DataFrame,
+    transaction_cost_bps: float = 0.0,
+) -> EventBacktestResult:
+    """
+    backtest_positions for sparse position changes.
+
+    events: DataFrame with columns date, ticker, weight (the new position of
+      `ticker` from `date` on; see position_events), or a rebalance calendar
+      (index = rebalance dates, columns = tickers, values = target positions).
+
+    Same conventions and results (up to rounding) as backtest_positions on the
+    equivalent dense matrix: the new position earns returns from the next
+    row, divide-by-N over all return columns, cost per unit of position
+    change. An event dated between trading days applies on the next trading
+    day; events for tickers outside asset_log_returns are ignored; for
+    repeated (date, ticker) events the last one wins.
+    """
+    if not set(EVENT_COLUMNS).issubset(events.columns):
+        events = position_events(events)
+
+    idx, cols = asset_log_returns.index, asset_log_returns.columns
+    n_time, n_assets = len(idx), len(cols)
+
+    ev = pd.DataFrame(
+        {
+            "row": idx.searchsorted(pd.DatetimeIndex(events["date"]), side="left"),
+            "col": cols.get_indexer(events["ticker"]),
+            "weight": events["weight"].to_numpy(dtype=np.float64),
+        }
+    )
+    ev = ev[(ev["row"] < n_time) & (ev["col"] >= 0)]
+    ev = ev.groupby(["col", "row"], sort=True).last().reset_index()
+    ev["weight"] = ev["weight"].fillna(0.0)
+
+    col = ev["col"].to_numpy()
+    row = ev["row"].to_numpy()
+    w = ev["weight"].to_numpy()
+
+    # Previous position of the same ticker (0 before its first event)
+    new_col = np.ones(len(ev), dtype=bool)
+    new_col[1:] = col[1:] != col[:-1]
+    prev_w = np.zeros(len(ev))
+    prev_w[1:] = w[:-1]
+    prev_w[new_col] = 0.0
+
+    # Costs only on event rows (no turnover on the first row, like diff())
+    turnover = np.zeros(n_time)
+    charged = row > 0
+    np.add.at(turnover, row[charged], np.abs(w - prev_w)[charged])
+
+    # Segment k holds w_k over rows (row_k, end_k]; end = next event of the ticker or the last row
+    end = np.full(len(ev), n_time - 1)
+    same_next = ~new_col[1:]
+    end[:-1][same_next] = row[1:][same_next]
+
+    gross = _segment_pnl(asset_log_returns.to_numpy(), row, end, col, w)
+
+    strat_lr = gross / max(n_assets, 1)
+    if transaction_cost_bps > 0:
+        strat_lr -= (transaction_cost_bps / 10_000.0) * turnover
+
+    equity = np.exp(np.cumsum(strat_lr))
+    if n_time:
+        equity[0] = 1.0  # normalize start
+
+    return EventBacktestResult(
+        events=ev,
+        strategy_log_returns=pd.Series(strat_lr, index=idx),
+        equity_curve=pd.Series(equity, index=idx),
+        turnover=pd.Series(turnover, index=idx),
+        assets=cols,
+    )
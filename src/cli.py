@@ -0,0 +1,465 @@
+# src/cli.py
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Callable, Dict, List, Optional
+
+from src import config
+
+# One entry point for the research pipeline:
+#
+#   python -m src dataset [--update]
+#   python -m src backtest | report
+#   python -m src grid --lookbacks 5,10,20,60
+#   python -m src rolling [--strategies momentum] [--plot | --show]
+#   python -m src vol-filter
+#   python -m src walk-forward --lookbacks 20,60 --vol-thresholds 0.015,0.02
+#   python -m src vol-sensitivity --thresholds 0.015,0.02,0.025
+#   python -m src plot [--out results/figures | --show]
+#
+# Start-up cost: this module only imports argparse and src.config. Every
+# command imports what it needs inside its handler, so numpy/pandas load only
+# once a command runs, yfinance only on a cache miss (see
+# download_prices_yfinance) and matplotlib only for plotting.
+
+
+def _csv_list(cast: Callable):
+    def parse(text: str) -> list:
+        return [cast(part) for part in text.split(",") if part]
+    return parse
+
+
+def _offline_fetcher(*args, **kwargs):
+    raise RuntimeError("--offline: nothing cached at the given path, and downloading is disabled.")
+
+
+def _cache_path(args) -> str:
+    if args.cache:
+        return args.cache
+    return f"{config.DATA_DIR_RAW}/prices_{'_'.join(args.tickers)}_{args.start}{config.CACHE_FORMAT}"
+
+
+def _ohlcv_dir(args) -> str:
+    if args.ohlcv_store:
+        return args.ohlcv_store
+    return f"{config.DATA_DIR_RAW}/ohlcv_{'_'.join(args.tickers)}_{args.start}"
+
+
+def _ohlcv(args):
+    from src.ohlcv import get_ohlcv_store
+
+    return get_ohlcv_store(
+        args.tickers,
+        args.start,
+        args.end,
+        args.interval,
+        _ohlcv_dir(args),
+        force_download=getattr(args, "force_download", False),
+        fetcher=_offline_fetcher if args.offline else None,
+    )
+
+
+def _load(args):
+    from src.data_loader import get_price_data
+
+    return get_price_data(
+        args.tickers,
+        args.start,
+        args.end,
+        args.field,
+        args.interval,
+        cache_path=_cache_path(args),
+        force_download=getattr(args, "force_download", False),
+        update=getattr(args, "update", False),
+        fetcher=_offline_fetcher if args.offline else None,
+    )
+
+
+def _aligned(data):
+    """
+    prices/returns on their common fully-populated dates, as frames sharing
+    one calendar (see src.panel.Panel.aligned), so nothing downstream has to
+    realign them.
+    """
+    from src.panel import Panel
+
+    panel = Panel.from_price_data(data).aligned()
+    return panel.prices_frame(), panel.returns_frame()
+
+
+def _base_backtests(args) -> Dict[str, object]:
+    """
+    The two reference strategies (momentum / mean reversion) used by
+    backtest, report and plot.
+    """
+    from src.backtester import backtest_positions
+    from src.strategies import mean_reversion_zscore, momentum
+
+    data = _load(args)
+    mom_pos = momentum(data.prices, lookback=args.lookback)
+    mr_pos = mean_reversion_zscore(data.prices, lookback=args.z_lookback, entry_z=1.0, exit_z=0.2)
+    return {
+        f"Momentum ({args.lookback}d)": backtest_positions(data.log_returns, mom_pos, transaction_cost_bps=args.cost_bps),
+        "Mean Reversion (z)": backtest_positions(data.log_returns, mr_pos, transaction_cost_bps=args.cost_bps),
+    }
+
+
+# ----------------------------
+# Commands
+# ----------------------------
+
+def cmd_dataset(args) -> None:
+    data = _load(args)
+    print("Saved/Loaded:", _cache_path(args))
+    print("\nPrices head:\n", data.prices.head())
+    print("\nReturns head:\n", data.log_returns.head())
+    print("\nPrices shape:", data.prices.shape)
+    print("Returns shape:", data.log_returns.shape)
+
+    if args.ohlcv:
+        store = _ohlcv(args)
+        print(f"\nOHLCV store: {store.directory} ({', '.join(store.fields)}; {len(store.tickers())} tickers)")
+
+
+def cmd_backtest(args) -> None:
+    results = _base_backtests(args)
+    for name, res in results.items():
+        print(f"{name} final equity:", float(res.equity_curve.iloc[-1]))
+    if args.verbose:
+        for name, res in results.items():
+            print(f"\n{name} equity head:\n", res.equity_curve.head())
+
+
+def cmd_report(args) -> None:
+    import pandas as pd
+
+    from src.metrics import summarize_strategy
+
+    rows = [
+        summarize_strategy(name, res.strategy_log_returns, res.equity_curve)
+        for name, res in _base_backtests(args).items()
+    ]
+    pd.set_option("display.max_columns", 100)
+    print(pd.DataFrame(rows).set_index("Strategy"))
+
+
+def cmd_grid(args) -> None:
+    import pandas as pd
+
+    from src.grid import momentum_grid
+
+    data = _load(args)
+    # All lookbacks evaluated in one pass (params x time x assets)
+    grid = momentum_grid(
+        data.prices, data.log_returns, lookbacks=args.lookbacks, cost_bps=[args.cost_bps],
+        return_positions=False,
+    )
+    df = grid.table.set_index("Lookback")[
+        ["Annual Return", "Annual Vol", "Sharpe", "Max Drawdown", "Final Equity"]
+    ]
+    pd.set_option("display.max_columns", 100)
+    print(df.sort_index())
+
+
+def _gated_momentum(args, prices, rets):
+    """
+    Momentum positions and the vol gate of --vol-lookback/--vol-threshold/
+    --vol-estimator (memoized on input data + params).
+    """
+    from src.memo import momentum, vol_regime_filter
+
+    pos = momentum(prices, lookback=args.lookback)
+    ohlc = None
+    if args.vol_estimator != "close":
+        from src.rolling_stats import RANGE_VOL_FIELDS
+
+        ohlc = _ohlcv(args).load_fields(RANGE_VOL_FIELDS[args.vol_estimator], tickers=list(rets.columns))
+    gate = vol_regime_filter(rets, args.vol_lookback, args.vol_threshold, estimator=args.vol_estimator, ohlc=ohlc)
+    return pos, gate
+
+
+def cmd_rolling(args) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from src.memo import default_cache, momentum  # memoized on input data + params
+    from src.rolling import rolling_window_metrics, window_starts
+
+    prices, rets = _aligned(_load(args))
+    window_len = args.window_years * 252
+    mom = f"Momentum ({args.lookback}d)"
+    if len(prices) < window_len + args.lookback + 5:
+        raise ValueError("Not enough data for the chosen window length / lookback.")
+
+    # Full-history positions; each window restarts its signals (warm-up)
+    if args.strategies == "momentum":
+        runs = {mom: (momentum(prices, lookback=args.lookback), args.lookback)}
+    else:
+        pos_mom, gate = _gated_momentum(args, prices, rets)
+        runs = {
+            mom: (pos_mom, args.lookback),
+            "Vol-Filtered Momentum": (pos_mom * gate, max(args.lookback, args.vol_lookback - 1)),
+        }
+
+    if args.strategies == "momentum":
+        starts = window_starts(len(prices), window_len, args.step)  # every full window
+    else:
+        starts = np.arange(0, len(prices) - window_len, args.step)  # as the comparison always had
+    results = {
+        name: rolling_window_metrics(
+            rets, pos, window_len, args.step, transaction_cost_bps=args.cost_bps, warmup=warmup, starts=starts,
+        )
+        for name, (pos, warmup) in runs.items()
+    }
+
+    pd.set_option("display.max_columns", 100)
+    if args.strategies == "momentum":
+        df = results[mom]
+        print(f"\nRolling Window Results (Momentum {args.lookback}d, {args.window_years}-year windows)\n")
+        print(df[["Sharpe", "Annual Return", "Annual Vol", "Max Drawdown", "Final Equity"]].head())
+        print("\nSummary:\n")
+        print(df[["Sharpe", "Annual Return", "Max Drawdown"]].describe())
+    else:
+        short = {mom: "Momentum", "Vol-Filtered Momentum": "Vol-Filtered"}
+        df = pd.DataFrame({
+            f"{col} {short[name]}": res[col] for col in ["Sharpe", "Max Drawdown"] for name, res in results.items()
+        })
+        print(f"\nRolling {args.window_years}-Year Sharpe / Max Drawdown Summary (Momentum {args.lookback}d)\n")
+        print(df.describe())
+    print(default_cache.report())
+
+    if args.plot or args.show:
+        from src.plotting import plot_lines
+
+        if args.strategies == "momentum":
+            tag, suffix = f"momentum_{args.lookback}d", f"(Momentum {args.lookback}d)"
+        else:
+            tag, suffix = "comparison", "Comparison"
+        for col, stem in [("Sharpe", "sharpe"), ("Max Drawdown", "max_drawdown")]:
+            path = None if args.show else os.path.join(args.out, f"rolling_{stem}_{tag}.png")
+            plot_lines(
+                {name: res[col] for name, res in results.items()},
+                title=f"Rolling {args.window_years}-Year {col} {suffix}",
+                ylabel=col,
+                xlabel="Window End Date",
+                path=path,
+                hline=0.0,
+                max_points=args.max_points,
+            )
+            if path:
+                print("Wrote", path)
+
+
+def cmd_vol_filter(args) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from src.backtester import backtest_many
+    from src.memo import default_cache
+    from src.metrics import summarize_strategy
+
+    prices, rets = _aligned(_load(args))
+    pos, gate = _gated_momentum(args, prices, rets)
+
+    # Backtest both in one pass (returns aligned once)
+    batch = backtest_many(
+        rets,
+        {f"Momentum ({args.lookback}d)": pos, f"Vol-Filtered ({args.lookback}d)": pos * gate},
+        transaction_cost_bps=args.cost_bps,
+    )
+    rows = [
+        summarize_strategy(name, batch[name].strategy_log_returns, batch[name].equity_curve)
+        for name in batch.names
+    ]
+
+    pd.set_option("display.max_columns", 100)
+    print("\nMomentum vs Vol-Filtered Momentum\n")
+    print(pd.DataFrame(rows).set_index("Strategy"))
+    # Share of (day, ticker) cells where the gate allows trading
+    print(f"\nAvg gate (fraction trading): {float(np.nanmean(gate.to_numpy())):.2%} of days\n")
+    print(default_cache.report())
+
+
+def cmd_walk_forward(args) -> None:
+    import pandas as pd
+
+    from src.metrics import summarize_strategy
+    from src.walk_forward import walk_forward_momentum
+
+    prices, rets = _aligned(_load(args))
+    wf = walk_forward_momentum(
+        prices,
+        rets,
+        lookbacks=args.lookbacks,
+        vol_thresholds=args.vol_thresholds,
+        vol_lookback=args.vol_lookback,
+        train_len=args.train_years * 252,
+        test_len=args.test_len,
+        metric=args.metric,
+        transaction_cost_bps=args.cost_bps,
+        max_workers=args.workers,
+    )
+
+    pd.set_option("display.max_columns", 100)
+    print(f"\nWalk-Forward Folds (chosen on train {args.metric})\n")
+    print(wf.folds)
+
+    print("\nStitched Out-of-Sample Performance\n")
+    print(summarize_strategy("Walk-Forward OOS", wf.oos_log_returns, wf.oos_equity))
+
+
+def cmd_vol_sensitivity(args) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from src.memo import default_cache, momentum  # memoized on input data + params
+    from src.sensitivity import vol_threshold_surface
+
+    prices, rets = _aligned(_load(args))
+    dense = np.linspace(args.dense_min, args.dense_max, args.dense) if args.dense else np.empty(0)
+
+    # Exact backtests for every threshold from one pass over the panel
+    surface = vol_threshold_surface(
+        momentum(prices, lookback=args.lookback), rets, np.concatenate([args.thresholds, dense]),
+        vol_lookbacks=[args.vol_lookback], transaction_cost_bps=args.cost_bps,
+    )
+    table = surface.table.xs(args.vol_lookback, level="Vol Lookback")
+    cols = ["Final Equity", "Annual Return", "Annual Vol", "Sharpe", "Max Drawdown", "Avg Gate %"]
+
+    pd.set_option("display.max_columns", 100)
+    print(f"\nVolatility Threshold Sensitivity (Momentum {args.lookback}d)\n")
+    print(table.loc[args.thresholds, cols])
+
+    if len(dense):
+        dense_table = table.loc[np.isin(table.index, dense), cols]
+        best = dense_table["Sharpe"].idxmax()
+        print(
+            f"\nDense grid ({len(dense)} thresholds {dense[0]:.3f}-{dense[-1]:.3f}): "
+            f"best Sharpe {dense_table.at[best, 'Sharpe']:.3f} at {best:.4f} "
+            f"(gate on {dense_table.at[best, 'Avg Gate %']:.1%} of days)"
+        )
+    print(default_cache.report())
+
+
+def cmd_plot(args) -> None:
+    from src.plotting import DEFAULT_MAX_POINTS, drawdown_spec, equity_spec, render_figures, show_figure
+
+    equity = {name: res.equity_curve for name, res in _base_backtests(args).items()}
+    label = " ".join(args.tickers) if len(args.tickers) <= 3 else f"{len(args.tickers)}-ticker"
+    stem = "_".join(args.tickers) if len(args.tickers) <= 3 else f"{len(args.tickers)}_tickers"
+    specs = [
+        equity_spec(equity, f"{label} Strategy Equity Curves", os.path.join(args.out, f"equity_{stem}.png")),
+        drawdown_spec(equity, f"{label} Strategy Drawdowns", os.path.join(args.out, f"drawdowns_{stem}.png")),
+    ]
+    if args.show:
+        for spec in specs:
+            show_figure(spec, args.max_points)
+        return
+    max_points = DEFAULT_MAX_POINTS if args.max_points is None else args.max_points
+    for path in render_figures(specs, max_points=max_points, max_workers=args.workers):
+        print("Wrote", path)
+
+
+# ----------------------------
+# Parser
+# ----------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    data_opts = argparse.ArgumentParser(add_help=False)
+    g = data_opts.add_argument_group("data")
+    g.add_argument("--tickers", type=_csv_list(str), default=list(config.TICKERS), help="comma-separated")
+    g.add_argument("--start", default=config.START_DATE)
+    g.add_argument("--end", default=config.END_DATE)
+    g.add_argument("--field", default=config.PRICE_FIELD)
+    g.add_argument("--interval", default=config.INTERVAL)
+    g.add_argument("--cache", default=None, help="price cache path (default: under DATA_DIR_RAW)")
+    g.add_argument("--ohlcv-store", default=None, help="OHLCV store directory (default: under DATA_DIR_RAW)")
+    g.add_argument("--offline", action="store_true", help="fail instead of downloading on a cache miss")
+
+    plot_opts = argparse.ArgumentParser(add_help=False)
+    g = plot_opts.add_argument_group("figures")
+    g.add_argument("--out", default=config.FIGURES_DIR, help="directory for figure files")
+    g.add_argument("--show", action="store_true", help="open interactive windows instead of writing files")
+    g.add_argument("--max-points", type=int, default=None,
+                   help="downsample lines to this many points (files: 2000 unless set)")
+    g.add_argument("--workers", type=int, default=None, help="render processes (1 = in-process)")
+
+    parser = argparse.ArgumentParser(prog="python -m src", description="Momentum research pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name: str, fn: Callable, help: str, cost_bps: Optional[float] = None, plots: bool = False) -> argparse.ArgumentParser:
+        parents = [data_opts, plot_opts] if plots else [data_opts]
+        p = sub.add_parser(name, parents=parents, help=help, description=help)
+        p.set_defaults(func=fn)
+        if cost_bps is not None:
+            p.add_argument("--cost-bps", type=float, default=cost_bps, help="cost per unit turnover")
+        return p
+
+    p = add("dataset", cmd_dataset, "download or load the price cache")
+    p.add_argument("--update", action="store_true", help="top up the cache with new bars only")
+    p.add_argument("--force-download", action="store_true")
+    p.add_argument("--ohlcv", action="store_true", help="also build/load the all-fields OHLCV store")
+
+    for name, fn, help in [
+        ("backtest", cmd_backtest, "momentum and mean-reversion backtests"),
+        ("report", cmd_report, "summary metrics for the reference strategies"),
+        ("plot", cmd_plot, "equity curves and drawdowns of the reference strategies"),
+    ]:
+        p = add(name, fn, help, cost_bps=2.0, plots=name == "plot")
+        p.add_argument("--lookback", type=int, default=20, help="momentum lookback")
+        p.add_argument("--z-lookback", type=int, default=20, help="mean-reversion z-score lookback")
+        if name == "backtest":
+            p.add_argument("--verbose", action="store_true", help="also print equity heads")
+
+    p = add("grid", cmd_grid, "momentum lookback grid search", cost_bps=2.0)
+    p.add_argument("--lookbacks", type=_csv_list(int), default=[5, 10, 20, 40, 60, 120, 180])
+
+    def add_vol_gate(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--lookback", type=int, default=60, help="momentum lookback")
+        p.add_argument("--vol-lookback", type=int, default=20)
+        p.add_argument("--vol-threshold", type=float, default=0.02, help="daily vol threshold")
+        p.add_argument("--vol-estimator", choices=["close", "parkinson", "garman_klass"], default="close",
+                       help="close-to-close std, or range-based vol from the OHLCV store")
+
+    p = add("rolling", cmd_rolling, "rolling-window Sharpe and max drawdown, momentum vs vol-filtered",
+            cost_bps=0.0, plots=True)
+    add_vol_gate(p)
+    p.add_argument("--strategies", choices=["both", "momentum"], default="both",
+                   help="momentum vs vol-filtered, or momentum alone (full per-window metrics)")
+    p.add_argument("--window-years", type=int, default=3)
+    p.add_argument("--step", type=int, default=21, help="days between window starts")
+    p.add_argument("--plot", action="store_true", help="write the Sharpe / drawdown figures to --out")
+
+    p = add("vol-filter", cmd_vol_filter, "full-history momentum vs vol-filtered momentum", cost_bps=2.0)
+    add_vol_gate(p)
+
+    p = add("walk-forward", cmd_walk_forward, "walk-forward optimization of vol-filtered momentum", cost_bps=2.0)
+    p.add_argument("--lookbacks", type=_csv_list(int), default=[20, 40, 60, 120])
+    p.add_argument("--vol-lookback", type=int, default=20)
+    p.add_argument("--vol-thresholds", type=_csv_list(float), default=[0.010, 0.015, 0.020, 0.025])
+    p.add_argument("--train-years", type=int, default=3, help="in-sample window")
+    p.add_argument("--test-len", type=int, default=126, help="out-of-sample days per fold")
+    p.add_argument("--metric", default="Sharpe", help="summary column to maximize on the train window")
+    p.add_argument("--workers", type=int, default=4, help="threads for fold selection")
+
+    p = add("vol-sensitivity", cmd_vol_sensitivity, "vol-threshold sensitivity surface", cost_bps=0.0)
+    p.add_argument("--lookback", type=int, default=60)
+    p.add_argument("--vol-lookback", type=int, default=20)
+    p.add_argument("--thresholds", type=_csv_list(float), default=[0.015, 0.020, 0.025])
+    p.add_argument("--dense", type=int, default=500, help="points in the dense grid (0 = off)")
+    p.add_argument("--dense-min", type=float, default=0.005)
+    p.add_argument("--dense-max", type=float, default=0.05)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    from src.instrument import profiling
+
+    with profiling(jsonl_path=config.PROFILE_LOG_PATH) as prof:  # PROFILE_STAGES=1 for a stage breakdown
+        args.func(args)
+    if prof.enabled:
+        print(prof.report())
@@ -0,0 +1,81 @@
+# src/compact.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Compact dtypes for large universe panels
+# ----------------------------
+#
+# Opt-in representation for panels that do not fit comfortably as float64:
+#   prices / log returns -> float32          (get_price_data(..., compact=True))
+#   positions / gates    -> int8             (dtype=COMPACT_INT in src.strategies)
+#   boolean masks        -> 1 bit per cell   (PackedMask)
+# Anything that accumulates (backtest PnL, turnover, metrics) is done in
+# float64 blocks, see backtest_positions_compact in src.backtester.
+
+COMPACT_FLOAT = np.float32
+COMPACT_INT = np.int8
+
+
+@dataclass(frozen=True)
+class PackedMask:
+    """
+    Boolean (time x assets) mask packed 8 assets per byte along each row.
+    """
+    bits: np.ndarray       # (time, ceil(assets / 8)) uint8
+    index: pd.Index
+    columns: pd.Index
+
+    @classmethod
+    def from_frame(cls, mask: pd.DataFrame) -> "PackedMask":
+        """
+        Pack a 0/1 (or bool) DataFrame, e.g. a vol_regime_filter gate.
+        NaN counts as False.
+        """
+        vals = mask.to_numpy()
+        if vals.dtype != bool:
+            vals = np.nan_to_num(vals.astype(np.float64, copy=False), nan=0.0) != 0
+        return cls(bits=np.packbits(vals, axis=1), index=mask.index, columns=mask.columns)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.index), len(self.columns)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def unpack(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        bool array for rows [start, stop).
+        """
+        return np.unpackbits(self.bits[start:stop], axis=1, count=len(self.columns)).view(bool)
+
+    def to_frame(self, dtype=COMPACT_INT) -> pd.DataFrame:
+        return pd.DataFrame(self.unpack().astype(dtype), index=self.index, columns=self.columns)
+
+    def __and__(self, other: "PackedMask") -> "PackedMask":
+        if not (self.index.equals(other.index) and self.columns.equals(other.columns)):
+            raise ValueError("masks must share index and columns.")
+        return PackedMask(bits=self.bits & other.bits, index=self.index, columns=self.columns)
+
+    def apply(self, positions: pd.DataFrame, block_rows: int = 1024) -> pd.DataFrame:
+        """
+        positions * mask, unpacking one block of rows at a time.
+        positions must share the mask's index and columns; its dtype is kept.
+        """
+        if not (positions.index.equals(self.index) and positions.columns.equals(self.columns)):
+            raise ValueError("positions must share the mask's index and columns.")
+        pos = positions.to_numpy()
+        out = np.zeros_like(pos)
+        for lo in range(0, len(self.index), block_rows):
+            hi = min(lo + block_rows, len(self.index))
+            keep = self.unpack(lo, hi)
+            np.copyto(out[lo:hi], pos[lo:hi], where=keep)
+        return pd.DataFrame(out, index=self.index, columns=self.columns)
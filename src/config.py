@@ -8,4 +8,25 @@ PRICE_FIELD = "Adj Close"  # adjusted close accounts for splits/dividends
 INTERVAL = "1d"
 
 DATA_DIR_RAW = "data/raw"
-DATA_DIR_PROCESSED = "data/processed"
\ No newline at end of file
+DATA_DIR_PROCESSED = "data/processed"
+
+# Price cache format: ".csv", ".parquet", ".feather" or ".npy" (memory-mapped).
+# Switching away from ".csv" migrates an existing CSV cache on first load.
+CACHE_FORMAT = ".csv"
+
+# On-disk store for memoized signals/gates/backtests (src/memo.py)
+MEMO_DIR = "data/processed/memo"
+
+# Benchmark history written by scripts/bench_pipeline.py (one record per run)
+BENCH_HISTORY_PATH = "data/processed/bench_history.json"
+
+# Stage timings (src/instrument.py), appended as JSON lines when profiling is on
+# (scripts switch it on with PROFILE_STAGES=1)
+PROFILE_LOG_PATH = "data/processed/stage_profile.jsonl"
+
+# Figures written by the headless plotting path (src/plotting.py)
+FIGURES_DIR = "results/figures"
+
+# OHLCV bar store (src/ohlcv.py): one file per field in this format; ".npy"
+# memory-maps each field, so only the fields/tickers actually used are read
+OHLCV_FORMAT = ".npy"
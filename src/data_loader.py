@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from src.price_store import cached_tickers, find_csv_sibling, load_prices, migrate_csv_cache, save_prices
+from src.instrument import instrumented
+
+
+# fetcher(tickers, start, end, price_field, interval) -> prices (index=date, cols=tickers)
+PriceFetcher = Callable[[List[str], str, Optional[str], str, str], pd.DataFrame]
 
 
 @dataclass(frozen=True)
@@ -15,6 +22,31 @@ class PriceData:
     log_returns: pd.DataFrame
 
 
+# yf.download collects results in module-global state (yf.shared._DFS /
+# _ERRORS), so concurrent calls can swap or drop each other's frames: one
+# call at a time, whichever thread it comes from.
+_YFINANCE_LOCK = threading.Lock()
+
+
+def _download_yfinance(tickers: List[str], start: str, end: Optional[str], interval: str) -> pd.DataFrame:
+    import yfinance as yf  # heavy (curl_cffi, lxml, ...); only needed on a cache miss
+
+    with _YFINANCE_LOCK:
+        df = yf.download(
+            tickers=tickers,
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=False,
+            progress=False,
+            group_by="column",
+        )
+
+    if df.empty:
+        raise ValueError("No data returned. Check tickers/dates/network.")
+    return df
+
+
 def download_prices_yfinance(
     tickers: List[str],
     start: str,
@@ -22,18 +54,7 @@ def download_prices_yfinance(
     price_field: str = "Adj Close",
     interval: str = "1d",
 ) -> pd.DataFrame:
-    df = yf.download(
-        tickers=tickers,
-        start=start,
-        end=end,
-        interval=interval,
-        auto_adjust=False,
-        progress=False,
-        group_by="column",
-    )
-
-    if df.empty:
-        raise ValueError("No data returned. Check tickers/dates/network.")
+    df = _download_yfinance(tickers, start, end, interval)
 
     # Multiple tickers => MultiIndex columns: (field, ticker)
     if isinstance(df.columns, pd.MultiIndex):
@@ -48,10 +69,52 @@ def download_prices_yfinance(
     return prices
 
 
+# fetcher(tickers, start, end, interval) -> bars with (field, ticker) MultiIndex columns
+OhlcvFetcher = Callable[[List[str], str, Optional[str], str], pd.DataFrame]
+
+OHLCV_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def download_ohlcv_yfinance(
+    tickers: List[str],
+    start: str,
+    end: Optional[str] = None,
+    interval: str = "1d",
+) -> pd.DataFrame:
+    """
+    All OHLCV fields in one download: columns are a (field, ticker) MultiIndex,
+    fields in OHLCV_FIELDS order; dates with no bars at all are dropped.
+    """
+    df = _download_yfinance(tickers, start, end, interval)
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        # Single ticker => flat columns
+        df.columns = pd.MultiIndex.from_product([df.columns, tickers])
+
+    fields = [f for f in OHLCV_FIELDS if f in df.columns.get_level_values(0)]
+    bars = df.reindex(columns=pd.MultiIndex.from_product([fields, tickers]))
+    bars = bars.sort_index().dropna(how="all")
+    bars.index = pd.to_datetime(bars.index)
+    return bars
+
+
+@instrumented
 def compute_log_returns(prices: pd.DataFrame) -> pd.DataFrame:
     return np.log(prices).diff().dropna(how="all")
 
 
+def compact_price_data(data: PriceData) -> PriceData:
+    """
+    float32 copy of a PriceData (half the memory, see src/compact.py).
+    Log returns are computed from the float64 prices before the cast, so they
+    only lose float32 rounding, not the cancellation of log(P_t) - log(P_{t-1}).
+    """
+    return PriceData(
+        prices=data.prices.astype(np.float32),
+        log_returns=data.log_returns.astype(np.float32),
+    )
+
+
 def save_prices_csv(prices: pd.DataFrame, filepath: str) -> None:
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     prices.to_csv(filepath)
@@ -62,6 +125,82 @@ def load_prices_csv(filepath: str) -> pd.DataFrame:
     return df
 
 
+def _fmt_date(ts: pd.Timestamp) -> str:
+    return pd.Timestamp(ts).strftime("%Y-%m-%d")
+
+
+@instrumented
+def update_price_cache(
+    cache_path: str,
+    tickers: List[str],
+    start: str,
+    end: Optional[str],
+    price_field: str,
+    interval: str,
+    fetcher: Optional[PriceFetcher] = None,
+    overlap_days: int = 5,
+    rtol: float = 1e-6,
+) -> pd.DataFrame:
+    """
+    Top up an existing price cache instead of re-downloading everything.
+
+    - Tickers already cached: fetch only from `overlap_days` bars before the
+      earliest last-cached date up to `end`.
+    - Overlap check: if the re-fetched overlap disagrees with the cache beyond
+      rtol (adjusted closes get rescaled after splits/dividends), that ticker's
+      full history is re-fetched (targeted backfill) and replaces its column.
+    - Tickers not in the cache yet: full history from `start`.
+
+    The merged panel is written back atomically and returned.
+    fetcher defaults to download_prices_yfinance; pass a stub to run offline.
+    """
+    fetch = fetcher or download_prices_yfinance
+    cached = load_prices(cache_path)
+
+    known = [t for t in tickers if t in cached.columns]
+    new = [t for t in tickers if t not in cached.columns]
+    prices = cached
+
+    if known:
+        last_dates = cached[known].apply(lambda col: col.last_valid_index())
+        if last_dates.isna().any():
+            # Nothing valid cached for some tickers -> treat them as new
+            new += list(last_dates.index[last_dates.isna()])
+            known = [t for t in known if t not in new]
+            last_dates = last_dates.dropna()
+
+    if known:
+        earliest = cached.index.get_loc(last_dates.min())
+        fetch_start = cached.index[max(earliest - overlap_days, 0)]
+        tail = fetch(known, _fmt_date(fetch_start), end, price_field, interval)
+        tail = tail.reindex(columns=known)
+
+        # Overlap reconciliation: cached vs re-fetched values on shared dates
+        overlap = tail.index.intersection(cached.index)
+        old_vals = cached.loc[overlap, known]
+        new_vals = tail.loc[overlap, known]
+        both = old_vals.notna() & new_vals.notna()
+        mismatch = ~np.isclose(old_vals.to_numpy(), new_vals.to_numpy(), rtol=rtol, atol=0.0)
+        revised = [t for t, bad in zip(known, (mismatch & both.to_numpy()).any(axis=0)) if bad]
+
+        prices = tail.combine_first(prices)
+
+        if revised:
+            backfill = fetch(revised, start, end, price_field, interval).reindex(columns=revised)
+            prices = prices.drop(columns=revised).join(backfill, how="outer")
+
+    if new:
+        fresh = fetch(new, start, end, price_field, interval).reindex(columns=new)
+        # All-NaN cached columns count as new: replace them, like the backfill
+        prices = prices.drop(columns=new, errors="ignore").join(fresh, how="outer")
+
+    columns = list(cached.columns) + [t for t in tickers if t not in cached.columns]
+    prices = prices.reindex(columns=columns).sort_index().dropna(how="all")
+    save_prices(prices, cache_path)
+    return prices
+
+
+@instrumented
 def get_price_data(
     tickers: List[str],
     start: str,
@@ -70,15 +209,74 @@ def get_price_data(
     interval: str,
     cache_path: Optional[str] = None,
     force_download: bool = False,
+    update: bool = False,
+    fetcher: Optional[PriceFetcher] = None,
+    compact: bool = False,
 ) -> PriceData:
-    # What we’re doing: cache downloaded data to CSV
+    """
+    update: top up an existing cache with the missing tail (see update_price_cache).
+    fetcher: replaces download_prices_yfinance (e.g. a stub for offline runs).
+    compact: return float32 prices/returns (see compact_price_data).
+    """
+    fetch = fetcher or download_prices_yfinance
+
+    # What we’re doing: cache downloaded data locally (format picked from the
+    # cache_path extension: .csv, .parquet, .feather or .npy)
     # Why: reproducibility + faster reruns + no dependency on network every run
+    if cache_path and (not force_download) and not os.path.exists(cache_path):
+        # One-time migration from an existing CSV cache with the same name
+        csv_path = find_csv_sibling(cache_path)
+        if csv_path:
+            migrate_csv_cache(csv_path, cache_path)
+
     if cache_path and (not force_download) and os.path.exists(cache_path):
-        prices = load_prices_csv(cache_path)
+        if update:
+            prices = update_price_cache(
+                cache_path, tickers, start, end, price_field, interval, fetcher=fetch
+            )
+        else:
+            prices = load_prices(cache_path)
     else:
-        prices = download_prices_yfinance(tickers, start, end, price_field, interval)
+        prices = fetch(tickers, start, end, price_field, interval)
         if cache_path:
-            save_prices_csv(prices, cache_path)
+            save_prices(prices, cache_path)
 
     log_returns = compute_log_returns(prices)
-    return PriceData(prices=prices, log_returns=log_returns)
\ No newline at end of file
+    data = PriceData(prices=prices, log_returns=log_returns)
+    return compact_price_data(data) if compact else data
+
+
+def iter_price_chunks(
+    cache_path: str,
+    chunk_size: int = 500,
+    tickers: Optional[List[str]] = None,
+    compact: bool = False,
+) -> Iterator[PriceData]:
+    """
+    Stream an on-disk price cache (written by get_price_data) as ticker
+    partitions: one PriceData per block of chunk_size columns, so memory is
+    bounded by the chunk instead of the universe.
+
+    Every chunk's log returns keep exactly the dates compute_log_returns keeps
+    on the full panel (a date is dropped only if no ticker has a return), so
+    per-ticker signals and gates match the in-memory path. Finding those dates
+    takes one extra pass over the cache.
+
+    tickers: subset/order of tickers to stream (default: all cached tickers).
+    compact: yield float32 chunks (see compact_price_data).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    tickers = list(tickers) if tickers is not None else cached_tickers(cache_path)
+    parts = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+    keep = None
+    for cols in parts:
+        has_return = np.log(load_prices(cache_path, columns=cols)).diff().notna().any(axis=1).to_numpy()
+        keep = has_return if keep is None else keep | has_return
+
+    for cols in parts:
+        prices = load_prices(cache_path, columns=cols)
+        log_returns = np.log(prices).diff()[keep]
+        data = PriceData(prices=prices, log_returns=log_returns)
+        yield compact_price_data(data) if compact else data
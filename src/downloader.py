@@ -0,0 +1,130 @@
+# src/downloader.py
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.data_loader import PriceFetcher, download_prices_yfinance
+
+
+@dataclass(frozen=True)
+class DownloadReport:
+    prices: pd.DataFrame      # merged, date-aligned panel of the tickers that succeeded
+    failed: Dict[str, str]    # ticker -> last error message
+    n_requests: int           # fetcher calls made, including retries
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def download_prices_chunked(
+    tickers: List[str],
+    start: str,
+    end: Optional[str] = None,
+    price_field: str = "Adj Close",
+    interval: str = "1d",
+    fetcher: Optional[PriceFetcher] = None,
+    chunk_size: int = 50,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    max_split_depth: int = 6,
+    backoff: float = 1.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> DownloadReport:
+    """
+    Download a large universe in chunks on a bounded thread pool.
+
+    - Each chunk is retried up to max_retries times with exponential backoff
+      (backoff * 2**attempt seconds).
+    - A chunk that still fails is split in half, so one bad symbol only loses
+      itself instead of the whole batch. Halves get a single attempt each (the
+      chunk already used up the retries) and splitting stops after
+      max_split_depth levels, so a bad symbol costs at most
+      max_retries + 1 + 2 * max_split_depth requests.
+    - Tickers that come back all-NaN are recorded as failed ("no data").
+
+    fetcher: same signature as download_prices_yfinance (inject a fake source in tests).
+      The default yfinance source is serialized (see data_loader._YFINANCE_LOCK),
+      so max_workers only overlaps requests for thread-safe fetchers.
+    sleep: injectable so retry logic can be exercised without waiting.
+    """
+    if chunk_size <= 0 or max_workers <= 0:
+        raise ValueError("chunk_size and max_workers must be positive.")
+    if max_split_depth < 0:
+        raise ValueError("max_split_depth must be non-negative.")
+
+    fetch = fetcher or download_prices_yfinance
+    tickers = list(dict.fromkeys(tickers))  # de-duplicate, keep order
+    n_requests = 0
+    counter_lock = threading.Lock()
+
+    def fetch_with_retry(chunk: List[str], depth: int = 0) -> tuple[List[pd.DataFrame], Dict[str, str]]:
+        nonlocal n_requests
+        error = ""
+        for attempt in range(max_retries + 1 if depth == 0 else 1):
+            if attempt > 0:
+                sleep(backoff * 2 ** (attempt - 1))
+            with counter_lock:
+                n_requests += 1
+            try:
+                df = fetch(chunk, start, end, price_field, interval)
+            except Exception as e:  # network, throttling, bad symbols...
+                error = f"{type(e).__name__}: {e}"
+                continue
+            return [df.reindex(columns=chunk)], {}
+
+        if len(chunk) == 1 or depth >= max_split_depth:
+            return [], {t: error for t in chunk}
+
+        # Bisect so a single bad symbol does not sink its neighbours
+        mid = len(chunk) // 2
+        left_frames, left_failed = fetch_with_retry(chunk[:mid], depth + 1)
+        right_frames, right_failed = fetch_with_retry(chunk[mid:], depth + 1)
+        return left_frames + right_frames, {**left_failed, **right_failed}
+
+    frames: List[pd.DataFrame] = []
+    failed: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for chunk_frames, chunk_failed in pool.map(fetch_with_retry, _chunks(tickers, chunk_size)):
+            frames.extend(chunk_frames)
+            failed.update(chunk_failed)
+
+    if frames:
+        prices = pd.concat(frames, axis=1, join="outer").sort_index()
+    else:
+        prices = pd.DataFrame()
+
+    for t in tickers:
+        if t not in failed and (t not in prices.columns or prices[t].isna().all()):
+            failed[t] = "no data"
+
+    ok = [t for t in tickers if t not in failed]
+    prices = prices.reindex(columns=ok).dropna(how="all")
+    if len(prices.index):
+        prices.index = pd.to_datetime(prices.index)
+
+    return DownloadReport(prices=prices, failed=failed, n_requests=n_requests)
+
+
+def make_chunked_fetcher(**kwargs) -> PriceFetcher:
+    """
+    Wrap download_prices_chunked as a PriceFetcher so it can be passed to
+    get_price_data(fetcher=...). Failed tickers are reported with a warning;
+    raises ValueError if nothing could be downloaded.
+    """
+    def fetcher(tickers, start, end, price_field, interval) -> pd.DataFrame:
+        report = download_prices_chunked(tickers, start, end, price_field, interval, **kwargs)
+        if report.failed:
+            warnings.warn(f"Failed to download {len(report.failed)} tickers: {sorted(report.failed)}")
+        if report.prices.empty:
+            raise ValueError("No data returned. Check tickers/dates/network.")
+        return report.prices
+
+    return fetcher
@@ -0,0 +1,129 @@
+# src/grid.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.metrics import summarize_many
+
+
+@dataclass(frozen=True)
+class GridResult:
+    params: pd.DataFrame              # one row per (lookback, threshold, cost) combination
+    positions: np.ndarray             # (n_lookbacks * n_thresholds, time, assets), aligned to returns
+    strategy_log_returns: np.ndarray  # (n_params, time)
+    equity_curves: np.ndarray         # (n_params, time), starts at 1.0
+    index: pd.Index                   # dates of the time axis
+    columns: pd.Index                 # assets of the asset axis
+    table: pd.DataFrame               # tidy summary metrics, one row per combination
+
+
+def _align_rows(prices: pd.DataFrame, asset_log_returns: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Row indexer from the returns calendar into the prices calendar (-1 = missing),
+    and the prices array reindexed to the returns columns.
+    Same alignment backtest_positions does with reindex(...).fillna(0.0).
+    """
+    prices = prices.reindex(columns=asset_log_returns.columns)
+    rows = prices.index.get_indexer(asset_log_returns.index)
+    return rows, prices.to_numpy(dtype=float)
+
+
+def _shifted_ratio(p: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    P_t / P_{t-lookback} - 1 along axis 0, NaN for the first `lookback` rows.
+    """
+    out = np.full(p.shape, np.nan)
+    if lookback < p.shape[0]:
+        out[lookback:] = p[lookback:] / p[:-lookback] - 1.0
+    return out
+
+
+def momentum_grid(
+    prices: pd.DataFrame,
+    asset_log_returns: pd.DataFrame,
+    lookbacks: Sequence[int],
+    thresholds: Sequence[float] = (0.0,),
+    cost_bps: Sequence[float] = (0.0,),
+    return_positions: bool = True,
+) -> GridResult:
+    """
+    Evaluate momentum(prices, lookback, threshold) + backtest_positions(...)
+    for every combination of lookbacks x thresholds x cost_bps in one pass.
+
+    Positions are built as a (signal params x time x assets) tensor, the
+    portfolio gross return and turnover are reduced over assets once per
+    signal, and costs are broadcast on top since they do not change positions.
+    Results match the per-combination pandas pipeline.
+
+    return_positions: drop the positions tensor from the result to save memory
+      on wide universes (an empty array is returned instead).
+    """
+    lookbacks = np.asarray(lookbacks, dtype=int)
+    thresholds = np.asarray(thresholds, dtype=float)
+    costs = np.asarray(cost_bps, dtype=float)
+    if lookbacks.size == 0 or thresholds.size == 0 or costs.size == 0:
+        raise ValueError("lookbacks, thresholds and cost_bps must be non-empty.")
+
+    rows, p = _align_rows(prices, asset_log_returns)
+    rets = asset_log_returns.to_numpy(dtype=float)
+    rets = np.where(np.isnan(rets), 0.0, rets)  # pandas sum() skips NaN
+    n_time, n_assets = rets.shape
+    n_sig = lookbacks.size * thresholds.size
+
+    gross = np.empty((n_sig, n_time))
+    turnover = np.empty((n_sig, n_time))
+    positions = np.empty((n_sig, n_time, n_assets)) if return_positions else np.empty((0, n_time, n_assets))
+
+    k = 0
+    for lb in lookbacks:
+        signal = _shifted_ratio(p, int(lb))
+        signal = np.where(rows[:, None] >= 0, signal[np.maximum(rows, 0)], np.nan)
+
+        # (thresholds, time, assets): +1 above threshold, -1 below -threshold (wins ties)
+        th = thresholds[:, None, None]
+        pos = np.where(signal[None] > th, 1.0, 0.0)
+        pos = np.where(signal[None] < -th, -1.0, pos)
+
+        held = np.zeros_like(pos)
+        held[:, 1:] = pos[:, :-1]
+        gross[k:k + thresholds.size] = (held / max(n_assets, 1) * rets[None]).sum(axis=2)
+
+        turnover[k:k + thresholds.size, 0] = 0.0
+        turnover[k:k + thresholds.size, 1:] = np.abs(np.diff(pos, axis=1)).sum(axis=2)
+
+        if return_positions:
+            positions[k:k + thresholds.size] = pos
+        k += thresholds.size
+
+    # (signals, costs, time) -> (params, time)
+    strat_lr = gross[:, None, :] - (costs[None, :, None] / 10_000.0) * turnover[:, None, :]
+    strat_lr = strat_lr.reshape(n_sig * costs.size, n_time)
+
+    equity = np.exp(np.cumsum(strat_lr, axis=1))
+    equity[:, 0] = 1.0
+
+    params = pd.DataFrame(
+        {
+            "Lookback": np.repeat(lookbacks, thresholds.size * costs.size),
+            "Threshold": np.tile(np.repeat(thresholds, costs.size), lookbacks.size),
+            "Cost (bps)": np.tile(costs, n_sig),
+        }
+    )
+    summary = pd.DataFrame(summarize_many(strat_lr, equity))[
+        ["Annual Return", "Annual Vol", "Sharpe", "Max Drawdown", "Final Equity", "Win Rate"]
+    ]
+    table = pd.concat([params, summary], axis=1)
+
+    return GridResult(
+        params=params,
+        positions=positions,
+        strategy_log_returns=strat_lr,
+        equity_curves=equity,
+        index=asset_log_returns.index,
+        columns=asset_log_returns.columns,
+        table=table,
+    )
@@ -0,0 +1,281 @@
+# src/instrument.py
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Stage-level timing / allocation records
+# ----------------------------
+#
+# Pipeline functions (load, signals, gates, backtests, metrics) are wrapped
+# with @instrumented. While instrumentation is disabled (the default) the
+# wrapper is a single flag check before calling straight through.
+#
+# When enabled, every stage call produces one record:
+#   stage, wall_s, depth/parent (stages nest), input shapes,
+#   peak_mb (extra allocation during the stage; only with memory=True, since
+#   tracemalloc slows everything down), cache_hits (memo cache hits during
+#   the stage, when src.memo is in use)
+# Records are kept in memory and optionally appended to a JSON-lines file.
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.owns_tracing = False   # tracemalloc was started by enable()
+        self.records: List[Dict[str, Any]] = []
+        self.sink = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+
+_STATE = _State()
+
+
+def _stack() -> list:
+    stack = getattr(_STATE.local, "stack", None)
+    if stack is None:
+        stack = _STATE.local.stack = []
+    return stack
+
+
+def _cache_hits() -> Optional[int]:
+    memo = sys.modules.get("src.memo")  # only if the caller uses memoized functions
+    if memo is None:
+        return None
+    stats = memo.default_cache.stats
+    return stats.hits + stats.disk_hits
+
+
+def _shapes(args, kwargs) -> List[List[int]]:
+    return [
+        list(a.shape)
+        for a in (*args, *kwargs.values())
+        if isinstance(a, (pd.DataFrame, pd.Series, np.ndarray))
+    ]
+
+
+class _Stage:
+    """
+    Context manager timing one stage; `info` can be annotated by the body.
+    """
+    __slots__ = ("name", "info", "t0", "hits0", "mem0", "mem_max")
+
+    def __init__(self, name: str, info: Dict[str, Any]):
+        self.name = name
+        self.info = info
+
+    def __enter__(self) -> Dict[str, Any]:
+        stack = _stack()
+        if _STATE.memory and tracemalloc.is_tracing():
+            cur, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].mem_max = max(stack[-1].mem_max, peak)
+            tracemalloc.reset_peak()
+            self.mem0 = self.mem_max = cur
+        else:
+            self.mem0 = self.mem_max = None
+        stack.append(self)
+        self.hits0 = _cache_hits()
+        self.t0 = time.perf_counter()
+        return self.info
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter() - self.t0
+        stack = _stack()
+        stack.pop()
+
+        peak_mb = None
+        if self.mem0 is not None and tracemalloc.is_tracing():
+            self.mem_max = max(self.mem_max, tracemalloc.get_traced_memory()[1])
+            peak_mb = (self.mem_max - self.mem0) / 1e6
+            if stack and stack[-1].mem_max is not None:
+                stack[-1].mem_max = max(stack[-1].mem_max, self.mem_max)
+
+        hits1 = _cache_hits()
+        record = {
+            "stage": self.name,
+            "wall_s": wall,
+            "depth": len(stack),
+            "parent": stack[-1].name if stack else None,
+            "peak_mb": peak_mb,
+            "cache_hits": None if hits1 is None else hits1 - (self.hits0 or 0),
+            "pid": os.getpid(),
+            "time": time.time(),
+            **self.info,
+        }
+        _emit(record)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    with _STATE.lock:
+        _STATE.records.append(record)
+        if _STATE.sink is not None:
+            _STATE.sink.write(json.dumps(record, default=str) + "\n")
+
+
+def stage(name: str, **info: Any):
+    """
+    Time a block as a named stage:
+
+        with stage("universe filter", n_tickers=len(tickers)) as rec:
+            ...
+            rec["kept"] = n_kept   # extra fields end up in the record
+
+    Does nothing (beyond returning a no-op context manager) while disabled.
+    """
+    if not _STATE.enabled:
+        return _NULL_STAGE
+    return _Stage(name, info)
+
+
+def instrumented(fn: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator: record each call of fn as a stage (named after fn by default),
+    with the shapes of its DataFrame/Series/array arguments.
+    """
+    def wrap(f: Callable) -> Callable:
+        stage_name = name or f.__name__
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _STATE.enabled:
+                return f(*args, **kwargs)
+            with _Stage(stage_name, {"shapes": _shapes(args, kwargs)}):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return wrap(fn) if fn is not None else wrap
+
+
+# ----------------------------
+# Switching on/off and collecting
+# ----------------------------
+
+def enable(jsonl_path: Optional[str] = None, memory: bool = False) -> None:
+    """
+    Start recording. jsonl_path: also append records to this file.
+    memory: measure per-stage peak allocation with tracemalloc (slow).
+    """
+    disable()
+    if jsonl_path:
+        dirname = os.path.dirname(jsonl_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        _STATE.sink = open(jsonl_path, "a")
+    _STATE.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _STATE.owns_tracing = True
+    _STATE.enabled = True
+
+
+def disable() -> None:
+    _STATE.enabled = False
+    if _STATE.owns_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _STATE.owns_tracing = False
+    _STATE.memory = False
+    if _STATE.sink is not None:
+        _STATE.sink.close()
+        _STATE.sink = None
+
+
+def is_enabled() -> bool:
+    return _STATE.enabled
+
+
+def records() -> List[Dict[str, Any]]:
+    with _STATE.lock:
+        return list(_STATE.records)
+
+
+def reset() -> None:
+    with _STATE.lock:
+        _STATE.records.clear()
+
+
+def stage_report(recs: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    Per-stage breakdown: calls, total/mean wall time, share of the top-level
+    time, worst peak allocation and cache hits. Sorted by total time.
+    """
+    recs = records() if recs is None else recs
+    cols = ["Calls", "Total (s)", "Mean (s)", "% of run", "Peak (MB)", "Cache hits"]
+    if not recs:
+        return pd.DataFrame(columns=cols)
+
+    df = pd.DataFrame(recs)
+    run_total = df.loc[df["depth"] == 0, "wall_s"].sum()
+    g = df.groupby("stage")
+    out = pd.DataFrame(
+        {
+            "Calls": g.size(),
+            "Total (s)": g["wall_s"].sum(),
+            "Mean (s)": g["wall_s"].mean(),
+            "Peak (MB)": g["peak_mb"].max(),
+            "Cache hits": g["cache_hits"].sum(min_count=1),
+        }
+    )
+    out["% of run"] = 100.0 * out["Total (s)"] / run_total if run_total > 0 else np.nan
+    out.index.name = "Stage"
+    return out[cols].sort_values("Total (s)", ascending=False)
+
+
+class profiling:
+    """
+    Context manager for scripts: record stages inside the block, then
+    print(prof.report()).
+
+    enabled=None reads the PROFILE_STAGES environment variable (1 = timings,
+    "memory" = timings + peak allocation), so scripts can keep the block in
+    place at no cost and nightly runs switch it on.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, memory: Optional[bool] = None, enabled: Optional[bool] = None):
+        env = os.environ.get("PROFILE_STAGES", "")
+        self.enabled = env not in ("", "0") if enabled is None else enabled
+        self.memory = env == "memory" if memory is None else memory
+        self.jsonl_path = jsonl_path
+        self.records: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "profiling":
+        if self.enabled:
+            reset()
+            enable(self.jsonl_path, memory=self.memory)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.enabled:
+            disable()
+            self.records = records()
+
+    def report(self) -> str:
+        if not self.enabled:
+            return ""
+        return "Stage breakdown\n\n" + stage_report(self.records).to_string(float_format=lambda v: f"{v:.4f}")
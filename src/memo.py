@@ -0,0 +1,286 @@
+# src/memo.py
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src import backtester, strategies
+from src.config import MEMO_DIR
+from src.instrument import stage
+
+
+# ----------------------------
+# Content hashing
+# ----------------------------
+
+def fingerprint(obj: Any) -> str:
+    """
+    Stable content hash of a function argument.
+    DataFrames/Series hash their values, index and columns; indexes every
+    label; arrays their bytes, shape and dtype; timestamps their ns value and
+    tz; everything else its repr.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    _update(h, obj)
+    return h.hexdigest()
+
+
+def _update(h, obj: Any) -> None:
+    if isinstance(obj, pd.Index):
+        # repr truncates long indexes; hash every label
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        h.update(repr((list(obj.names), str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+    elif isinstance(obj, pd.Timestamp):
+        h.update(repr(("Timestamp", obj.value, str(obj.tz))).encode())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+            h.update(repr(list(obj.dtypes.astype(str))).encode())
+        else:
+            h.update(repr((obj.name, str(obj.dtype))).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode())
+        for k in sorted(obj, key=repr):
+            _update(h, k)
+            _update(h, obj[k])
+    else:
+        h.update(repr(obj).encode())
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, "__dataclass_fields__"):
+        return sum(_nbytes(getattr(value, f)) for f in value.__dataclass_fields__)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# ----------------------------
+# Two-level cache (memory LRU + disk)
+# ----------------------------
+
+@dataclass
+class CacheStats:
+    hits: int = 0          # served from memory
+    disk_hits: int = 0     # served from disk (and promoted to memory)
+    misses: int = 0        # computed
+    evictions: int = 0     # memory + disk evictions
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else float("nan")
+
+
+class MemoCache:
+    """
+    Content-addressed cache for pure research functions.
+
+    max_bytes: bound on the in-memory LRU (approximate, from array sizes).
+    disk_dir: optional on-disk store (one pickle per key); None = memory only.
+    disk_max_bytes: bound on the disk store; least recently used files go first.
+
+    Cached values are returned as-is (not copied): treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024**2,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 2 * 1024**3,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = CacheStats()
+        self._mem: "OrderedDict[str, tuple[Any, int]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+
+    # -- memory --
+    def _mem_get(self, key: str):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return True, self._mem[key][0]
+        return False, None
+
+    def _mem_put(self, key: str, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._mem:
+                self._mem_bytes -= self._mem.pop(key)[1]
+            self._mem[key] = (value, size)
+            self._mem_bytes += size
+            while self._mem_bytes > self.max_bytes:
+                _, (_, old_size) = self._mem.popitem(last=False)
+                self._mem_bytes -= old_size
+                self.stats.evictions += 1
+
+    # -- disk --
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _disk_get(self, key: str):
+        if not self.disk_dir:
+            return False, None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)  # mark as recently used
+        return True, value
+
+    def _disk_put(self, key: str, value: Any) -> None:
+        if not self.disk_dir:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".pkl"):
+                st = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(e[1] for e in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.stats.evictions += 1
+
+    # -- public --
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        found, value = self._mem_get(key)
+        if found:
+            self.stats.hits += 1
+            return value
+
+        found, value = self._disk_get(key)
+        if found:
+            self.stats.disk_hits += 1
+            self._mem_put(key, value)
+            return value
+
+        self.stats.misses += 1
+        value = compute()
+        self._mem_put(key, value)
+        self._disk_put(key, value)
+        return value
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def report(self) -> str:
+        s = self.stats
+        return (
+            f"memo cache: {s.hits} hits, {s.disk_hits} disk hits, {s.misses} misses "
+            f"({s.hit_rate:.0%} hit rate), {s.evictions} evictions, "
+            f"{self._mem_bytes / 1e6:.1f} MB in memory"
+        )
+
+
+default_cache = MemoCache(disk_dir=MEMO_DIR)
+
+
+def code_version(f: Callable) -> str:
+    """
+    Hash of the source of the module defining f (of the wrapped function for
+    decorated ones), so cache entries written by an older implementation of f
+    or of a helper next to it (momentum -> momentum_signal) are never served.
+    """
+    f = inspect.unwrap(f)
+    try:
+        source = inspect.getsource(inspect.getmodule(f) or f)
+    except (OSError, TypeError):  # no source file (REPL, builtins)
+        source = repr(getattr(f, "__code__", f))
+    return hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+
+
+def memoize(fn: Optional[Callable] = None, *, cache: Optional[MemoCache] = None, version: Any = None):
+    """
+    Decorator: cache fn's result keyed on (module.qualname, code version,
+    hashed arguments). Defaults are applied before hashing, so f(x) and
+    f(x, lookback=20) share an entry when 20 is the default.
+
+    Invalidation: editing the module that defines fn (fn itself or any
+    helper in that module) changes its key automatically. Changes in other
+    modules that alter its results (a rolling kernel in src.rolling_stats, a
+    dependency upgrade) are not seen: bump `version` for that function, or
+    drop everything with default_cache.clear(disk=True) (or delete
+    config.MEMO_DIR).
+    """
+    def wrap(f: Callable) -> Callable:
+        sig = inspect.signature(f)
+        name = f"{f.__module__}.{f.__qualname__}@{code_version(f)}:{version!r}"
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            with stage(f"memo:{f.__name__}"):
+                key = fingerprint((name, tuple(bound.arguments.items())))
+                return (cache or default_cache).get_or_compute(key, lambda: f(*args, **kwargs))
+
+        return wrapper
+
+    return wrap(fn) if fn is not None else wrap
+
+
+# ----------------------------
+# Memoized research functions
+# ----------------------------
+
+momentum_signal = memoize(strategies.momentum_signal)
+mean_reversion_zscore_signal = memoize(strategies.mean_reversion_zscore_signal)
+sign_threshold_rule = memoize(strategies.sign_threshold_rule)
+zscore_entry_exit_rule = memoize(strategies.zscore_entry_exit_rule)
+vol_regime_filter = memoize(strategies.vol_regime_filter)
+momentum = memoize(strategies.momentum)
+mean_reversion_zscore = memoize(strategies.mean_reversion_zscore)
+cross_sectional_momentum = memoize(strategies.cross_sectional_momentum)
+backtest_positions = memoize(backtester.backtest_positions)
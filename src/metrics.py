@@ -4,6 +4,8 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from src.instrument import instrumented
+
 
 TRADING_DAYS_PER_YEAR = 252
 
@@ -14,7 +16,7 @@ def annualized_return_from_log_returns(log_returns: pd.Series, periods_per_year:
     Annualized log return = mean(g_t) * periods_per_year.
     Annualized simple return = exp(annualized_log_return) - 1.
     """
-    lr = log_returns.dropna()
+    lr = log_returns.dropna().astype(np.float64)
     if len(lr) == 0:
         return float("nan")
 
@@ -26,7 +28,7 @@ def annualized_volatility_from_log_returns(log_returns: pd.Series, periods_per_y
     """
     Annualized volatility = std(log_returns) * sqrt(periods_per_year)
     """
-    lr = log_returns.dropna()
+    lr = log_returns.dropna().astype(np.float64)
     if len(lr) == 0:
         return float("nan")
 
@@ -46,7 +48,7 @@ def sharpe_ratio_from_log_returns(
       - excess per-period = lr - rf_per_period
       - annualized Sharpe = sqrt(periods_per_year) * mean(excess) / std(excess)
     """
-    lr = log_returns.dropna()
+    lr = log_returns.dropna().astype(np.float64)
     if len(lr) == 0:
         return float("nan")
 
@@ -65,7 +67,7 @@ def max_drawdown(equity_curve: pd.Series) -> float:
     Max drawdown = minimum over t of (equity_t / running_max_t - 1).
     Returns a negative number (e.g., -0.32 means -32% peak-to-trough).
     """
-    eq = equity_curve.dropna()
+    eq = equity_curve.dropna().astype(np.float64)
     if len(eq) == 0:
         return float("nan")
 
@@ -78,12 +80,13 @@ def win_rate(log_returns: pd.Series) -> float:
     """
     Fraction of periods with positive strategy return.
     """
-    lr = log_returns.dropna()
+    lr = log_returns.dropna().astype(np.float64)
     if len(lr) == 0:
         return float("nan")
     return float((lr > 0).mean())
 
 
+@instrumented
 def summarize_strategy(
     name: str,
     strategy_log_returns: pd.Series,
@@ -109,4 +112,125 @@ def summarize_strategy(
             "Max Drawdown": mdd,
             "Win Rate": wr,
         }
-    )
\ No newline at end of file
+    )
+
+# ----------------------------
+# Matrix-native versions (many series at once)
+# ----------------------------
+#
+# Inputs are either a DataFrame (index=date, one column per series), giving a
+# Series per metric, or an ndarray with time on the LAST axis (e.g. strategies x
+# time, or params x windows x time), giving an array of the leading shape.
+# NaNs are skipped per series, like the dropna() in the scalar functions.
+
+def _time_last(x) -> tuple[np.ndarray, object]:
+    if isinstance(x, pd.DataFrame):
+        cols = x.columns
+        return x.to_numpy(dtype=float).T, lambda v: pd.Series(v, index=cols)
+    if isinstance(x, pd.Series):
+        return x.to_numpy(dtype=float), lambda v: float(v)
+    return np.asarray(x, dtype=float), lambda v: v
+
+
+def _nan_mean_std(lr: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    valid = ~np.isnan(lr)
+    n = valid.sum(axis=-1)
+    filled = np.where(valid, lr, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=-1) / n
+        dev = np.where(valid, lr - mean[..., None], 0.0)
+        std = np.sqrt((dev * dev).sum(axis=-1) / n)
+    return mean, std, n
+
+
+def annualized_return_many(log_returns, periods_per_year: int = TRADING_DAYS_PER_YEAR):
+    """
+    annualized_return_from_log_returns for many series at once.
+    """
+    lr, wrap = _time_last(log_returns)
+    mean, _, _ = _nan_mean_std(lr)
+    return wrap(np.exp(mean * periods_per_year) - 1.0)
+
+
+def annualized_volatility_many(log_returns, periods_per_year: int = TRADING_DAYS_PER_YEAR):
+    """
+    annualized_volatility_from_log_returns for many series at once.
+    """
+    lr, wrap = _time_last(log_returns)
+    _, std, _ = _nan_mean_std(lr)
+    return wrap(std * np.sqrt(periods_per_year))
+
+
+def sharpe_ratio_many(
+    log_returns,
+    risk_free_rate_annual: float = 0.0,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+):
+    """
+    sharpe_ratio_from_log_returns for many series at once (NaN where vol is 0).
+    """
+    lr, wrap = _time_last(log_returns)
+    mean, std, _ = _nan_mean_std(lr - risk_free_rate_annual / periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std == 0, np.nan, np.sqrt(periods_per_year) * mean / std)
+    return wrap(sharpe)
+
+
+def max_drawdown_many(equity_curves):
+    """
+    max_drawdown for many equity curves at once (running max skips NaNs).
+    """
+    eq, wrap = _time_last(equity_curves)
+    running_max = np.fmax.accumulate(eq, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = eq / running_max - 1.0
+    all_nan = np.isnan(dd).all(axis=-1)
+    mdd = np.where(all_nan, np.nan, np.nanmin(np.where(all_nan[..., None], 0.0, dd), axis=-1))
+    return wrap(mdd)
+
+
+def win_rate_many(log_returns):
+    """
+    win_rate for many series at once.
+    """
+    lr, wrap = _time_last(log_returns)
+    valid = ~np.isnan(lr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wr = (valid & (lr > 0)).sum(axis=-1) / valid.sum(axis=-1)
+    return wrap(wr)
+
+
+@instrumented
+def summarize_many(
+    strategy_log_returns,
+    equity_curves,
+    risk_free_rate_annual: float = 0.0,
+):
+    """
+    summarize_strategy for many strategies in one pass.
+
+    DataFrame inputs (one column per strategy) -> DataFrame indexed by Strategy.
+    Array inputs (time on the last axis) -> dict of metric name -> array.
+    """
+    lr, _ = _time_last(strategy_log_returns)
+    eq, _ = _time_last(equity_curves)
+
+    mean, std, _ = _nan_mean_std(lr)
+    ex_mean, ex_std, _ = _nan_mean_std(lr - risk_free_rate_annual / TRADING_DAYS_PER_YEAR)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(ex_std == 0, np.nan, np.sqrt(TRADING_DAYS_PER_YEAR) * ex_mean / ex_std)
+
+    out = {
+        "Final Equity": eq[..., -1],
+        "Annual Return": np.exp(mean * TRADING_DAYS_PER_YEAR) - 1.0,
+        "Annual Vol": std * np.sqrt(TRADING_DAYS_PER_YEAR),
+        "Sharpe": sharpe,
+        "Max Drawdown": max_drawdown_many(eq),
+        "Win Rate": win_rate_many(lr),
+    }
+
+    if isinstance(strategy_log_returns, pd.DataFrame):
+        df = pd.DataFrame(out, index=strategy_log_returns.columns)
+        df.index.name = "Strategy"
+        return df
+    return out
@@ -0,0 +1,198 @@
+# src/ohlcv.py
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from src.config import OHLCV_FORMAT
+from src.data_loader import OHLCV_FIELDS, OhlcvFetcher, PriceData, compute_log_returns, download_ohlcv_yfinance
+from src.instrument import instrumented
+from src.price_store import CACHE_BACKENDS, cached_tickers, load_prices, save_prices
+from src.rolling_stats import RANGE_VOL_FIELDS, range_vol
+
+
+# ----------------------------
+# Field x date x ticker bar store
+# ----------------------------
+#
+# A directory holding one (date x ticker) panel per OHLCV field, each written
+# with the price_store backend of the chosen format, plus meta.json:
+#
+#   data/raw/ohlcv_SPY_2015-01-01/
+#     meta.json        {"fields": [...], "format": ".npy", "interval": "1d",
+#                       "start": "2015-01-01", "end": null}
+#     open.npy  high.npy  low.npy  close.npy  adj_close.npy  volume.npy  (+ sidecars)
+#
+# Fields are read on demand and only for the requested tickers: a Parkinson
+# gate touches high/low only, a liquidity filter volume only. With ".npy"
+# the reads are memory maps, so even those pages load lazily.
+
+META_FILE = "meta.json"
+
+
+def _field_stem(field: str) -> str:
+    return field.lower().replace(" ", "_")
+
+
+class OhlcvStore:
+    """
+    Read side of an on-disk OHLCV store (see write() / get_ohlcv_store).
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.fields: List[str] = list(meta["fields"])
+        self.suffix: str = meta["format"]
+        self.interval: Optional[str] = meta.get("interval")
+        self.start: Optional[str] = meta.get("start")
+        self.end: Optional[str] = meta.get("end")
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, META_FILE))
+
+    @classmethod
+    def write(
+        cls,
+        bars: pd.DataFrame,
+        directory: str,
+        fmt: str = OHLCV_FORMAT,
+        interval: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> "OhlcvStore":
+        """
+        Store bars with (field, ticker) MultiIndex columns (as returned by
+        download_ohlcv_yfinance). Every field file is written atomically and
+        meta.json last, so readers never see a half-written store.
+        interval / start / end: the request the bars answer (checked by
+        get_ohlcv_store before reusing the store).
+        """
+        if not isinstance(bars.columns, pd.MultiIndex) or bars.columns.nlevels != 2:
+            raise ValueError("bars must have (field, ticker) MultiIndex columns.")
+        if fmt not in CACHE_BACKENDS:
+            raise ValueError(f"Unsupported store format {fmt!r}. Use one of {sorted(CACHE_BACKENDS)}.")
+
+        fields = list(dict.fromkeys(bars.columns.get_level_values(0)))
+        os.makedirs(directory, exist_ok=True)
+        for field in fields:
+            save_prices(bars[field], os.path.join(directory, f"{_field_stem(field)}{fmt}"))
+
+        tmp_path = os.path.join(directory, f"{META_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"fields": fields, "format": fmt, "interval": interval, "start": start, "end": end}, f)
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+        return cls(directory)
+
+    def matches(self, start: str, end: Optional[str], interval: str) -> bool:
+        """
+        Whether the store was built for this date range and bar interval.
+        """
+        return (self.start, self.end, self.interval) == (start, end, interval)
+
+    def bars(self) -> pd.DataFrame:
+        """
+        Every field as one frame with (field, ticker) MultiIndex columns.
+        """
+        return pd.concat({field: self.load(field) for field in self.fields}, axis=1)
+
+    def path(self, field: str) -> str:
+        if field not in self.fields:
+            raise ValueError(f"field {field!r} is not in the store (have {self.fields}).")
+        return os.path.join(self.directory, f"{_field_stem(field)}{self.suffix}")
+
+    def tickers(self) -> List[str]:
+        return cached_tickers(self.path(self.fields[0]))
+
+    @instrumented(name="ohlcv_load")
+    def load(self, field: str, tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        One field as a (date x ticker) panel; tickers: subset/order to read.
+        """
+        return load_prices(self.path(field), columns=None if tickers is None else list(tickers))
+
+    def load_fields(self, fields: Sequence[str], tickers: Optional[Sequence[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        {field: panel} for just these fields.
+        """
+        return {field: self.load(field, tickers) for field in fields}
+
+    def price_data(self, field: str = "Adj Close", tickers: Optional[Sequence[str]] = None) -> PriceData:
+        """
+        PriceData from one field (what get_price_data returns for price_field=field).
+        """
+        prices = self.load(field, tickers).dropna(how="all")
+        return PriceData(prices=prices, log_returns=compute_log_returns(prices))
+
+    def range_vol(self, window: int, estimator: str = "parkinson", tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Rolling range-based daily vol (src.rolling_stats.range_vol), reading
+        only the fields the estimator needs.
+        """
+        if estimator not in RANGE_VOL_FIELDS:
+            raise ValueError(f"estimator must be one of {sorted(RANGE_VOL_FIELDS)}.")
+        return range_vol(self.load_fields(RANGE_VOL_FIELDS[estimator], tickers), window, estimator)
+
+
+@instrumented
+def get_ohlcv_store(
+    tickers: List[str],
+    start: str,
+    end: Optional[str],
+    interval: str,
+    directory: str,
+    force_download: bool = False,
+    fetcher: Optional[OhlcvFetcher] = None,
+    fmt: str = OHLCV_FORMAT,
+) -> OhlcvStore:
+    """
+    Open the store at `directory`, downloading first when needed:
+      - no store yet: download `tickers`
+      - force_download, or a store built for another start / end / interval:
+        download the union of its tickers and `tickers` for this request
+        (stored tickers are never dropped)
+      - same request, some of `tickers` missing: download only those and merge
+        them into the existing fields
+    fetcher: replaces download_ohlcv_yfinance (e.g. a stub for offline runs).
+    """
+    fetch = fetcher or download_ohlcv_yfinance
+    existing = None
+    if OhlcvStore.exists(directory):
+        store = OhlcvStore(directory)
+        stored = store.tickers()
+        if not force_download and store.matches(start, end, interval):
+            missing = [t for t in tickers if t not in stored]
+            if not missing:
+                return store
+            existing = store.bars()
+            tickers = missing
+        else:
+            tickers = stored + [t for t in tickers if t not in stored]
+
+    bars = fetch(tickers, start, end, interval)
+    if not set(OHLCV_FIELDS) & set(bars.columns.get_level_values(0)):
+        raise ValueError(f"Fetcher returned none of the fields {OHLCV_FIELDS}.")
+    if existing is not None:
+        bars = _merge_bars(existing, bars)
+    return OhlcvStore.write(bars, directory, fmt=fmt, interval=interval, start=start, end=end)
+
+
+def _merge_bars(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Outer-join two (field, ticker) bar frames on dates; fields in
+    OHLCV_FIELDS order, old tickers first.
+    """
+    names = set(old.columns.get_level_values(0)) | set(new.columns.get_level_values(0))
+    fields = [f for f in OHLCV_FIELDS if f in names] + sorted(names - set(OHLCV_FIELDS))
+    merged = {}
+    for field in fields:
+        parts = [bars[field] for bars in (old, new) if field in bars.columns.get_level_values(0)]
+        merged[field] = pd.concat(parts, axis=1, join="outer").sort_index()
+    bars = pd.concat(merged, axis=1)
+    tickers = list(dict.fromkeys(bars.columns.get_level_values(1)))
+    return bars.reindex(columns=pd.MultiIndex.from_product([fields, tickers]))
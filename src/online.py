@@ -0,0 +1,415 @@
+# src/online.py
+from __future__ import annotations
+
+import importlib
+import pickle
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+# ----------------------------
+# Checkpointable state
+# ----------------------------
+
+class _Stateful:
+    """
+    state_dict() / load_state_dict() over plain values: numpy arrays, floats,
+    ints, None, and nested components listed in _components (attribute name
+    -> class). Checkpoints hold no class references, so they survive renames
+    and moves of these classes.
+    """
+
+    _components: Dict[str, type] = {}
+
+    def state_dict(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {}
+        for name, value in self.__dict__.items():
+            if name in self._components:
+                state[name] = None if value is None else value.state_dict()
+            else:
+                state[name] = value.copy() if isinstance(value, np.ndarray) else value
+        return state
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            if name in self._components and value is not None:
+                cls = self._components[name]
+                component = cls.__new__(cls)
+                component.load_state_dict(value)
+                value = component
+            elif isinstance(value, np.ndarray):
+                value = value.copy()
+            setattr(self, name, value)
+
+
+# ----------------------------
+# Rolling statistics (O(1) per bar)
+# ----------------------------
+#
+# Both states use the same Kahan-compensated add/remove updates as pandas'
+# fixed-window rolling mean / var, so replaying a history bar by bar gives the
+# same numbers as prices.rolling(window).mean() / .std(ddof).
+
+class RingBuffer(_Stateful):
+    """
+    Last `size` rows of a (time x assets) stream.
+    """
+
+    def __init__(self, size: int, n_assets: int):
+        if size <= 0:
+            raise ValueError("size must be positive.")
+        self.size = size
+        self.values = np.full((size, n_assets), np.nan)
+        self.count = 0  # rows pushed so far
+
+    def push(self, row: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Append a row; returns the row that fell out (None until the buffer is full).
+        """
+        k = self.count % self.size
+        evicted = self.values[k].copy() if self.count >= self.size else None
+        self.values[k] = row
+        self.count += 1
+        return evicted
+
+    def oldest(self) -> np.ndarray:
+        """
+        Row pushed `size` bars ago (only valid once the buffer is full).
+        """
+        return self.values[self.count % self.size]
+
+
+class RollingMean(_Stateful):
+    """
+    Online equivalent of DataFrame.rolling(window).mean().
+    """
+
+    _components = {"buffer": RingBuffer}
+
+    def __init__(self, window: int, n_assets: int):
+        self.window = window
+        self.buffer = RingBuffer(window, n_assets)
+        self.nobs = np.zeros(n_assets)
+        self.sum_x = np.zeros(n_assets)
+        self.neg_ct = np.zeros(n_assets)
+        self.comp_add = np.zeros(n_assets)
+        self.comp_remove = np.zeros(n_assets)
+        self.n_same = np.zeros(n_assets)
+        self.prev = np.full(n_assets, np.nan)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if self.buffer.count == 0:
+            self.prev = x.copy()
+
+        out = self.buffer.push(x)
+        if out is not None:
+            ok = ~np.isnan(out)
+            y = -out - self.comp_remove
+            t = self.sum_x + y
+            self.comp_remove = np.where(ok, t - self.sum_x - y, self.comp_remove)
+            self.sum_x = np.where(ok, t, self.sum_x)
+            self.nobs -= ok
+            self.neg_ct -= ok & np.signbit(out)
+
+        ok = ~np.isnan(x)
+        y = x - self.comp_add
+        t = self.sum_x + y
+        self.comp_add = np.where(ok, t - self.sum_x - y, self.comp_add)
+        self.sum_x = np.where(ok, t, self.sum_x)
+        self.nobs += ok
+        self.neg_ct += ok & np.signbit(x)
+        self.n_same = np.where(ok, np.where(x == self.prev, self.n_same + 1, 1), self.n_same)
+        self.prev = np.where(ok, x, self.prev)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.sum_x / self.nobs
+        mean = np.where(self.n_same >= self.nobs, self.prev, mean)
+        mean = np.where((self.n_same < self.nobs) & (self.neg_ct == 0) & (mean < 0), 0.0, mean)
+        mean = np.where((self.n_same < self.nobs) & (self.neg_ct == self.nobs) & (mean > 0), 0.0, mean)
+        return np.where(self.nobs >= self.window, mean, np.nan)
+
+
+class RollingStd(_Stateful):
+    """
+    Online equivalent of DataFrame.rolling(window).std(ddof=ddof)
+    (Welford updates with Kahan compensation).
+    """
+
+    _components = {"buffer": RingBuffer}
+
+    def __init__(self, window: int, n_assets: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self.buffer = RingBuffer(window, n_assets)
+        self.nobs = np.zeros(n_assets)
+        self.mean_x = np.zeros(n_assets)
+        self.ssqdm_x = np.zeros(n_assets)
+        self.comp_add = np.zeros(n_assets)
+        self.comp_remove = np.zeros(n_assets)
+        self.n_same = np.zeros(n_assets)
+        self.prev = np.full(n_assets, np.nan)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if self.buffer.count == 0:
+            self.prev = x.copy()
+
+        out = self.buffer.push(x)
+        if out is not None:
+            ok = ~np.isnan(out)
+            nobs = self.nobs - ok
+            prev_mean = self.mean_x - self.comp_remove
+            y = out - self.comp_remove
+            t = y - self.mean_x
+            comp = t + self.mean_x - y
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean_x = self.mean_x - t / nobs
+            ssqdm_x = self.ssqdm_x - (out - prev_mean) * (out - mean_x)
+
+            keep = ok & (nobs > 0)
+            empty = ok & (nobs == 0)
+            self.comp_remove = np.where(keep, comp, self.comp_remove)
+            self.mean_x = np.where(keep, mean_x, np.where(empty, 0.0, self.mean_x))
+            self.ssqdm_x = np.where(keep, ssqdm_x, np.where(empty, 0.0, self.ssqdm_x))
+            self.nobs = nobs
+
+        ok = ~np.isnan(x)
+        nobs = self.nobs + ok
+        self.n_same = np.where(ok, np.where(x == self.prev, self.n_same + 1, 1), self.n_same)
+        self.prev = np.where(ok, x, self.prev)
+        prev_mean = self.mean_x - self.comp_add
+        y = x - self.comp_add
+        t = y - self.mean_x
+        comp = t + self.mean_x - y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_x = self.mean_x + t / nobs
+        ssqdm_x = self.ssqdm_x + (x - prev_mean) * (x - mean_x)
+
+        self.comp_add = np.where(ok, comp, self.comp_add)
+        self.mean_x = np.where(ok, mean_x, self.mean_x)
+        self.ssqdm_x = np.where(ok, ssqdm_x, self.ssqdm_x)
+        self.nobs = nobs
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = self.ssqdm_x / (self.nobs - self.ddof)
+        var = np.where((self.nobs == 1) | (self.n_same >= self.nobs), 0.0, var)
+        var = np.where((self.nobs >= self.window) & (self.nobs > self.ddof), var, np.nan)
+        return np.sqrt(np.maximum(var, 0.0))
+
+
+# ----------------------------
+# Signals, rules and gates
+# ----------------------------
+
+class OnlineMomentum(_Stateful):
+    """
+    momentum_signal, one bar at a time: s_t = P_t / P_{t-lookback} - 1.
+    """
+
+    _components = {"buffer": RingBuffer}
+
+    def __init__(self, lookback: int, n_assets: int):
+        self.lookback = lookback
+        self.buffer = RingBuffer(lookback + 1, n_assets)
+
+    def update(self, prices: np.ndarray) -> np.ndarray:
+        self.buffer.push(np.asarray(prices, dtype=float))
+        if self.buffer.count <= self.lookback:
+            return np.full(self.buffer.values.shape[1], np.nan)
+        return self.buffer.values[(self.buffer.count - 1) % self.buffer.size] / self.buffer.oldest() - 1.0
+
+
+class OnlineZScore(_Stateful):
+    """
+    mean_reversion_zscore_signal, one bar at a time: z_t = (P_t - MA_t) / SD_t.
+    """
+
+    _components = {"mean": RollingMean, "std": RollingStd}
+
+    def __init__(self, lookback: int, n_assets: int):
+        self.mean = RollingMean(lookback, n_assets)
+        self.std = RollingStd(lookback, n_assets, ddof=0)
+
+    def update(self, prices: np.ndarray) -> np.ndarray:
+        prices = np.asarray(prices, dtype=float)
+        ma = self.mean.update(prices)
+        sd = self.std.update(prices)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (prices - ma) / sd
+
+
+class OnlineHysteresis(_Stateful):
+    """
+    zscore_entry_exit_rule state machine, one bar at a time.
+    """
+
+    def __init__(self, n_assets: int, entry_z: float = 1.0, exit_z: float = 0.2):
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.state = np.zeros(n_assets)
+
+    def update(self, z: np.ndarray) -> np.ndarray:
+        z = np.asarray(z, dtype=float)
+        valid = ~np.isnan(z)
+        exit_mask = valid & (np.abs(z) < self.exit_z)
+        short_mask = valid & ~exit_mask & (z > self.entry_z)
+        long_mask = valid & ~exit_mask & ~short_mask & (z < -self.entry_z)
+
+        self.state = np.where(exit_mask, 0.0, self.state)
+        self.state = np.where(short_mask, -1.0, self.state)
+        self.state = np.where(long_mask, 1.0, self.state)
+        return np.where(valid, self.state, 0.0)
+
+
+def sign_threshold_row(signal: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+    """
+    sign_threshold_rule for a single bar.
+    """
+    pos = np.where(signal > threshold, 1.0, 0.0)
+    return np.where(signal < -threshold, -1.0, pos)
+
+
+class OnlineVolGate(_Stateful):
+    """
+    vol_regime_filter, one bar of log returns at a time (1 = trade, 0 = flat).
+    """
+
+    _components = {"std": RollingStd}
+
+    def __init__(self, n_assets: int, vol_lookback: int = 20, vol_threshold: float = 0.02):
+        self.vol_threshold = vol_threshold
+        self.std = RollingStd(vol_lookback, n_assets, ddof=1)
+
+    def update(self, log_returns: np.ndarray) -> np.ndarray:
+        return (self.std.update(log_returns) <= self.vol_threshold).astype(float)
+
+
+# ----------------------------
+# Incremental backtest
+# ----------------------------
+
+class OnlineBacktest(_Stateful):
+    """
+    backtest_positions, one bar at a time, with running equity and drawdown.
+
+    update(returns_t, positions_t) earns positions_{t-1} * returns_t / N and
+    pays the cost on |positions_t - positions_{t-1}|. The first bar earns
+    nothing and pays nothing, like the batch version.
+    """
+
+    def __init__(self, n_assets: int, transaction_cost_bps: float = 0.0):
+        self.n_assets = n_assets
+        self.transaction_cost_bps = transaction_cost_bps
+        self.prev_positions: Optional[np.ndarray] = None
+        self.log_equity = 0.0
+        self.equity = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self.n_bars = 0
+
+    def update(self, log_returns: np.ndarray, positions: np.ndarray) -> float:
+        rets = np.nan_to_num(np.asarray(log_returns, dtype=float), nan=0.0)
+        positions = np.nan_to_num(np.asarray(positions, dtype=float), nan=0.0)
+
+        if self.prev_positions is None:
+            strat_lr = 0.0
+        else:
+            strat_lr = float((self.prev_positions / max(self.n_assets, 1) * rets).sum())
+            if self.transaction_cost_bps > 0:
+                turnover = float(np.abs(positions - self.prev_positions).sum())
+                strat_lr -= (self.transaction_cost_bps / 10_000.0) * turnover
+
+        self.prev_positions = positions
+        self.log_equity += strat_lr
+        self.equity = 1.0 if self.n_bars == 0 else float(np.exp(self.log_equity))
+        self.peak = max(self.peak, self.equity)
+        self.max_drawdown = min(self.max_drawdown, self.equity / self.peak - 1.0)
+        self.n_bars += 1
+        return strat_lr
+
+
+# ----------------------------
+# Composite engine + checkpoints
+# ----------------------------
+
+class OnlineMomentumEngine(_Stateful):
+    """
+    Streaming version of
+
+        log_returns = compute_log_returns(prices)
+        positions = momentum(prices, lookback, threshold)
+                    * vol_regime_filter(log_returns, vol_lookback, vol_threshold)
+        backtest_positions(log_returns, positions, transaction_cost_bps)
+
+    Feed one row of prices per bar with update(); every step is O(n_assets).
+    vol_lookback=None disables the gate.
+    """
+
+    _components = {"momentum": OnlineMomentum, "gate": OnlineVolGate, "backtest": OnlineBacktest}
+
+    def __init__(
+        self,
+        n_assets: int,
+        lookback: int = 60,
+        threshold: float = 0.0,
+        vol_lookback: Optional[int] = 20,
+        vol_threshold: float = 0.02,
+        transaction_cost_bps: float = 0.0,
+    ):
+        self.threshold = threshold
+        self.momentum = OnlineMomentum(lookback, n_assets)
+        self.gate = OnlineVolGate(n_assets, vol_lookback, vol_threshold) if vol_lookback else None
+        self.backtest = OnlineBacktest(n_assets, transaction_cost_bps)
+        self.prev_log_price: Optional[np.ndarray] = None
+
+    def update(self, prices: np.ndarray) -> Dict[str, Any]:
+        prices = np.asarray(prices, dtype=float)
+        positions = sign_threshold_row(self.momentum.update(prices), self.threshold)
+
+        log_price = np.log(prices)
+        if self.prev_log_price is None:
+            # No return on the first bar (compute_log_returns drops it)
+            self.prev_log_price = log_price
+            return {"positions": positions, "strategy_log_return": None, "equity": None, "max_drawdown": None}
+
+        rets = log_price - self.prev_log_price
+        self.prev_log_price = log_price
+        if self.gate is not None:
+            positions = positions * self.gate.update(rets)
+
+        strat_lr = self.backtest.update(rets, positions)
+        return {
+            "positions": positions,
+            "strategy_log_return": strat_lr,
+            "equity": self.backtest.equity,
+            "max_drawdown": self.backtest.max_drawdown,
+        }
+
+
+
+def save_checkpoint(engine: Any, filepath: str) -> None:
+    """
+    Persist an online engine (any object with state_dict()) to disk. The state
+    is nested dicts of numpy arrays and scalars; the engine class is stored by
+    name only.
+    """
+    cls = type(engine)
+    with open(filepath, "wb") as f:
+        pickle.dump({"cls": f"{cls.__module__}:{cls.__qualname__}", "state": engine.state_dict()}, f)
+
+
+def load_checkpoint(filepath: str) -> Any:
+    """
+    Rebuild an engine saved with save_checkpoint.
+    """
+    with open(filepath, "rb") as f:
+        payload = pickle.load(f)
+    module, qualname = payload["cls"].split(":")
+    cls = importlib.import_module(module)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    engine = cls.__new__(cls)
+    engine.load_state_dict(payload["state"])
+    return engine
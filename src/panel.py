@@ -0,0 +1,270 @@
+# src/panel.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import BacktestResult, portfolio_backtest_arrays
+from src.instrument import instrumented
+
+if TYPE_CHECKING:
+    from src.data_loader import PriceData
+
+
+# ----------------------------
+# Calendar-aligned panel
+# ----------------------------
+#
+# Prices and log returns on ONE master trading calendar and ticker order,
+# fixed when the panel is built:
+#   - both are C-contiguous, read-only (time x tickers) arrays; row i is
+#     calendar[i] and column j is tickers[j] in both
+#   - dates and tickers map to integer positions (date_loc / ticker_loc), so
+#     windows are plain row slices: window() returns views, O(1) in the panel
+#     size
+#   - frames (prices_frame / returns_frame / frame) wrap the arrays without
+#     copying, so signals and gates computed from them come back on the same
+#     calendar and backtest() goes straight to the array kernel, with no
+#     reindex of dates or columns.
+#
+# The calendar is the price calendar; returns are NaN on rows where
+# compute_log_returns has none (the first date). Backtests start at `start`,
+# the first row with any return, which is where backtest_positions on the
+# log_returns frame starts.
+
+PositionsLike = Union[np.ndarray, pd.DataFrame]
+
+
+class Panel:
+    def __init__(
+        self,
+        calendar: pd.DatetimeIndex,
+        tickers: Sequence[str],
+        prices: np.ndarray,
+        log_returns: np.ndarray,
+        start: Optional[int] = None,
+    ):
+        calendar = pd.DatetimeIndex(calendar)
+        tickers = pd.Index(tickers)
+        shape = (len(calendar), len(tickers))
+        if prices.shape != shape or log_returns.shape != shape:
+            raise ValueError(f"prices and log_returns must be (calendar x tickers) = {shape}.")
+        if not calendar.is_monotonic_increasing or calendar.has_duplicates:
+            raise ValueError("calendar must be sorted and unique.")
+        if tickers.has_duplicates:
+            raise ValueError("tickers must be unique.")
+
+        self.calendar = calendar
+        self.tickers = tickers
+        self.prices = _frozen(prices)
+        self.log_returns = _frozen(log_returns)
+        if start is None:
+            has_return = ~np.isnan(self.log_returns).all(axis=1)
+            start = int(np.argmax(has_return)) if has_return.any() else len(calendar)
+        self.start = start
+        self._dates = calendar.asi8  # int64 ns, for searchsorted
+        self._ticker_pos: Dict[str, int] = {t: j for j, t in enumerate(tickers)}
+
+    # Construction ------------------------------------------------------
+
+    @classmethod
+    def from_frames(
+        cls,
+        prices: pd.DataFrame,
+        log_returns: pd.DataFrame,
+        dtype=np.float64,
+    ) -> "Panel":
+        """
+        Fix the price calendar and column order; returns are aligned onto
+        them once (missing dates/tickers -> NaN).
+        """
+        prices = prices.sort_index()
+        rets = log_returns.reindex(index=prices.index, columns=prices.columns)
+        return cls(
+            calendar=pd.DatetimeIndex(prices.index),
+            tickers=[str(c) for c in prices.columns],
+            prices=prices.to_numpy(dtype=dtype),
+            log_returns=rets.to_numpy(dtype=dtype),
+        )
+
+    @classmethod
+    def from_price_data(cls, data: "PriceData", dtype=np.float64) -> "Panel":
+        """
+        dtype=np.float32 keeps a compact PriceData compact (see src/compact.py).
+        """
+        return cls.from_frames(data.prices, data.log_returns, dtype=dtype)
+
+    def to_price_data(self) -> "PriceData":
+        """
+        PriceData as get_price_data returns it (returns start at `start`).
+        """
+        from src.data_loader import PriceData
+
+        return PriceData(prices=self.prices_frame(), log_returns=self.returns_frame().iloc[self.start:])
+
+    def _view(self, rows: slice) -> "Panel":
+        """
+        Row-slice view sharing arrays and the ticker map (no validation, O(1)).
+        """
+        view = object.__new__(Panel)
+        lo = rows.indices(len(self.calendar))[0]
+        view.calendar = self.calendar[rows]
+        view.tickers = self.tickers
+        view.prices = self.prices[rows]
+        view.log_returns = self.log_returns[rows]
+        view.start = min(max(self.start - lo, 0), len(view.calendar))
+        view._dates = self._dates[rows]
+        view._ticker_pos = self._ticker_pos
+        return view
+
+    def aligned(self) -> "Panel":
+        """
+        Rows where every price and every return is present (what the research
+        scripts get from dropna() on both frames plus the common-date
+        intersection). Copies once; the result starts on a return row.
+        """
+        keep = ~(np.isnan(self.prices).any(axis=1) | np.isnan(self.log_returns).any(axis=1))
+        return Panel(
+            calendar=self.calendar[keep],
+            tickers=self.tickers,
+            prices=self.prices[keep],
+            log_returns=self.log_returns[keep],
+        )
+
+    def select(self, tickers: Sequence[str]) -> "Panel":
+        """
+        Sub-universe in the given order (copies the selected columns).
+        """
+        cols = self.ticker_locs(tickers)
+        return Panel(
+            calendar=self.calendar,
+            tickers=[self.tickers[j] for j in cols],
+            prices=self.prices[:, cols],
+            log_returns=self.log_returns[:, cols],
+            start=self.start,
+        )
+
+    # Lookups -----------------------------------------------------------
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.prices.shape
+
+    def __len__(self) -> int:
+        return len(self.calendar)
+
+    def date_loc(self, date, side: str = "left") -> int:
+        """
+        Row of `date`; for dates not on the calendar, the next trading day
+        (side="left") or one past the previous trading day (side="right"),
+        like searchsorted. Half-open [date_loc(a), date_loc(b, "right"))
+        covers a..b inclusive.
+        """
+        return int(np.searchsorted(self._dates, pd.Timestamp(date).value, side=side))
+
+    def date_locs(self, dates, side: str = "left") -> np.ndarray:
+        return np.searchsorted(self._dates, pd.DatetimeIndex(dates).asi8, side=side)
+
+    def ticker_loc(self, ticker: str) -> int:
+        try:
+            return self._ticker_pos[ticker]
+        except KeyError:
+            raise ValueError(f"ticker {ticker!r} is not in the panel.") from None
+
+    def ticker_locs(self, tickers: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.ticker_loc(t) for t in tickers), dtype=np.int64, count=len(tickers))
+
+    # Windows -----------------------------------------------------------
+
+    def window(self, lo: int, hi: int) -> "Panel":
+        """
+        Rows [lo, hi) as a view (no copy).
+        """
+        return self._view(slice(lo, hi))
+
+    def date_slice(self, first, last) -> slice:
+        """
+        Row slice of trading days first..last inclusive (also slices arrays
+        built on this calendar, e.g. positions).
+        """
+        return slice(self.date_loc(first), self.date_loc(last, side="right"))
+
+    def window_dates(self, first, last) -> "Panel":
+        """
+        Trading days first..last inclusive, as a view.
+        """
+        return self._view(self.date_slice(first, last))
+
+    # Frames ------------------------------------------------------------
+
+    def frame(self, values: np.ndarray) -> pd.DataFrame:
+        """
+        Wrap a (time x tickers) array on the panel's calendar, without copying.
+        """
+        return pd.DataFrame(values, index=self.calendar, columns=self.tickers, copy=False)
+
+    def prices_frame(self) -> pd.DataFrame:
+        return self.frame(self.prices)
+
+    def returns_frame(self) -> pd.DataFrame:
+        return self.frame(self.log_returns)
+
+    def conform(self, frame: pd.DataFrame, fill_value: float = 0.0) -> np.ndarray:
+        """
+        Array of a label-indexed frame on the panel's calendar/tickers. Frames
+        built from this panel pass through as is; anything else is aligned once
+        (missing -> fill_value, NaN -> fill_value, like backtest_positions).
+        """
+        if frame.index.equals(self.calendar) and frame.columns.equals(self.tickers):
+            values = frame.to_numpy()
+        else:
+            values = frame.reindex(index=self.calendar, columns=self.tickers).to_numpy()
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            values = np.where(np.isnan(values), fill_value, values)
+        return values
+
+    # Backtest ----------------------------------------------------------
+
+    @instrumented(name="panel_backtest")
+    def backtest(self, positions: PositionsLike, transaction_cost_bps: float = 0.0) -> BacktestResult:
+        """
+        backtest_positions(returns_frame()[start:], positions) on the arrays:
+        positions_{t-1} earn returns_t, equal weight over all tickers, costs
+        per unit turnover, equity starts at 1.0 on the first return row.
+
+        positions: (time x tickers) array on the panel's calendar, or a frame
+        (see conform).
+        """
+        pos = self.conform(positions) if isinstance(positions, pd.DataFrame) else np.asarray(positions)
+        if pos.shape != self.shape:
+            raise ValueError(f"positions must be (calendar x tickers) = {self.shape}.")
+
+        rows = slice(self.start, None)
+        pos, rets = pos[rows], self.log_returns[rows]
+        strat_lr, turnover, _ = portfolio_backtest_arrays(rets, pos, attribution=False)
+
+        # Equal-weight across tickers; turnover is on raw positions
+        strat_lr /= max(len(self.tickers), 1)
+        if transaction_cost_bps > 0:
+            strat_lr -= (transaction_cost_bps / 10_000.0) * turnover
+        equity = np.exp(np.cumsum(strat_lr))
+        if len(equity):
+            equity[0] = 1.0  # normalize start
+
+        idx = self.calendar[rows]
+        return BacktestResult(
+            positions=pd.DataFrame(pos, index=idx, columns=self.tickers, copy=False),
+            strategy_log_returns=pd.Series(strat_lr, index=idx),
+            equity_curve=pd.Series(equity, index=idx),
+        )
+
+
+def _frozen(values: np.ndarray) -> np.ndarray:
+    """
+    C-contiguous, read-only array (views of it are read-only too).
+    """
+    values = np.ascontiguousarray(values).view()  # own flags, never the caller's
+    values.setflags(write=False)
+    return values
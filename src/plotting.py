@@ -1,42 +1,291 @@
 # src/plotting.py
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
+# Two ways to draw a figure:
+#   - interactive (path=None): a pyplot window, as before
+#   - headless (path="....png"): a bare Figure on an Agg canvas written to the
+#     file. pyplot is never imported, so no GUI backend, no global figure
+#     state, and it is safe in worker processes (render_figures).
+#
+# matplotlib is imported lazily; importing this module only costs numpy/pandas.
+#
+# Long series are decimated before drawing (max_points per line): a 20-year
+# daily curve has ~5000 points but a 12-inch figure has ~1200 pixel columns.
+# Both methods keep the visual shape: "lttb" (largest-triangle-three-buckets)
+# for smooth curves, "minmax" (min and max of each bucket) when every spike
+# and drawdown trough has to survive.
+
+DEFAULT_MAX_POINTS = 2000
+PRESELECT_RATIO = 4  # minmax preselection before LTTB on long series
+HEADLESS_MARGINS = dict(left=0.07, right=0.98, bottom=0.1, top=0.93)
+
+
+# ----------------------------
+# Downsampling
+# ----------------------------
 
-def plot_equity_curves(equity_dict: dict[str, pd.Series], title: str = "Equity Curves"):
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
     """
-    equity_dict: { name -> equity Series }
+    Positions of the n_out points picked by Largest-Triangle-Three-Buckets.
+    First and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previous pick and the mean of
+    the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)  # strictly increasing since n_buckets <= n - 2
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[: n - 1], edges[:-1]) / counts
+    # "next bucket" target: the following bucket's mean, the last point for the last bucket
+    next_x = np.append(mean_x[1:], x[-1]).tolist()
+    next_y = np.append(mean_y[1:], y[-1]).tolist()
+
+    # Each pick depends on the previous one, so this loop is inherently
+    # sequential; plain floats beat per-bucket numpy calls for small buckets
+    # (downsample() keeps buckets small with a minmax preselection).
+    xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_buckets):
+        # twice the triangle area: |p * y_b + q * x_b + r|
+        p = xs[a] - next_x[i]
+        q = next_y[i] - ys[a]
+        r = next_x[i] * ys[a] - xs[a] * next_y[i]
+        best, a = -1.0, bounds[i]
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(p * ys[j] + q * xs[j] + r)
+            if area > best:
+                best, a = area, j
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Positions of the min and max of each of (n_out - 2) // 2 equal buckets
+    plus the endpoints (at most n_out points), in time order. Keeps every
+    local extreme at bucket scale.
+    """
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)  # ceil
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(blocks).all(axis=1)
+    base = np.arange(n_buckets)[valid] * size
+    lo = base + np.nanargmin(blocks[valid], axis=1)
+    hi = base + np.nanargmax(blocks[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+
+def downsample(series: pd.Series, max_points: Optional[int] = DEFAULT_MAX_POINTS, method: str = "lttb") -> pd.Series:
+    """
+    At most ~max_points of the series (NaNs dropped), chosen to preserve its
+    shape. max_points=None returns it unchanged.
+    """
+    if max_points is None:
+        return series
+    s = series.dropna()
+    if len(s) <= max_points:
+        return s
+    y = s.to_numpy(dtype=np.float64)
+
+    if method == "lttb":
+        index = s.index
+        x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(s), dtype=np.float64)
+        # MinMaxLTTB: on long series, run LTTB only on the per-bucket extremes
+        # (4x oversampled), which keeps the same shape at a fraction of the cost
+        pre = minmax_indices(y, PRESELECT_RATIO * max_points) if len(s) > PRESELECT_RATIO * max_points else np.arange(len(s))
+        pos = pre[lttb_indices(x[pre], y[pre], max_points)]
+    elif method == "minmax":
+        pos = minmax_indices(y, max_points)
+    else:
+        raise ValueError("method must be 'lttb' or 'minmax'.")
+    return s.iloc[pos]
+
+
+# ----------------------------
+# Figures
+# ----------------------------
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """
+    One line chart, small enough to send to a worker process.
+    """
+    lines: Dict[str, pd.Series]         # label -> series (index = x axis)
+    title: str = ""
+    ylabel: str = ""
+    xlabel: str = "Date"
+    path: Optional[str] = None          # output file (format from the extension); None = show
+    hline: Optional[float] = None       # e.g. 0.0 for Sharpe / drawdown charts
+    figsize: Tuple[float, float] = (12, 6)
+
+
+def drawdown_curve(equity: pd.Series) -> pd.Series:
+    """
+    Drawdown_t = equity_t / running_max_t - 1
+    """
+    return equity / equity.cummax() - 1.0
+
+
+def equity_spec(equity_dict: Dict[str, pd.Series], title: str = "Equity Curves", path: Optional[str] = None) -> FigureSpec:
+    return FigureSpec(lines=dict(equity_dict), title=title, ylabel="Equity (starting at 1.0)", path=path)
+
+
+def drawdown_spec(equity_dict: Dict[str, pd.Series], title: str = "Drawdowns", path: Optional[str] = None) -> FigureSpec:
+    # Drawdowns come from the full-resolution equity, before any downsampling
+    lines = {name: drawdown_curve(eq) for name, eq in equity_dict.items()}
+    return FigureSpec(lines=lines, title=title, ylabel="Drawdown", path=path)
+
+
+def _draw(ax, spec: FigureSpec, max_points: Optional[int], method: str) -> None:
+    for name, s in spec.lines.items():
+        s = downsample(s, max_points, method)
+        ax.plot(s.index, s.to_numpy(), label=name)
+    if spec.hline is not None:
+        ax.axhline(spec.hline, linewidth=1)
+    ax.set_title(spec.title)
+    ax.set_ylabel(spec.ylabel)
+    ax.set_xlabel(spec.xlabel)
+    if len(spec.lines) > 1:
+        ax.legend()
+    ax.grid(True)
+
+
+def render_figure(
+    spec: FigureSpec,
+    max_points: Optional[int] = DEFAULT_MAX_POINTS,
+    method: str = "lttb",
+    dpi: int = 100,
+) -> str:
     """
-    plt.figure(figsize=(12, 6))
-    for name, eq in equity_dict.items():
-        plt.plot(eq.index, eq.values, label=name)
+    Write spec to spec.path with the Agg backend (no pyplot, no display).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if not spec.path:
+        raise ValueError("render_figure needs spec.path.")
+    dirname = os.path.dirname(spec.path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
 
-    plt.title(title)
-    plt.ylabel("Equity (starting at 1.0)")
-    plt.xlabel("Date")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    _draw(fig.add_subplot(), spec, max_points, method)
+    # Fixed margins: tight_layout would draw the whole figure an extra time
+    fig.subplots_adjust(**HEADLESS_MARGINS)
+    fig.savefig(spec.path, dpi=dpi)
+    return spec.path
+
+
+def show_figure(spec: FigureSpec, max_points: Optional[int] = None, method: str = "lttb") -> None:
+    """
+    Interactive pyplot window (blocks until closed).
+    """
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=spec.figsize)
+    _draw(fig.add_subplot(), spec, max_points, method)
+    fig.tight_layout()
     plt.show()
 
 
-def plot_drawdowns(equity_dict: dict[str, pd.Series], title: str = "Drawdowns"):
+def _render_one(job: tuple) -> str:
+    return render_figure(*job)
+
+
+def render_figures(
+    specs: Sequence[FigureSpec],
+    max_points: Optional[int] = DEFAULT_MAX_POINTS,
+    method: str = "lttb",
+    dpi: int = 100,
+    max_workers: Optional[int] = None,
+    chunksize: int = 4,
+) -> List[str]:
+    """
+    Render many figures to their paths in a process pool (matplotlib drawing
+    is single-threaded and holds the GIL). max_workers=1 renders in-process.
+    Returns the written paths in spec order.
+    """
+    jobs = [(spec, max_points, method, dpi) for spec in specs]
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_render_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render_one, jobs, chunksize=chunksize))
+
+
+def _plot(spec: FigureSpec, max_points: Optional[int], method: str) -> Optional[str]:
+    if spec.path:
+        return render_figure(spec, DEFAULT_MAX_POINTS if max_points is None else max_points, method)
+    show_figure(spec, max_points, method)
+    return None
+
+
+def plot_equity_curves(
+    equity_dict: dict[str, pd.Series],
+    title: str = "Equity Curves",
+    path: Optional[str] = None,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+):
+    """
+    equity_dict: { name -> equity Series }
+    path: write the figure there (headless, downsampled to DEFAULT_MAX_POINTS
+      unless max_points says otherwise) instead of showing a window.
+    """
+    return _plot(equity_spec(equity_dict, title, path), max_points, method)
+
+
+def plot_drawdowns(
+    equity_dict: dict[str, pd.Series],
+    title: str = "Drawdowns",
+    path: Optional[str] = None,
+    max_points: Optional[int] = None,
+    method: str = "minmax",
+):
     """
     Plot drawdowns for each equity curve.
     Drawdown_t = equity_t / running_max_t - 1
+    path / max_points: as in plot_equity_curves (minmax keeps the troughs).
+    """
+    return _plot(drawdown_spec(equity_dict, title, path), max_points, method)
+
+
+def plot_lines(
+    lines: Dict[str, pd.Series],
+    title: str = "",
+    ylabel: str = "",
+    xlabel: str = "Date",
+    path: Optional[str] = None,
+    hline: Optional[float] = None,
+    figsize: Tuple[float, float] = (12, 5),
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+):
+    """
+    Generic line chart (rolling metrics etc.); path / max_points as in
+    plot_equity_curves.
     """
-    plt.figure(figsize=(12, 6))
-    for name, eq in equity_dict.items():
-        running_max = eq.cummax()
-        drawdown = eq / running_max - 1.0
-        plt.plot(drawdown.index, drawdown.values, label=name)
-
-    plt.title(title)
-    plt.ylabel("Drawdown")
-    plt.xlabel("Date")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    spec = FigureSpec(lines=dict(lines), title=title, ylabel=ylabel, xlabel=xlabel, path=path, hline=hline, figsize=figsize)
+    return _plot(spec, max_points, method)
@@ -0,0 +1,256 @@
+# src/price_store.py
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.instrument import instrumented
+
+
+# ----------------------------
+# Cache backends (one per file format)
+# ----------------------------
+#
+# Every backend can load a subset of tickers (columns=[...]; columns=[] gives
+# just the date index) and list the cached tickers without reading values,
+# which is what the chunked loader (src.data_loader.iter_price_chunks) uses.
+
+class CsvBackend:
+    """
+    Plain CSV (the original cache format). Human-readable, slowest to load.
+    """
+    suffix = ".csv"
+
+    def save(self, prices: pd.DataFrame, filepath: str) -> None:
+        prices.to_csv(filepath)
+
+    def load(self, filepath: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        if columns is None:
+            return pd.read_csv(filepath, index_col=0, parse_dates=True).sort_index()
+        date_col = pd.read_csv(filepath, nrows=0).columns[0]
+        df = pd.read_csv(filepath, index_col=0, parse_dates=True, usecols=[date_col, *columns])
+        return df[list(columns)].sort_index()
+
+    def tickers(self, filepath: str) -> List[str]:
+        return [str(c) for c in pd.read_csv(filepath, index_col=0, nrows=0).columns]
+
+
+class ParquetBackend:
+    """
+    Columnar Parquet via pyarrow, read through a memory map.
+    """
+    suffix = ".parquet"
+
+    def save(self, prices: pd.DataFrame, filepath: str) -> None:
+        pq = _import_pyarrow("parquet")
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(_with_str_columns(prices), preserve_index=True)
+        pq.write_table(table, filepath)
+
+    def load(self, filepath: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        pq = _import_pyarrow("parquet")
+        table = pq.read_table(
+            filepath,
+            columns=None if columns is None else list(columns),
+            memory_map=True,
+            use_pandas_metadata=True,
+        )
+        return table.to_pandas().sort_index()
+
+    def tickers(self, filepath: str) -> List[str]:
+        pq = _import_pyarrow("parquet")
+        schema = pq.read_schema(filepath)
+        index_cols = {c for c in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(c, str)}
+        return [n for n in schema.names if n not in index_cols]
+
+
+class FeatherBackend:
+    """
+    Arrow IPC (Feather v2), uncompressed so pages are mapped straight from disk.
+    Feather has no index, so dates are stored as the first column.
+    """
+    suffix = ".feather"
+
+    def save(self, prices: pd.DataFrame, filepath: str) -> None:
+        feather = _import_pyarrow("feather")
+        df = _with_str_columns(prices)
+        df = df.rename_axis(df.index.name or "Date").reset_index()
+        feather.write_feather(df, filepath, compression="uncompressed")
+
+    def load(self, filepath: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        feather = _import_pyarrow("feather")
+        if columns is not None:
+            columns = [self._names(filepath)[0], *columns]
+        table = feather.read_table(filepath, columns=columns, memory_map=True)
+        df = table.to_pandas()
+        return df.set_index(df.columns[0]).sort_index()
+
+    def tickers(self, filepath: str) -> List[str]:
+        return self._names(filepath)[1:]
+
+    @staticmethod
+    def _names(filepath: str) -> List[str]:
+        pa = _import_pyarrow()
+        with pa.memory_map(filepath) as source:
+            return list(pa.ipc.open_file(source).schema.names)
+
+
+class NpyBackend:
+    """
+    Raw float64 date x ticker matrix in a .npy file, opened with mmap_mode="r"
+    so values are paged in lazily (zero-copy). Dates and tickers live in
+    sidecar files next to it: <name>.dates.npy and <name>.tickers.json.
+
+    The matrix is stored ticker-major (Fortran order): each ticker's history
+    is one contiguous run, so loading a subset of tickers only touches their
+    pages, and the full panel maps straight onto pandas' column blocks.
+    Caches written row-major by older versions still load, but a column
+    subset of those reads pages from every row.
+    """
+    suffix = ".npy"
+
+    @staticmethod
+    def _sidecars(filepath: str) -> tuple[str, str]:
+        stem = filepath[: -len(NpyBackend.suffix)]
+        return f"{stem}.dates.npy", f"{stem}.tickers.json"
+
+    def save(self, prices: pd.DataFrame, filepath: str) -> None:
+        dates_path, tickers_path = self._sidecars(filepath)
+        np.save(filepath, np.asfortranarray(prices.to_numpy(dtype=np.float64)))
+        np.save(dates_path, pd.DatetimeIndex(prices.index).to_numpy(dtype="datetime64[ns]"))
+        with open(tickers_path, "w") as f:
+            json.dump({"index_name": prices.index.name, "tickers": [str(c) for c in prices.columns]}, f)
+
+    def load(self, filepath: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        dates_path, tickers_path = self._sidecars(filepath)
+        values = np.load(filepath, mmap_mode="r")
+        dates = np.load(dates_path)
+        with open(tickers_path) as f:
+            meta = json.load(f)
+
+        tickers = meta["tickers"]
+        if columns is not None:
+            pos = pd.Index(tickers).get_indexer(list(columns))
+            if (pos < 0).any():
+                missing = [c for c, k in zip(columns, pos) if k < 0]
+                raise KeyError(f"Tickers not in cache: {missing}")
+            if len(pos) and (np.diff(pos) == 1).all():
+                values = values[:, pos[0]:pos[-1] + 1]  # contiguous run: still a memory map
+            else:
+                values = values[:, pos]  # copy; ticker-major files only page in these columns
+            tickers = list(columns)
+
+        index = pd.DatetimeIndex(dates, name=meta["index_name"])
+        df = pd.DataFrame(values, index=index, columns=tickers, copy=False)
+        if not index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df
+
+    def tickers(self, filepath: str) -> List[str]:
+        with open(self._sidecars(filepath)[1]) as f:
+            return list(json.load(f)["tickers"])
+
+
+CACHE_BACKENDS: Dict[str, object] = {
+    b.suffix: b for b in (CsvBackend(), ParquetBackend(), FeatherBackend(), NpyBackend())
+}
+
+
+def _import_pyarrow(submodule: str = ""):
+    try:
+        if submodule == "parquet":
+            import pyarrow.parquet as mod
+        elif submodule == "feather":
+            import pyarrow.feather as mod
+        else:
+            import pyarrow as mod
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Feather price caches need pyarrow (pip install pyarrow). "
+            "Use a .csv or .npy cache_path otherwise."
+        ) from e
+    return mod
+
+
+def _with_str_columns(prices: pd.DataFrame) -> pd.DataFrame:
+    # Arrow requires string column names
+    out = prices.copy(deep=False)
+    out.columns = [str(c) for c in prices.columns]
+    return out
+
+
+def get_cache_backend(filepath: str):
+    """
+    Pick the cache backend from the file extension of filepath.
+    """
+    suffix = os.path.splitext(filepath)[1].lower()
+    if suffix not in CACHE_BACKENDS:
+        raise ValueError(
+            f"Unsupported cache format {suffix!r}. Use one of {sorted(CACHE_BACKENDS)}."
+        )
+    return CACHE_BACKENDS[suffix]
+
+
+# ----------------------------
+# Save / load / migrate
+# ----------------------------
+
+@instrumented
+def save_prices(prices: pd.DataFrame, filepath: str) -> None:
+    """
+    Write prices with the backend matching filepath's extension.
+    Writes to a temp file first and renames, so readers never see a partial cache.
+    """
+    backend = get_cache_backend(filepath)
+    dirname = os.path.dirname(filepath)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    tmp_path = f"{filepath[: -len(backend.suffix)]}.tmp{backend.suffix}"
+    backend.save(prices, tmp_path)
+    if isinstance(backend, NpyBackend):
+        for tmp_side, side in zip(NpyBackend._sidecars(tmp_path), NpyBackend._sidecars(filepath)):
+            os.replace(tmp_side, side)
+    os.replace(tmp_path, filepath)
+
+
+@instrumented
+def load_prices(filepath: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read prices with the backend matching filepath's extension.
+    columns: only these tickers (in this order); [] reads just the dates.
+    """
+    return get_cache_backend(filepath).load(filepath, columns=columns)
+
+
+def cached_tickers(filepath: str) -> List[str]:
+    """
+    Tickers stored in a price cache, without loading any prices.
+    """
+    return get_cache_backend(filepath).tickers(filepath)
+
+
+def migrate_csv_cache(csv_path: str, target_path: str, overwrite: bool = False) -> str:
+    """
+    One-time conversion of an existing CSV price cache to another backend.
+    Does nothing if target_path already exists (unless overwrite=True).
+    """
+    if overwrite or not os.path.exists(target_path):
+        prices = CACHE_BACKENDS[".csv"].load(csv_path)
+        save_prices(prices, target_path)
+    return target_path
+
+
+def find_csv_sibling(filepath: str) -> Optional[str]:
+    """
+    The legacy .csv cache with the same stem as filepath, if there is one.
+    """
+    stem, suffix = os.path.splitext(filepath)
+    csv_path = f"{stem}.csv"
+    if suffix.lower() != ".csv" and os.path.exists(csv_path):
+        return csv_path
+    return None
@@ -0,0 +1,136 @@
+# src/rolling.py
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.backtester import backtest_positions
+from src.metrics import TRADING_DAYS_PER_YEAR
+
+
+def window_starts(n: int, window_len: int, step: int) -> np.ndarray:
+    """
+    Start offsets of every full window of length window_len, stepping by step.
+    """
+    if window_len <= 0 or step <= 0:
+        raise ValueError("window_len and step must be positive.")
+    return np.arange(0, max(n - window_len + 1, 0), step)
+
+
+def _window_paths(
+    strat_lr: np.ndarray,
+    starts: np.ndarray,
+    window_len: int,
+    head: Optional[np.ndarray],
+) -> np.ndarray:
+    """
+    (windows x window_len) strategy log returns, with the first columns
+    replaced by `head` (windows x warmup+1) when signals restart per window.
+    """
+    paths = sliding_window_view(strat_lr, window_len)[starts].copy()
+    if head is not None:
+        paths[:, :head.shape[1]] = head
+    return paths
+
+
+def rolling_window_metrics(
+    asset_log_returns: pd.DataFrame,
+    positions: pd.DataFrame,
+    window_len: int,
+    step: int,
+    transaction_cost_bps: float = 0.0,
+    warmup: Optional[int] = None,
+    starts: Optional[Sequence[int]] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    chunk_windows: int = 256,
+) -> pd.DataFrame:
+    """
+    Per-window Sharpe / return / vol / max drawdown / final equity from ONE
+    full-history backtest.
+
+    Sums and sums of squares come from prefix sums of the full-history
+    strategy log returns, so each window's mean and vol is O(1).
+    Max drawdown uses a running max over each window's log-equity path
+    (computed in chunks of `chunk_windows` windows to bound memory).
+
+    warmup:
+      None -> windows see the full-history positions (signals carried in).
+      int  -> signals restart inside every window, as if the strategy were
+              recomputed on the window alone: positions are flat for the first
+              `warmup` rows. This reproduces slicing prices per window and
+              calling backtest_positions on each slice. Use warmup=lookback for
+              momentum, vol_lookback - 1 for vol_regime_filter, and the max of
+              the two for gated momentum.
+
+    starts: explicit window start offsets (default: window_starts(n, window_len, step)).
+    """
+    res = backtest_positions(asset_log_returns, positions, transaction_cost_bps=transaction_cost_bps)
+    strat_lr = res.strategy_log_returns.to_numpy(dtype=float)
+    n = len(strat_lr)
+
+    if starts is None:
+        starts = window_starts(n, window_len, step)
+    starts = np.asarray(starts, dtype=int)
+    if starts.size == 0:
+        raise ValueError("Not enough data for the chosen window length.")
+    if starts.min() < 0 or starts.max() + window_len > n:
+        raise ValueError("Window starts out of range.")
+
+    # Restarted windows: rows k < warmup are flat, row k == warmup pays the cost
+    # of entering the full-history position from flat, later rows are unchanged.
+    # A warm-up as long as the window leaves it flat throughout (no entry).
+    head = None
+    if warmup is not None and warmup >= window_len:
+        head = np.zeros((starts.size, window_len))
+    elif warmup is not None:
+        w = int(max(warmup, 0))
+        head = np.zeros((starts.size, w + 1))
+        if w > 0 and transaction_cost_bps > 0:
+            entry_turnover = res.positions.abs().sum(axis=1).to_numpy(dtype=float)
+            head[:, w] = -(transaction_cost_bps / 10_000.0) * entry_turnover[starts + w]
+
+    # Prefix sums give O(1) window totals; the restart head is a fixed-width correction
+    s1 = np.concatenate([[0.0], np.cumsum(strat_lr)])
+    s2 = np.concatenate([[0.0], np.cumsum(strat_lr**2)])
+    total = s1[starts + window_len] - s1[starts]
+    total_sq = s2[starts + window_len] - s2[starts]
+    if head is not None:
+        k = head.shape[1]
+        full_head = sliding_window_view(strat_lr, k)[starts]
+        total = total + head.sum(axis=1) - full_head.sum(axis=1)
+        total_sq = total_sq + (head**2).sum(axis=1) - (full_head**2).sum(axis=1)
+
+    mean = total / window_len
+    var = np.maximum(total_sq / window_len - mean**2, 0.0)
+    vol = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol == 0, np.nan, np.sqrt(periods_per_year) * mean / vol)
+
+    # Max drawdown on log equity (equity starts at 1.0 on the first row, as in the backtester)
+    mdd = np.empty(starts.size)
+    for lo in range(0, starts.size, chunk_windows):
+        sl = slice(lo, lo + chunk_windows)
+        paths = _window_paths(strat_lr, starts[sl], window_len, None if head is None else head[sl])
+        log_eq = np.cumsum(paths, axis=1)
+        log_eq[:, 0] = 0.0
+        running_max = np.maximum.accumulate(log_eq, axis=1)
+        mdd[sl] = np.expm1((log_eq - running_max).min(axis=1))
+
+    final_eq = np.exp(total) if window_len > 1 else np.ones(starts.size)
+
+    idx = asset_log_returns.index
+    df = pd.DataFrame(
+        {
+            "Window Start": idx[starts],
+            "Window End": idx[starts + window_len - 1],
+            "Sharpe": sharpe,
+            "Annual Return": np.exp(mean * periods_per_year) - 1.0,
+            "Annual Vol": vol * np.sqrt(periods_per_year),
+            "Max Drawdown": mdd,
+            "Final Equity": final_eq,
+        }
+    )
+    return df.set_index("Window End")
@@ -0,0 +1,276 @@
+# src/rolling_stats.py
+from __future__ import annotations
+
+import warnings
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Multi-window rolling mean / std from prefix sums
+# ----------------------------
+#
+# One pass over the panel builds prefix sums of x, x^2 and the NaN count;
+# every window length is then a few array differences. Safeguards:
+#   - values are centered on a per-block reference (the mean of their block of
+#     `block` rows, block >= longest window) before summing, so sums of squares
+#     stay at the scale of local deviations instead of price levels; a window
+#     spans at most two blocks and its first-block part is re-referenced exactly
+#   - tiny negative variances from rounding are clamped to 0
+#   - windows whose values are all identical get exactly that value as mean and
+#     0 std (as pandas does)
+# Like pandas rolling(window) with the default min_periods, any NaN inside a
+# window makes that window NaN.
+
+ArrayLike = Union[pd.DataFrame, np.ndarray]
+
+
+def _prefix(a: np.ndarray) -> np.ndarray:
+    out = np.empty((a.shape[0] + 1,) + a.shape[1:])
+    out[0] = 0.0
+    np.cumsum(a, axis=0, out=out[1:])
+    return out
+
+
+def _constant_run_length(x: np.ndarray) -> np.ndarray:
+    """
+    Length of the run of identical values ending at each row (NaN breaks runs).
+    """
+    n = x.shape[0]
+    rows = np.arange(n)[:, None]
+    same = np.zeros(x.shape, dtype=bool)
+    same[1:] = x[1:] == x[:-1]
+    run_start = np.where(same, 0, rows)
+    np.maximum.accumulate(run_start, axis=0, out=run_start)
+    return rows - run_start + 1
+
+
+def _block_references(x: np.ndarray, block: int) -> np.ndarray:
+    """
+    (n_blocks x assets) mean of each block of rows; all-NaN blocks reuse the
+    previous block's reference (or 0 before the first valid value).
+    """
+    n, n_assets = x.shape
+    n_blocks = -(-n // block)
+    padded = np.full((n_blocks * block, n_assets), np.nan)
+    padded[:n] = x
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        ref = np.nanmean(padded.reshape(n_blocks, block, n_assets), axis=1)
+    ref = pd.DataFrame(ref).ffill().fillna(0.0).to_numpy()
+    return ref
+
+
+def rolling_mean_std_arrays(
+    x: np.ndarray,
+    windows: Sequence[int],
+    ddof: int = 1,
+    chunk_cols: int = 256,
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    {window: (rolling mean, rolling std)} for a (time x assets) array,
+    computing all window lengths from one set of prefix sums.
+
+    Columns are processed chunk_cols at a time, so the prefix-sum temporaries
+    scale with the chunk rather than the universe (inputs of any float dtype,
+    e.g. float32, are upcast one chunk at a time).
+    """
+    x = np.asarray(x)
+    if x.ndim == 1:
+        x = x[:, None]
+    windows = list(dict.fromkeys(int(w) for w in windows))
+    if any(w <= 0 for w in windows):
+        raise ValueError("window lengths must be positive.")
+
+    out = {w: (np.empty(x.shape), np.empty(x.shape)) for w in windows}
+    chunk_cols = max(int(chunk_cols), 1)
+    for lo in range(0, x.shape[1], chunk_cols):
+        hi = min(lo + chunk_cols, x.shape[1])
+        chunk = np.asarray(x[:, lo:hi], dtype=np.float64)
+        _rolling_mean_std_chunk(chunk, windows, ddof, {w: (m[:, lo:hi], s[:, lo:hi]) for w, (m, s) in out.items()})
+    return out
+
+
+def _rolling_mean_std_chunk(
+    x: np.ndarray,
+    windows: Sequence[int],
+    ddof: int,
+    out: Dict[int, Tuple[np.ndarray, np.ndarray]],
+) -> None:
+    """
+    Fill the (time x chunk) output views in `out` for one column chunk.
+    """
+    n = x.shape[0]
+
+    block = max(max(windows, default=1), 64)
+    ref = _block_references(x, block) if n else np.zeros((0, x.shape[1]))
+    row_block = np.arange(n) // block
+    ref_rows = ref[row_block]
+    # Shift that moves a previous-block deviation onto this block's reference
+    ref_shift = ref[np.maximum(row_block - 1, 0)] - ref_rows
+
+    nan = np.isnan(x)
+    has_nan = bool(nan.any())
+    dev = x - ref_rows
+    if has_nan:
+        dev[nan] = 0.0
+    s1 = _prefix(dev)
+    s2 = _prefix(dev * dev)
+    s_nan = _prefix(nan.astype(np.float64)) if has_nan else None
+    run_len = _constant_run_length(x)
+    longest_run = int(run_len.max()) if n else 0
+
+    for w in windows:
+        mean, std = out[w]
+        mean[:w - 1] = np.nan
+        std[:w - 1] = np.nan
+        if w <= n:
+            # Window ending at row t covers rows [t - w + 1, t]; work in place
+            # on the output slices to avoid full-size temporaries
+            m = mean[w - 1:]
+            v = std[w - 1:]
+            np.subtract(s1[w:], s1[:n - w + 1], out=m)
+            np.subtract(s2[w:], s2[:n - w + 1], out=v)
+
+            # Windows that start in the previous block: re-reference that part
+            last = np.arange(w - 1, n)
+            start = last - w + 1
+            block_start = row_block[last] * block
+            spans = np.nonzero(block_start > start)[0]
+            if spans.size:
+                k = (block_start[spans] - start[spans]).astype(np.float64)[:, None]
+                d = ref_shift[last[spans]]
+                prev_sum = s1[block_start[spans]] - s1[start[spans]]
+                v[spans] += 2.0 * d * prev_sum + k * d * d
+                m[spans] += k * d
+
+            # var = (sum2 - sum1^2 / w) / (w - ddof), with m = sum1 / w
+            m /= w
+            if w > ddof:
+                sq = m * m
+                sq *= w
+                v -= sq
+                np.maximum(v, 0.0, out=v)
+                v /= w - ddof
+                np.sqrt(v, out=v)
+            else:
+                v[:] = np.nan
+            m += ref_rows[w - 1:]
+
+            if longest_run >= w and w > ddof:
+                const = run_len[w - 1:] >= w
+                v[const] = 0.0
+                m[const] = x[w - 1:][const]
+            if has_nan:
+                gap = (s_nan[w:] - s_nan[:n - w + 1]) > 0
+                m[gap] = np.nan
+                v[gap] = np.nan
+
+
+def rolling_mean_std(
+    x: ArrayLike,
+    windows: Sequence[int],
+    ddof: int = 1,
+) -> Dict[int, Tuple[ArrayLike, ArrayLike]]:
+    """
+    {window: (rolling mean, rolling std)} for many window lengths at once.
+    DataFrame in -> DataFrames out (same index/columns); arrays stay arrays.
+
+    Matches x.rolling(window).mean() / .std(ddof=ddof) to floating-point
+    tolerance and is much cheaper when many windows are needed together.
+    """
+    if isinstance(x, pd.DataFrame):
+        res = rolling_mean_std_arrays(x.to_numpy(), windows, ddof=ddof)
+        return {
+            w: (
+                pd.DataFrame(m, index=x.index, columns=x.columns),
+                pd.DataFrame(s, index=x.index, columns=x.columns),
+            )
+            for w, (m, s) in res.items()
+        }
+    return rolling_mean_std_arrays(x, windows, ddof=ddof)
+
+
+def _pandas_rolling(x: ArrayLike, window: int):
+    frame = x if isinstance(x, pd.DataFrame) else pd.DataFrame(x)
+    return frame.rolling(window)
+
+
+def _like(x: ArrayLike, out: pd.DataFrame) -> ArrayLike:
+    return out if isinstance(x, pd.DataFrame) else out.to_numpy()
+
+
+def rolling_mean(x: ArrayLike, window: int) -> ArrayLike:
+    """
+    Single window: pandas' rolling mean, which is faster than the prefix-sum
+    kernel for one window and is what src.online.RollingMean replays bar by
+    bar. Use rolling_mean_std when several windows share one pass.
+    """
+    return _like(x, _pandas_rolling(x, window).mean())
+
+
+def rolling_std(x: ArrayLike, window: int, ddof: int = 1) -> ArrayLike:
+    """
+    Single window: pandas' rolling std (see rolling_mean; src.online.RollingStd
+    replays it bar by bar).
+    """
+    return _like(x, _pandas_rolling(x, window).std(ddof=ddof))
+
+
+# ----------------------------
+# Range-based volatility (OHLC bars)
+# ----------------------------
+#
+# Daily-vol estimators from each bar's range instead of close-to-close
+# returns; for a driftless random walk they have several times less variance
+# per observation, so short windows are much less noisy:
+#   Parkinson:     var = E[(ln H/L)^2] / (4 ln 2)
+#   Garman-Klass:  var = E[0.5 (ln H/L)^2 - (2 ln 2 - 1) (ln C/O)^2]
+# E[.] is a rolling mean over `window` bars (NaN rules as above). Neither
+# sees overnight gaps (open vs previous close).
+
+PARKINSON_FACTOR = 1.0 / (4.0 * np.log(2.0))
+GARMAN_KLASS_FACTOR = 2.0 * np.log(2.0) - 1.0
+
+# Fields each estimator reads (OHLCV field names as downloaded)
+RANGE_VOL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "parkinson": ("High", "Low"),
+    "garman_klass": ("Open", "High", "Low", "Close"),
+}
+
+
+def parkinson_vol(high: ArrayLike, low: ArrayLike, window: int) -> ArrayLike:
+    """
+    Rolling Parkinson daily volatility from bar highs and lows.
+    """
+    hl = np.log(high / low)
+    return np.sqrt(rolling_mean(hl * hl, window) * PARKINSON_FACTOR)
+
+
+def garman_klass_vol(open_: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int) -> ArrayLike:
+    """
+    Rolling Garman-Klass daily volatility from OHLC bars (negative variance
+    estimates, possible on very short windows, are clamped to 0).
+    """
+    hl = np.log(high / low)
+    co = np.log(close / open_)
+    var = rolling_mean(0.5 * hl * hl - GARMAN_KLASS_FACTOR * co * co, window)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def range_vol(ohlc, window: int, estimator: str = "parkinson") -> ArrayLike:
+    """
+    Rolling daily volatility with a range-based estimator.
+    ohlc: mapping of field name -> (date x ticker) frame/array, containing at
+      least RANGE_VOL_FIELDS[estimator] (e.g. OhlcvStore.load_fields(...)).
+    """
+    if estimator not in RANGE_VOL_FIELDS:
+        raise ValueError(f"estimator must be one of {sorted(RANGE_VOL_FIELDS)}.")
+    missing = [f for f in RANGE_VOL_FIELDS[estimator] if f not in ohlc]
+    if missing:
+        raise ValueError(f"{estimator} volatility needs fields {missing}.")
+    if estimator == "parkinson":
+        return parkinson_vol(ohlc["High"], ohlc["Low"], window)
+    return garman_klass_vol(ohlc["Open"], ohlc["High"], ohlc["Low"], ohlc["Close"], window)
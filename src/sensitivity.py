@@ -0,0 +1,162 @@
+# src/sensitivity.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.instrument import instrumented
+from src.metrics import summarize_many
+from src.strategies import regime_vol
+
+
+# ----------------------------
+# Vol-threshold sensitivity surface
+# ----------------------------
+#
+# For gated positions  f_t,i(theta) = pos_t,i * 1[vol_t,i <= theta]  every
+# cell's contribution to the backtest is a step function of theta:
+#   gross:    pos_{t-1,i} * r_t,i          switches on at theta = vol_{t-1,i}
+#   turnover: |f_t,i - f_{t-1,i}|          changes at theta = vol_t,i and vol_{t-1,i}
+# So each cell is dropped into the bucket of the first grid threshold that
+# reaches its breakpoint(s) (a difference array over the sorted grid), and a
+# cumulative sum along the grid gives the strategy returns for every
+# threshold at once. The panel is scanned once per vol lookback; each extra
+# threshold only adds one (time,) return path.
+
+@dataclass(frozen=True)
+class VolSurfaceResult:
+    table: pd.DataFrame                 # index=(Vol Lookback, Vol Threshold), summary metrics + Avg Gate %
+    strategy_log_returns: np.ndarray    # (vol lookbacks, thresholds, time)
+    thresholds: np.ndarray              # sorted threshold grid
+    vol_lookbacks: np.ndarray
+    index: pd.Index                     # dates of the time axis
+
+
+def _grid_bucket(vol: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Index of the first grid threshold with vol <= threshold; len(grid) when
+    none is (including NaN vol, which never passes the gate).
+    """
+    k = np.searchsorted(grid, vol, side="left")
+    k[np.isnan(vol)] = len(grid)
+    return k
+
+
+def _step_sum(rows: np.ndarray, buckets: np.ndarray, values: np.ndarray, n_time: int, n_grid: int) -> np.ndarray:
+    """
+    (time, grid) cumulative sums of `values` dropped into (row, bucket) cells.
+    """
+    flat = rows * (n_grid + 1) + buckets
+    out = np.bincount(flat, weights=values, minlength=n_time * (n_grid + 1)).reshape(n_time, n_grid + 1)
+    return np.cumsum(out[:, :n_grid], axis=1)
+
+
+def _gated_paths(pos: np.ndarray, rets: np.ndarray, vol: np.ndarray, grid: np.ndarray, cost: float) -> np.ndarray:
+    """
+    (thresholds, time) log returns of backtest_positions(rets, pos * gate(theta)).
+    """
+    n_time, n_assets = rets.shape
+    n_grid = len(grid)
+    k = _grid_bucket(vol, grid)
+    rows = np.broadcast_to(np.arange(n_time)[:, None], rets.shape)
+
+    # Gross: yesterday's position earns today's return if yesterday's vol passed
+    a = pos[:-1] * rets[1:]
+    live = a != 0
+    gross = np.zeros((n_time, n_grid))
+    gross[1:] = _step_sum(rows[:-1][live], k[:-1][live], a[live], n_time - 1, n_grid)
+    lr = gross / max(n_assets, 1)
+
+    if cost > 0:
+        # |p 1[theta >= vol_t] - q 1[theta >= vol_{t-1}]|: x1 from the first
+        # breakpoint, |p - q| from the second
+        p, q = np.abs(pos[1:]), np.abs(pos[:-1])
+        k_now, k_prev = k[1:], k[:-1]
+        x2 = np.abs(pos[1:] - pos[:-1])
+        x1 = np.where(k_now < k_prev, p, np.where(k_prev < k_now, q, x2))
+        lo, hi = np.minimum(k_now, k_prev), np.maximum(k_now, k_prev)
+        r = rows[:-1]
+        live_lo, live_hi = x1 != 0, (x2 - x1) != 0
+        turnover = np.zeros((n_time, n_grid))
+        turnover[1:] = _step_sum(
+            np.concatenate([r[live_lo], r[live_hi]]),
+            np.concatenate([lo[live_lo], hi[live_hi]]),
+            np.concatenate([x1[live_lo], (x2 - x1)[live_hi]]),
+            n_time - 1,
+            n_grid,
+        )
+        lr -= (cost / 10_000.0) * turnover
+
+    return lr.T
+
+
+@instrumented
+def vol_threshold_surface(
+    positions: pd.DataFrame,
+    asset_log_returns: pd.DataFrame,
+    thresholds: Sequence[float],
+    vol_lookbacks: Sequence[int] = (20,),
+    transaction_cost_bps: float = 0.0,
+    risk_free_rate_annual: float = 0.0,
+    chunk_thresholds: int = 128,
+) -> VolSurfaceResult:
+    """
+    Sensitivity of vol-gated positions to the gate, for a whole grid of
+    thresholds and vol lookbacks:
+
+      backtest_positions(asset_log_returns,
+                         positions * vol_regime_filter(asset_log_returns, lb, theta),
+                         transaction_cost_bps)
+
+    for every (lb, theta), without building a gate per threshold. Gates are
+    exact: rolling vol comes from strategies.regime_vol (what
+    vol_regime_filter uses), once per lookback, and the step functions apply
+    the same <= comparison. Strategy returns match the loop up to summation
+    order. Metrics are computed chunk_thresholds paths at a time.
+    """
+    grid = np.unique(np.asarray(thresholds, dtype=float))
+    vol_lookbacks = np.asarray(vol_lookbacks, dtype=int)
+    if grid.size == 0 or vol_lookbacks.size == 0:
+        raise ValueError("thresholds and vol_lookbacks must be non-empty.")
+
+    idx, cols = asset_log_returns.index, asset_log_returns.columns
+    pos = positions.reindex(index=idx, columns=cols).fillna(0.0).to_numpy(dtype=np.float64)
+    raw = asset_log_returns.to_numpy(dtype=np.float64)
+    rets = np.where(np.isnan(raw), 0.0, raw)  # pandas sum() skips NaN
+    n_cells = max(raw.size, 1)
+
+    paths = np.empty((len(vol_lookbacks), len(grid), len(idx)))
+    tables = []
+    for j, lb in enumerate(vol_lookbacks):
+        # The same vol vol_regime_filter compares against, so gates match it exactly
+        vol = regime_vol(asset_log_returns, int(lb)).to_numpy(dtype=np.float64)
+        paths[j] = _gated_paths(pos, rets, vol, grid, transaction_cost_bps)
+
+        # Gate fraction: share of cells with vol <= theta (NaN vol never passes)
+        sorted_vol = np.sort(vol[~np.isnan(vol)])
+        gate_frac = np.searchsorted(sorted_vol, grid, side="right") / n_cells
+
+        for lo in range(0, len(grid), chunk_thresholds):
+            hi = min(lo + chunk_thresholds, len(grid))
+            lr = paths[j, lo:hi]
+            eq = np.exp(np.cumsum(lr, axis=1))
+            if eq.shape[1]:
+                eq[:, 0] = 1.0  # normalize start
+            summary = summarize_many(lr, eq, risk_free_rate_annual=risk_free_rate_annual)
+            part = pd.DataFrame(summary)
+            part.insert(0, "Vol Threshold", grid[lo:hi])
+            part.insert(0, "Vol Lookback", int(lb))
+            part["Avg Gate %"] = gate_frac[lo:hi]
+            tables.append(part)
+
+    table = pd.concat(tables, ignore_index=True).set_index(["Vol Lookback", "Vol Threshold"])
+    return VolSurfaceResult(
+        table=table,
+        strategy_log_returns=paths,
+        thresholds=grid,
+        vol_lookbacks=vol_lookbacks,
+        index=idx,
+    )
@@ -1,14 +1,21 @@
 # src/strategies.py
 from __future__ import annotations
 
+from typing import Mapping, Optional
+
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+from src.rolling_stats import range_vol, rolling_std
+from src.instrument import instrumented
+
 
 # ----------------------------
 # Signals (numbers)
 # ----------------------------
 
+@instrumented
 def momentum_signal(prices: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
     """
     Momentum signal:
@@ -19,6 +26,7 @@ def momentum_signal(prices: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
     return prices / prices.shift(lookback) - 1.0
 
 
+@instrumented
 def mean_reversion_zscore_signal(prices: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
     """
     Mean reversion signal via z-score:
@@ -35,23 +43,76 @@ def mean_reversion_zscore_signal(prices: pd.DataFrame, lookback: int = 20) -> pd
 # Strategy rules (signal -> positions)
 # ----------------------------
 
-def sign_threshold_rule(signal: pd.DataFrame, threshold: float = 0.0) -> pd.DataFrame:
+@instrumented
+def sign_threshold_rule(
+    signal: pd.DataFrame,
+    threshold: float = 0.0,
+    dtype: npt.DTypeLike = np.float64,
+) -> pd.DataFrame:
     """
     Convert a signal into positions using sign + threshold:
       +1 if signal > threshold
       -1 if signal < -threshold
        0 otherwise
+
+    dtype: np.int8 gives compact positions (1 byte per cell, see src/compact.py).
+    """
+    vals = signal.to_numpy()
+    positions = np.zeros(vals.shape, dtype=dtype)
+    positions[vals > threshold] = 1
+    positions[vals < -threshold] = -1
+    return pd.DataFrame(positions, index=signal.index, columns=signal.columns)
+
+
+def zscore_entry_exit_kernel(
+    z: np.ndarray,
+    entry_z: float = 1.0,
+    exit_z: float = 0.2,
+    dtype: npt.DTypeLike = np.float64,
+) -> np.ndarray:
     """
-    positions = pd.DataFrame(0.0, index=signal.index, columns=signal.columns)
-    positions = positions.mask(signal > threshold, 1.0)
-    positions = positions.mask(signal < -threshold, -1.0)
+    Batched entry/exit state machine on a 2-D array (rows=time, cols=assets).
+
+    Every non-NaN z is an "event" that either forces a state
+    (exit -> 0, z > entry_z -> -1, z < -entry_z -> +1) or leaves it alone.
+    The state at t is the last forced state at or before t, so we build an
+    event mask and forward-fill the row index of the last event per column.
+    NaN z-scores are reported as 0 but do not reset the held state.
+
+    Output: array of positions in {-1,0,+1} (same shape as z), float64 unless
+    dtype says otherwise (e.g. np.int8).
+    """
+    z = np.asarray(z, dtype=float)
+    if z.ndim != 2:
+        raise ValueError("z must be a 2-D array (time x assets).")
+
+    valid = ~np.isnan(z)
+    exit_mask = valid & (np.abs(z) < exit_z)
+    short_mask = valid & ~exit_mask & (z > entry_z)
+    long_mask = valid & ~exit_mask & ~short_mask & (z < -entry_z)
+
+    state = np.zeros(z.shape, dtype=dtype)
+    state[short_mask] = -1.0
+    state[long_mask] = 1.0
+
+    # Row index of the most recent event (or -1 if none yet), per column
+    event = exit_mask | short_mask | long_mask
+    n_rows = z.shape[0]
+    last_event = np.where(event, np.arange(n_rows)[:, None], -1)
+    np.maximum.accumulate(last_event, axis=0, out=last_event)
+
+    cols = np.broadcast_to(np.arange(z.shape[1]), z.shape)
+    positions = state[np.maximum(last_event, 0), cols]
+    positions[(last_event < 0) | ~valid] = 0
     return positions
 
 
+@instrumented
 def zscore_entry_exit_rule(
     z: pd.DataFrame,
     entry_z: float = 1.0,
     exit_z: float = 0.2,
+    dtype: npt.DTypeLike = np.float64,
 ) -> pd.DataFrame:
     """
     Stateful entry/exit rule for z-scores:
@@ -62,6 +123,19 @@ def zscore_entry_exit_rule(
 
     Output: positions in {-1,0,+1}
     """
+    positions = zscore_entry_exit_kernel(z.to_numpy(dtype=float), entry_z=entry_z, exit_z=exit_z, dtype=dtype)
+    return pd.DataFrame(positions, index=z.index, columns=z.columns)
+
+
+def _zscore_entry_exit_rule_loop(
+    z: pd.DataFrame,
+    entry_z: float = 1.0,
+    exit_z: float = 0.2,
+) -> pd.DataFrame:
+    """
+    Reference row-by-row implementation of zscore_entry_exit_rule.
+    Kept for equivalence checks and benchmarks only.
+    """
     positions = pd.DataFrame(0.0, index=z.index, columns=z.columns)
 
     # We'll iterate safely with .iat to avoid pandas chained assignment warnings.
@@ -88,10 +162,14 @@ def zscore_entry_exit_rule(
     return positions
 
 
+@instrumented
 def vol_regime_filter(
     log_returns: pd.DataFrame,
     vol_lookback: int = 20,
     vol_threshold: float = 0.02,
+    dtype: npt.DTypeLike = np.float64,
+    estimator: str = "close",
+    ohlc: Optional[Mapping[str, pd.DataFrame]] = None,
     ) -> pd.DataFrame:
     """
     Returns a DataFrame of 1/0 where 1 means "vol is low enough to trade",
@@ -100,31 +178,194 @@ def vol_regime_filter(
     log_returns: daily log returns (same shape/index as prices columns)
     vol_lookback: rolling window (e.g., 20 trading days ~ 1 month)
     vol_threshold: daily vol threshold (e.g., 0.02 = 2% daily std)
+    dtype: np.int8 for a compact gate (or pack it with src.compact.PackedMask)
+    estimator: "close" = std of log_returns; "parkinson" / "garman_klass" =
+      range-based vol from OHLC bars (see src.rolling_stats.range_vol), which
+      needs `ohlc` (field -> date x ticker frame, e.g. from src.ohlcv.OhlcvStore).
+      The gate keeps log_returns' index and columns either way.
     """
-    # rolling daily volatility per asset
-    rolling_vol = log_returns.rolling(vol_lookback).std()
+    rolling_vol = regime_vol(log_returns, vol_lookback, estimator, ohlc)
 
     # gate: 1 if vol <= threshold else 0
-    regime = (rolling_vol <= vol_threshold).astype(float)
+    regime = (rolling_vol <= vol_threshold).astype(dtype)
 
     return regime
 
+
+def regime_vol(
+    log_returns: pd.DataFrame,
+    vol_lookback: int = 20,
+    estimator: str = "close",
+    ohlc: Optional[Mapping[str, pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """
+    The rolling daily vol vol_regime_filter compares against its threshold,
+    on log_returns' index and columns. Callers that try several thresholds
+    compute it once and compare themselves.
+    """
+    if estimator == "close":
+        # rolling daily volatility per asset
+        return rolling_std(log_returns, vol_lookback)
+    if ohlc is None:
+        raise ValueError(f"estimator={estimator!r} needs OHLC bars (ohlc=...).")
+    rolling_vol = range_vol(ohlc, vol_lookback, estimator)
+    return rolling_vol.reindex(index=log_returns.index, columns=log_returns.columns)
+
+# ----------------------------
+# Cross-sectional ranking (multi-asset universes)
+# ----------------------------
+
+def rebalance_mask(index: pd.Index, rebalance="M") -> np.ndarray:
+    """
+    Boolean mask of rebalance rows for a schedule:
+      "D"                  every row
+      "W" / "M" / "Q" / "Y" last trading day of each week / month / quarter / year
+      int n                every n-th row (starting with the first)
+    """
+    n = len(index)
+    if isinstance(rebalance, (int, np.integer)):
+        if rebalance <= 0:
+            raise ValueError("rebalance interval must be positive.")
+        mask = np.zeros(n, dtype=bool)
+        mask[::int(rebalance)] = True
+        return mask
+
+    freq = str(rebalance).upper()
+    if freq == "D":
+        return np.ones(n, dtype=bool)
+    if freq not in ("W", "M", "Q", "Y"):
+        raise ValueError(f"Unknown rebalance schedule {rebalance!r}. Use 'D', 'W', 'M', 'Q', 'Y' or an int.")
+    periods = pd.DatetimeIndex(index).to_period(freq).asi8
+    mask = np.ones(n, dtype=bool)
+    mask[:-1] = periods[1:] != periods[:-1]
+    return mask
+
+
+def cross_sectional_rank_kernel(
+    signal: np.ndarray,
+    quantile: float = 0.1,
+    dtype: npt.DTypeLike = np.float64,
+) -> np.ndarray:
+    """
+    Long/short book from a (rebalances x assets) signal array.
+
+    For each row, the top `quantile` of non-NaN names get +1 and the bottom
+    `quantile` get -1 (at least one name per side when two or more are
+    valid). Selection uses one np.argpartition per row, O(assets) instead of
+    a full sort; the two sides are always disjoint, even with tied signals
+    (ties are broken arbitrarily). Row r of the output is the book chosen at
+    signal row r.
+    """
+    if not 0 < quantile <= 0.5:
+        raise ValueError("quantile must be in (0, 0.5].")
+    signal = np.asarray(signal, dtype=np.float64)
+    book = np.zeros(signal.shape, dtype=dtype)
+
+    for i in range(signal.shape[0]):
+        vals = signal[i]
+        valid = np.flatnonzero(~np.isnan(vals))
+        n_valid = len(valid)
+        if n_valid < 2:
+            continue
+        k = min(max(int(n_valid * quantile), 1), n_valid // 2)
+        # One partition for both sides, so tied names can't land in both
+        order = valid[np.argpartition(vals[valid], (k - 1, n_valid - k))]
+        book[i, order[n_valid - k:]] = 1
+        book[i, order[:k]] = -1
+    return book
+
+
+def _hold_between_rebalances(book: np.ndarray, rows: np.ndarray, n_rows: int, dtype) -> np.ndarray:
+    """
+    (time x assets) positions: the book chosen at each rebalance row, held
+    until the next one (flat before the first rebalance).
+    """
+    last = np.full(n_rows, -1)
+    last[rows] = np.arange(len(rows))
+    np.maximum.accumulate(last, out=last)
+    positions = np.zeros((n_rows, book.shape[1]), dtype=dtype)
+    held = last >= 0
+    positions[held] = book[last[held]]
+    return positions
+
+
+@instrumented
+def cross_sectional_rank_rule(
+    signal: pd.DataFrame,
+    quantile: float = 0.1,
+    rebalance="M",
+    dtype: npt.DTypeLike = np.float64,
+) -> pd.DataFrame:
+    """
+    Rank the universe by signal on rebalance dates; long the top quantile,
+    short the bottom quantile, hold the book until the next rebalance.
+    Output: positions in {-1,0,+1} (same shape as signal).
+    """
+    rows = np.flatnonzero(rebalance_mask(signal.index, rebalance))
+    book = cross_sectional_rank_kernel(signal.to_numpy()[rows], quantile=quantile, dtype=dtype)
+    positions = _hold_between_rebalances(book, rows, len(signal.index), dtype)
+    return pd.DataFrame(positions, index=signal.index, columns=signal.columns)
+
+
+@instrumented
+def cross_sectional_momentum(
+    prices: pd.DataFrame,
+    lookback: int = 252,
+    skip: int = 21,
+    quantile: float = 0.1,
+    rebalance="M",
+    dtype: npt.DTypeLike = np.float64,
+) -> pd.DataFrame:
+    """
+    Cross-sectional momentum:
+      s_t = P_{t-skip} / P_{t-lookback} - 1   (e.g. 12-1 month momentum)
+    ranked across tickers on rebalance dates only; long the top quantile,
+    short the bottom quantile, positions held between rebalances.
+
+    The signal is only evaluated on rebalance rows (rows without a full
+    lookback are skipped), so monthly rebalancing on a 5,000-name universe
+    costs ~12 partial sorts a year. Positions are {-1,0,+1} like the other
+    rules; for dollar-neutral weights use normalize_gross_leverage and
+    backtest_weights.
+    """
+    if not 0 <= skip < lookback:
+        raise ValueError("need 0 <= skip < lookback.")
+    rows = np.flatnonzero(rebalance_mask(prices.index, rebalance))
+    rows = rows[rows >= lookback]
+
+    p = prices.to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        signal = p[rows - skip] / p[rows - lookback] - 1.0
+
+    book = cross_sectional_rank_kernel(signal, quantile=quantile, dtype=dtype)
+    positions = _hold_between_rebalances(book, rows, len(prices.index), dtype)
+    return pd.DataFrame(positions, index=prices.index, columns=prices.columns)
+
+
 # ----------------------------
 # Convenience wrappers (old behavior)
 # ----------------------------
 
-def momentum(prices: pd.DataFrame, lookback: int = 20, threshold: float = 0.0) -> pd.DataFrame:
+@instrumented
+def momentum(
+    prices: pd.DataFrame,
+    lookback: int = 20,
+    threshold: float = 0.0,
+    dtype: npt.DTypeLike = np.float64,
+) -> pd.DataFrame:
     s = momentum_signal(prices, lookback=lookback)
-    return sign_threshold_rule(s, threshold=threshold)
+    return sign_threshold_rule(s, threshold=threshold, dtype=dtype)
 
 
+@instrumented
 def mean_reversion_zscore(
     prices: pd.DataFrame,
     lookback: int = 20,
     entry_z: float = 1.0,
     exit_z: float = 0.2,
+    dtype: npt.DTypeLike = np.float64,
 ) -> pd.DataFrame:
     z = mean_reversion_zscore_signal(prices, lookback=lookback)
-    return zscore_entry_exit_rule(z, entry_z=entry_z, exit_z=exit_z)
+    return zscore_entry_exit_rule(z, entry_z=entry_z, exit_z=exit_z, dtype=dtype)
 
 
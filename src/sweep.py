@@ -0,0 +1,189 @@
+# src/sweep.py
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_positions
+from src.data_loader import PriceData
+from src.metrics import summarize_strategy
+from src.strategies import momentum, vol_regime_filter
+
+
+# ----------------------------
+# Shared, memory-mapped price panel
+# ----------------------------
+
+@dataclass(frozen=True)
+class SharedPanelSpec:
+    """
+    Everything a worker needs to attach to the panel (small and picklable).
+    """
+    directory: str
+    dates: np.ndarray     # datetime64[ns]
+    tickers: List[str]
+
+
+class SharedPanel:
+    """
+    Writes prices and log returns once to .npy files (in /dev/shm when
+    available, so they live in RAM) that every worker maps read-only.
+    Workers get numpy views on the same pages instead of a pickled copy.
+
+    Use as a context manager; the files are removed on exit.
+    """
+
+    def __init__(self, prices: pd.DataFrame, log_returns: pd.DataFrame):
+        if not (prices.index.equals(log_returns.index) and prices.columns.equals(log_returns.columns)):
+            raise ValueError("prices and log_returns must share index and columns (align them first).")
+
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        self.directory = tempfile.mkdtemp(prefix="sweep_panel_", dir=base)
+        np.save(os.path.join(self.directory, "prices.npy"), prices.to_numpy(dtype=np.float64))
+        np.save(os.path.join(self.directory, "log_returns.npy"), log_returns.to_numpy(dtype=np.float64))
+
+        self.spec = SharedPanelSpec(
+            directory=self.directory,
+            dates=pd.DatetimeIndex(prices.index).to_numpy(dtype="datetime64[ns]"),
+            tickers=[str(c) for c in prices.columns],
+        )
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "SharedPanel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_panel(spec: SharedPanelSpec) -> PriceData:
+    """
+    Zero-copy view of a SharedPanel as PriceData (read-only).
+    """
+    index = pd.DatetimeIndex(spec.dates)
+    prices = np.load(os.path.join(spec.directory, "prices.npy"), mmap_mode="r")
+    rets = np.load(os.path.join(spec.directory, "log_returns.npy"), mmap_mode="r")
+    return PriceData(
+        prices=pd.DataFrame(prices, index=index, columns=spec.tickers, copy=False),
+        log_returns=pd.DataFrame(rets, index=index, columns=spec.tickers, copy=False),
+    )
+
+
+# ----------------------------
+# Parameter evaluation
+# ----------------------------
+
+def param_grid(**axes: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of named parameter lists, e.g.
+      param_grid(lookback=[20, 60], vol_threshold=[0.015, 0.02])
+    """
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*axes.values())]
+
+
+def evaluate_vol_filtered_momentum(
+    data: PriceData,
+    lookback: int = 60,
+    vol_lookback: Optional[int] = 20,
+    vol_threshold: float = 0.02,
+    cost_bps: float = 0.0,
+) -> pd.Series:
+    """
+    Default sweep task: (vol-filtered) momentum backtest + summary metrics.
+    vol_lookback=None runs plain momentum.
+    """
+    positions = momentum(data.prices, lookback=lookback)
+    if vol_lookback:
+        positions = positions * vol_regime_filter(data.log_returns, vol_lookback, vol_threshold)
+    res = backtest_positions(data.log_returns, positions, transaction_cost_bps=cost_bps)
+    return summarize_strategy("sweep", res.strategy_log_returns, res.equity_curve)
+
+
+# Per-process state, set once by the pool initializer
+_WORKER_DATA: Optional[PriceData] = None
+_WORKER_TASK: Optional[Callable[..., pd.Series]] = None
+
+
+def _init_worker(spec: SharedPanelSpec, task: Callable[..., pd.Series]) -> None:
+    global _WORKER_DATA, _WORKER_TASK
+    _WORKER_DATA = attach_panel(spec)
+    _WORKER_TASK = task
+
+
+def _run_one(params: Dict[str, Any]) -> Dict[str, Any]:
+    summary = _WORKER_TASK(_WORKER_DATA, **params)
+    return {**params, **summary.drop(labels=["Strategy"], errors="ignore").to_dict()}
+
+
+def _run_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_run_one(p) for p in chunk]
+
+
+def run_sweep(
+    data: PriceData,
+    params: Iterable[Dict[str, Any]],
+    task: Callable[..., pd.Series] = evaluate_vol_filtered_momentum,
+    max_workers: Optional[int] = None,
+    chunksize: int = 4,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> pd.DataFrame:
+    """
+    Fan parameter combinations out to a process pool.
+
+    The price panel is shared once through memory-mapped files (SharedPanel);
+    workers attach in their initializer and only receive the small params
+    dicts, chunksize at a time. Results stream back as chunks finish, in
+    completion order (on_result is called for each row), and are collected
+    into one table in parameter order.
+
+    task(data, **params) must be a module-level function returning a Series
+    of metrics (like evaluate_vol_filtered_momentum).
+    max_workers=1 runs in-process (handy for debugging and profiling).
+    """
+    params = list(params)
+    prices, rets = _aligned(data)
+
+    if max_workers == 1:
+        rows = []
+        for p in params:
+            row = {**p, **task(PriceData(prices, rets), **p).drop(labels=["Strategy"], errors="ignore").to_dict()}
+            if on_result:
+                on_result(row)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    with SharedPanel(prices, rets) as panel:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(panel.spec, task)
+        ) as pool:
+            chunks = [params[i:i + chunksize] for i in range(0, len(params), chunksize)]
+            futures = {pool.submit(_run_chunk, chunk): k for k, chunk in enumerate(chunks)}
+            done: Dict[int, List[Dict[str, Any]]] = {}
+            for future in as_completed(futures):
+                done[futures[future]] = future.result()
+                if on_result:
+                    for row in done[futures[future]]:
+                        on_result(row)
+
+    return pd.DataFrame([row for k in range(len(done)) for row in done[k]])
+
+
+def _aligned(data: PriceData) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Same alignment the research scripts use: drop NaNs, keep common dates.
+    """
+    prices = data.prices.dropna()
+    rets = data.log_returns.dropna()
+    idx = prices.index.intersection(rets.index)
+    return prices.loc[idx], rets.loc[idx]
@@ -0,0 +1,87 @@
+# src/synthetic.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def make_gbm_prices(
+    n_days: int = 2520,
+    n_tickers: int = 1,
+    mu: float = 0.05,
+    sigma: float = 0.2,
+    start: str = "2005-01-03",
+    seed: int = 0,
+    freq: str = "B",
+) -> pd.DataFrame:
+    """
+    Synthetic price panel from geometric Brownian motion (business-day index).
+    Used for offline benchmarks so nothing depends on the network or cache.
+
+    mu, sigma: annualized drift and volatility.
+    freq: index frequency (e.g. "min" for long intraday-like series); the
+      return scaling stays daily.
+    """
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / 252
+    shocks = rng.standard_normal((n_days, n_tickers))
+    log_rets = (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * shocks
+    log_rets[0] = 0.0
+    prices = 100.0 * np.exp(np.cumsum(log_rets, axis=0))
+
+    index = pd.date_range(start=start, periods=n_days, freq=freq)
+    columns = [f"T{j:04d}" for j in range(n_tickers)]
+    return pd.DataFrame(prices, index=index, columns=columns)
+
+
+def make_gbm_ohlcv(
+    n_days: int = 2520,
+    n_tickers: int = 1,
+    mu: float = 0.05,
+    sigma: float = 0.2,
+    start: str = "2005-01-03",
+    seed: int = 0,
+    steps_per_day: int = 24,
+) -> pd.DataFrame:
+    """
+    Synthetic OHLCV bars from an intraday GBM path (steps_per_day steps per
+    bar), with (field, ticker) MultiIndex columns like download_ohlcv_yfinance.
+    Open = previous close (no overnight gaps), Adj Close = Close, Volume is
+    lognormal noise. The true daily vol is sigma / sqrt(252).
+
+    Memory: the intraday path is generated one day-block at a time, but a
+    block holds (block days x steps_per_day x n_tickers) floats.
+    """
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / (252 * steps_per_day)
+    close = np.empty((n_days, n_tickers))
+    high = np.empty((n_days, n_tickers))
+    low = np.empty((n_days, n_tickers))
+    level = np.full(n_tickers, np.log(100.0))
+    block = max(1, 2_000_000 // max(steps_per_day * n_tickers, 1))
+
+    for lo in range(0, n_days, block):
+        hi = min(lo + block, n_days)
+        shocks = rng.standard_normal((hi - lo, steps_per_day, n_tickers))
+        steps = (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * shocks
+        path = level + np.cumsum(steps.reshape(-1, n_tickers), axis=0).reshape(steps.shape)
+        opens = np.concatenate([level[None], path[:-1, -1]])  # previous close
+        high[lo:hi] = np.maximum(path.max(axis=1), opens)
+        low[lo:hi] = np.minimum(path.min(axis=1), opens)
+        close[lo:hi] = path[:, -1]
+        level = path[-1, -1]
+
+    open_ = np.concatenate([np.full((1, n_tickers), np.log(100.0)), close[:-1]])
+    volume = np.round(np.exp(rng.normal(13.0, 0.5, (n_days, n_tickers))))
+
+    index = pd.bdate_range(start=start, periods=n_days)
+    columns = [f"T{j:04d}" for j in range(n_tickers)]
+    fields = {
+        "Open": np.exp(open_),
+        "High": np.exp(high),
+        "Low": np.exp(low),
+        "Close": np.exp(close),
+        "Adj Close": np.exp(close),
+        "Volume": volume,
+    }
+    return pd.concat({f: pd.DataFrame(v, index=index, columns=columns) for f, v in fields.items()}, axis=1)
@@ -0,0 +1,155 @@
+# src/walk_forward.py
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import backtest_many, backtest_positions
+from src.metrics import summarize_many
+from src.strategies import momentum, regime_vol
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    folds: pd.DataFrame                # one row per fold: windows, chosen params, train/test scores
+    oos_log_returns: pd.Series         # stitched out-of-sample strategy log returns
+    oos_equity: pd.Series              # equity of the stitched OOS returns (starts at 1.0)
+    oos_positions: pd.DataFrame        # positions actually held out of sample
+    candidates: pd.DataFrame           # (Lookback, Vol Threshold) per candidate id
+
+
+def fold_bounds(n: int, train_len: int, test_len: int, step: Optional[int] = None) -> List[tuple[int, int, int]]:
+    """
+    (train_start, test_start, test_end) offsets for rolling train/test folds.
+    step defaults to test_len so test windows tile the history without overlap.
+    """
+    step = step or test_len
+    if train_len <= 0 or test_len <= 0 or step <= 0:
+        raise ValueError("train_len, test_len and step must be positive.")
+    out = []
+    s = 0
+    while s + train_len < n:
+        out.append((s, s + train_len, min(s + train_len + test_len, n)))
+        s += step
+    return out
+
+
+def _candidate_positions(
+    prices: pd.DataFrame,
+    log_returns: pd.DataFrame,
+    lookbacks: Sequence[int],
+    vol_thresholds: Sequence[float],
+    vol_lookback: int,
+) -> np.ndarray:
+    """
+    (candidates, time, assets) positions for every (lookback, vol threshold).
+    Momentum is computed once per lookback and the rolling vol once in total;
+    each gate is just a comparison against it (same as vol_regime_filter).
+    """
+    idx, cols = log_returns.index, log_returns.columns
+    rolling_vol = regime_vol(log_returns, vol_lookback).to_numpy()
+    gates = [(rolling_vol <= vt).astype(float) for vt in vol_thresholds]
+
+    out = np.empty((len(lookbacks) * len(vol_thresholds), len(idx), len(cols)))
+    k = 0
+    for lb in lookbacks:
+        pos = momentum(prices, lookback=int(lb)).reindex(index=idx, columns=cols).fillna(0.0).to_numpy()
+        for gate in gates:
+            out[k] = pos * gate
+            k += 1
+    return out
+
+
+def walk_forward_momentum(
+    prices: pd.DataFrame,
+    log_returns: pd.DataFrame,
+    lookbacks: Sequence[int],
+    vol_thresholds: Sequence[float],
+    vol_lookback: int = 20,
+    train_len: int = 756,
+    test_len: int = 126,
+    step: Optional[int] = None,
+    metric: str = "Sharpe",
+    transaction_cost_bps: float = 0.0,
+    max_workers: int = 1,
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization of vol-filtered momentum.
+
+    For each fold, pick the (lookback, vol threshold) with the best `metric`
+    (any summarize_strategy column, higher is better) on the training window,
+    then hold that choice over the following test window. Test windows are
+    stitched into one out-of-sample position matrix and backtested once, so
+    switching between candidates at fold boundaries pays its turnover cost.
+
+    Signals and strategy returns for every candidate are computed once over
+    the full history (signals only use past data), and folds just slice them.
+    Fold selection runs on a thread pool when max_workers > 1.
+
+    Use vol_thresholds=[np.inf] for ungated momentum.
+    """
+    n = len(log_returns)
+    folds = fold_bounds(n, train_len, test_len, step)
+    if not folds:
+        raise ValueError("Not enough data for one train/test fold.")
+
+    candidates = pd.DataFrame(
+        [(int(lb), float(vt)) for lb in lookbacks for vt in vol_thresholds],
+        columns=["Lookback", "Vol Threshold"],
+    )
+    cand_pos = _candidate_positions(prices, log_returns, lookbacks, vol_thresholds, vol_lookback)
+    batch = backtest_many(log_returns, cand_pos, transaction_cost_bps=transaction_cost_bps)
+    paths = batch.strategy_log_returns.to_numpy().T  # (candidates, time)
+
+    def score(lo: int, hi: int) -> np.ndarray:
+        lr = paths[:, lo:hi]
+        eq = np.exp(np.cumsum(lr, axis=1))
+        eq[:, 0] = 1.0
+        summary = summarize_many(lr, eq)
+        if metric not in summary:
+            raise ValueError(f"Unknown metric {metric!r}. Use one of {sorted(summary)}.")
+        return np.asarray(summary[metric], dtype=float)
+
+    def run_fold(bounds: tuple[int, int, int]) -> dict:
+        train_start, test_start, test_end = bounds
+        train_scores = score(train_start, test_start)
+        best = int(np.argmax(np.where(np.isnan(train_scores), -np.inf, train_scores)))
+        test_scores = score(test_start, test_end)
+        return {
+            "Train Start": log_returns.index[train_start],
+            "Test Start": log_returns.index[test_start],
+            "Test End": log_returns.index[test_end - 1],
+            "Candidate": best,
+            "Lookback": candidates.at[best, "Lookback"],
+            "Vol Threshold": candidates.at[best, "Vol Threshold"],
+            f"Train {metric}": train_scores[best],
+            f"Test {metric}": test_scores[best],
+        }
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(pool.map(run_fold, folds))
+    else:
+        rows = [run_fold(b) for b in folds]
+
+    # Stitch the chosen candidate's positions over each test window
+    first, last = folds[0][1], folds[-1][2]
+    stitched = np.zeros((last - first, cand_pos.shape[2]))
+    for (_, test_start, test_end), row in zip(folds, rows):
+        stitched[test_start - first:test_end - first] = cand_pos[row["Candidate"], test_start:test_end]
+
+    oos_rets = log_returns.iloc[first:last]
+    oos_positions = pd.DataFrame(stitched, index=oos_rets.index, columns=oos_rets.columns)
+    res = backtest_positions(oos_rets, oos_positions, transaction_cost_bps=transaction_cost_bps)
+
+    return WalkForwardResult(
+        folds=pd.DataFrame(rows).set_index("Test Start"),
+        oos_log_returns=res.strategy_log_returns,
+        oos_equity=res.equity_curve,
+        oos_positions=res.positions,
+        candidates=candidates,
+    )
@@ -0,0 +1,80 @@
+# tests/test_data_loader.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import update_price_cache
+from src.price_store import load_prices, save_prices
+
+DATES = pd.bdate_range("2020-01-01", periods=30)
+
+
+class StubFetcher:
+    """
+    Offline price source: serves `panel` restricted to the requested tickers
+    and dates, and records every call.
+    """
+
+    def __init__(self, panel: pd.DataFrame):
+        self.panel = panel
+        self.calls = []
+
+    def __call__(self, tickers, start, end, price_field, interval):
+        self.calls.append((list(tickers), start))
+        out = self.panel.loc[pd.Timestamp(start):, list(tickers)]
+        return out if end is None else out.loc[:pd.Timestamp(end)]
+
+
+def _panel(tickers) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    steps = rng.normal(0.0, 0.01, (len(DATES), len(tickers)))
+    return pd.DataFrame(100.0 * np.exp(np.cumsum(steps, axis=0)), index=DATES, columns=tickers)
+
+
+def _cache(tmp_path, prices: pd.DataFrame) -> str:
+    path = str(tmp_path / "prices.csv")
+    save_prices(prices, path)
+    return path
+
+
+def test_tops_up_known_tickers_and_fetches_new_ones(tmp_path):
+    truth = _panel(["A", "C"])
+    path = _cache(tmp_path, truth[["A"]].iloc[:20])
+    fetch = StubFetcher(truth)
+
+    prices = update_price_cache(path, ["A", "C"], "2020-01-01", None, "Adj Close", "1d", fetcher=fetch)
+
+    assert list(prices.columns) == ["A", "C"]
+    np.testing.assert_allclose(prices.to_numpy(), truth.to_numpy())
+    # A: tail from overlap_days before its last cached bar; C: full history
+    assert fetch.calls[0] == (["A"], DATES[14].strftime("%Y-%m-%d"))
+    assert fetch.calls[1] == (["C"], "2020-01-01")
+    pd.testing.assert_frame_equal(load_prices(path), prices, check_freq=False)
+
+
+def test_revised_overlap_backfills_full_history(tmp_path):
+    truth = _panel(["A", "B"])
+    path = _cache(tmp_path, truth.iloc[:20])
+    revised = truth.copy()
+    revised["A"] *= 0.5  # e.g. adjusted closes rescaled after a split
+    fetch = StubFetcher(revised)
+
+    prices = update_price_cache(path, ["A", "B"], "2020-01-01", None, "Adj Close", "1d", fetcher=fetch)
+
+    np.testing.assert_allclose(prices.to_numpy(), revised.to_numpy())
+    assert (["A"], "2020-01-01") in fetch.calls
+
+
+def test_all_nan_cached_column_is_refetched(tmp_path):
+    truth = _panel(["A", "B"])
+    cached = truth.iloc[:20].copy()
+    cached["B"] = np.nan
+    path = _cache(tmp_path, cached)
+    fetch = StubFetcher(truth)
+
+    prices = update_price_cache(path, ["A", "B"], "2020-01-01", None, "Adj Close", "1d", fetcher=fetch)
+
+    assert list(prices.columns) == ["A", "B"]
+    np.testing.assert_allclose(prices.to_numpy(), truth.to_numpy())
+    assert (["B"], "2020-01-01") in fetch.calls
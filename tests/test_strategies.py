@@ -0,0 +1,26 @@
+# tests/test_strategies.py
+from __future__ import annotations
+
+import numpy as np
+
+from src.strategies import cross_sectional_rank_kernel
+
+
+def test_rank_kernel_picks_top_and_bottom():
+    book = cross_sectional_rank_kernel(np.array([[0.3, -0.2, 0.1, np.nan, -0.5, 0.0]]), quantile=0.2)
+    np.testing.assert_array_equal(book, [[1, 0, 0, 0, -1, 0]])
+
+
+def test_rank_kernel_sides_are_disjoint_on_ties():
+    book = cross_sectional_rank_kernel(np.array([[1.0, 1.0, 1.0, 1.0]]), quantile=0.5)[0]
+    assert (book == 1).sum() == 2 and (book == -1).sum() == 2
+
+    book = cross_sectional_rank_kernel(np.zeros((3, 8)), quantile=0.25)
+    np.testing.assert_array_equal((book == 1).sum(axis=1), [2, 2, 2])
+    np.testing.assert_array_equal((book == -1).sum(axis=1), [2, 2, 2])
+
+
+def test_rank_kernel_partial_ties_keep_strict_extremes():
+    book = cross_sectional_rank_kernel(np.array([[2.0, 1.0, 1.0, 1.0, 1.0, -3.0]]), quantile=1 / 3)[0]
+    assert book[0] == 1 and book[5] == -1
+    assert (book == 1).sum() == 2 and (book == -1).sum() == 2